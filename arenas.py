@@ -0,0 +1,333 @@
+"""
+🗺️ الساحات - تحميل خرائط نصية/JSON مع بيانات محسوبة مسبقاً (مسافات، مكونات، نهايات مسدودة) وذاكرة على القرص
+"""
+
+import hashlib
+import json
+import os
+from collections import deque
+import numpy as np
+from config import *
+
+# رفع الرقم عند تغيير البيانات المحسوبة حتى تُهمل الملفات القديمة
+ARENA_FORMAT_VERSION = 1
+
+# رموز الخريطة
+EMPTY, WALL, SPIKE = 0, 1, 2
+TILE_CODES = {'.': EMPTY, ' ': EMPTY, 'S': EMPTY, '#': WALL, '^': SPIKE}
+TILE_TYPES = {WALL: 'wall', SPIKE: 'spike'}
+
+DIRECTION_NAMES = {'right': (1, 0), 'left': (-1, 0), 'down': (0, 1), 'up': (0, -1)}
+
+# أقل مسافة (بالخطوات) بين نقطة البداية وأماكن الطعام
+MIN_FOOD_DISTANCE = 3
+
+class Arena:
+    """ساحة محملة: خلايا العوائق مع البيانات المحسوبة عند التحميل
+
+    - distance: أقصر مسافة BFS من نقطة البداية (-1 للخلايا غير القابلة للوصول)
+    - components: رقم المكون المتصل لكل خلية حرة (0 للعوائق)
+    - dead_ends: خلايا الممرات المسدودة (لا خروج منها إلا بالرجوع)
+    - food_cells: الخلايا الصالحة للطعام والمكافآت (في مكون البداية، ليست نهاية مسدودة، وبعيدة عن البداية)
+    """
+    def __init__(self, name, tiles, spawn, direction, metadata=None, source=None):
+        self.name = name
+        self.tiles = tiles
+        self.height, self.width = tiles.shape
+        self.spawn = spawn
+        self.direction = direction
+        self.metadata = metadata or {}
+        self.source = source
+
+        self.distance = None
+        self.components = None
+        self.dead_ends = None
+        self.food_cells = None
+
+    def compile(self):
+        """حساب البيانات الثابتة مرة واحدة عند التحميل"""
+        free = self.tiles == EMPTY
+        self.distance = compute_distance_field(free, self.spawn)
+        self.components = label_components(free)
+        self.dead_ends = find_dead_ends(free)
+
+        spawn_component = self.components[self.spawn[1], self.spawn[0]]
+        usable = ((self.components == spawn_component) & ~self.dead_ends
+                  & (self.distance >= MIN_FOOD_DISTANCE))
+        ys, xs = np.nonzero(usable)
+        self.food_cells = (ys * self.width + xs).astype(np.int32)
+        self.build_lookups()
+        return self
+
+    def build_lookups(self):
+        """جداول بايثون للاستعلام السريع أثناء اللعب"""
+        ys, xs = np.nonzero(self.tiles)
+        self.blocked_cells = list(zip(xs.tolist(), ys.tolist()))
+        self.blocked = set(self.blocked_cells)
+        self.food_cell_list = [(int(index) % self.width, int(index) // self.width)
+                               for index in self.food_cells]
+
+    def is_blocked(self, x, y):
+        """هل الخلية عائق أو خارج الساحة"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return True
+        return (x, y) in self.blocked
+
+    def get_tile_type(self, x, y):
+        """نوع العائق في الخلية ('wall' أو 'spike') أو None"""
+        return TILE_TYPES.get(int(self.tiles[y, x]))
+
+    def random_food_cell(self, rng, occupied=(), attempts=100):
+        """خلية طعام عشوائية من الخلايا المحسوبة مسبقاً (None إن لم توجد خلية حرة)"""
+        cells = self.food_cell_list
+        if not cells:
+            return None
+        for _ in range(attempts):
+            cell = cells[rng.randrange(len(cells))]
+            if cell not in occupied:
+                return cell
+
+        # الساحة شبه ممتلئة: الاختيار من الخلايا الحرة مباشرة
+        occupied = set(occupied)
+        free_cells = [cell for cell in cells if cell not in occupied]
+        return rng.choice(free_cells) if free_cells else None
+
+    def random_world_position(self, rng, avoid_positions=(), min_distance=GRID_SIZE * 1.5, attempts=100):
+        """موقع بإحداثيات العالم (مركز خلية) بعيد عن المواقع المعطاة (أو آخر محاولة)"""
+        cells = self.food_cell_list
+        if not cells:
+            return None
+        min_distance_sq = min_distance * min_distance
+        for _ in range(attempts):
+            x, y = cells[rng.randrange(len(cells))]
+            position = [x * GRID_SIZE + GRID_SIZE // 2, y * GRID_SIZE + GRID_SIZE // 2]
+            if all((position[0] - px) ** 2 + (position[1] - py) ** 2 >= min_distance_sq
+                   for px, py in avoid_positions):
+                return position
+        return position
+
+    def get_spawn_world_position(self):
+        """نقطة البداية بإحداثيات العالم"""
+        return (self.spawn[0] * GRID_SIZE + GRID_SIZE // 2,
+                self.spawn[1] * GRID_SIZE + GRID_SIZE // 2)
+
+# === الحسابات المسبقة ===
+
+def compute_distance_field(free, start):
+    """BFS من start على الخلايا الحرة؛ -1 للخلايا غير القابلة للوصول"""
+    height, width = free.shape
+    distance = np.full((height, width), -1, dtype=np.int32)
+    start_x, start_y = start
+    if not free[start_y, start_x]:
+        return distance
+
+    distance[start_y, start_x] = 0
+    queue = deque([(start_x, start_y)])
+    while queue:
+        x, y = queue.popleft()
+        next_distance = distance[y, x] + 1
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and free[ny, nx] and distance[ny, nx] < 0:
+                distance[ny, nx] = next_distance
+                queue.append((nx, ny))
+    return distance
+
+def label_components(free):
+    """ترقيم المكونات المتصلة للخلايا الحرة (1، 2، ...)، و0 للعوائق"""
+    height, width = free.shape
+    labels = np.zeros((height, width), dtype=np.int32)
+    label = 0
+    for start_y, start_x in zip(*np.nonzero(free)):
+        if labels[start_y, start_x]:
+            continue
+        label += 1
+        labels[start_y, start_x] = label
+        stack = [(start_x, start_y)]
+        while stack:
+            x, y = stack.pop()
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and free[ny, nx] and not labels[ny, nx]:
+                    labels[ny, nx] = label
+                    stack.append((nx, ny))
+    return labels
+
+def find_dead_ends(free):
+    """الممرات المسدودة: تقشير الخلايا ذات المخرج الواحد حتى لا يتبقى منها شيء
+
+    الخلية التي تدخلها من ممر مسدود لا تخرج منها إلا بالرجوع، فلا يوضع فيها طعام.
+    """
+    dead = np.zeros_like(free)
+    while True:
+        open_cells = free & ~dead
+        padded = np.pad(open_cells, 1, constant_values=False).astype(np.int8)
+        exits = (padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:])
+        peeled = open_cells & (exits <= 1)
+        if not peeled.any():
+            return dead
+        dead |= peeled
+
+# === قراءة الملفات ===
+
+def parse_rows(rows):
+    """تحويل أسطر الخريطة إلى مصفوفة عوائق ونقطة البداية"""
+    rows = [row.rstrip('\n') for row in rows]
+    if not rows:
+        raise ValueError("arena has no rows")
+    width = max(len(row) for row in rows)
+
+    tiles = np.zeros((len(rows), width), dtype=np.uint8)
+    spawn = None
+    for y, row in enumerate(rows):
+        for x, char in enumerate(row.ljust(width, '.')):
+            if char not in TILE_CODES:
+                raise ValueError(f"unknown tile {char!r} at {x},{y}")
+            tiles[y, x] = TILE_CODES[char]
+            if char == 'S':
+                spawn = (x, y)
+    return tiles, spawn
+
+def parse_point(value, field):
+    """نقطة (x, y) من نص "x,y" (رأس الملف النصي) أو قائمة [x, y] (JSON)"""
+    if isinstance(value, str):
+        try:
+            value = [int(part) for part in value.replace(',', ' ').split()]
+        except ValueError:
+            raise ValueError(f"invalid {field} {value!r}, expected x,y")
+    if not isinstance(value, (list, tuple)) or len(value) != 2 \
+            or not all(isinstance(part, int) and not isinstance(part, bool) for part in value):
+        raise ValueError(f"invalid {field} {value!r}, expected x,y")
+    return (value[0], value[1])
+
+def parse_direction(value):
+    """الاتجاه من اسم ('right') أو "1,0" أو قائمة [1, 0]"""
+    if isinstance(value, str) and value in DIRECTION_NAMES:
+        return DIRECTION_NAMES[value]
+    direction = parse_point(value, 'direction')
+    if direction not in DIRECTION_NAMES.values():
+        raise ValueError(f"invalid direction {value!r}")
+    return direction
+
+def parse_arena(text, source=None):
+    """قراءة نص الخريطة: JSON أو نص بسطور "key: value" ثم الشبكة"""
+    stripped = text.lstrip()
+    if stripped.startswith('{'):
+        data = json.loads(text)
+        if not isinstance(data, dict) or not isinstance(data.get('rows'), list) \
+                or not all(isinstance(row, str) for row in data['rows']):
+            raise ValueError("arena JSON needs a 'rows' list of strings")
+        rows = data.pop('rows')
+        metadata = data
+    else:
+        metadata = {}
+        rows = []
+        for line in text.splitlines():
+            if not rows and (not line.strip() or line.startswith(';')):
+                continue
+            if not rows and ':' in line:
+                key, value = line.split(':', 1)
+                metadata[key.strip()] = value.strip()
+            elif line.strip() or rows:
+                rows.append(line)
+        while rows and not rows[-1].strip():
+            rows.pop()
+
+    tiles, spawn = parse_rows(rows)
+    if 'spawn' in metadata:
+        spawn = parse_point(metadata.pop('spawn'), 'spawn')
+    if spawn is None:
+        raise ValueError("arena has no spawn point ('S')")
+    height, width = tiles.shape
+    if not (0 <= spawn[0] < width and 0 <= spawn[1] < height):
+        raise ValueError(f"spawn {spawn} is outside the {width}x{height} arena")
+    if tiles[spawn[1], spawn[0]] != EMPTY:
+        raise ValueError(f"spawn {spawn} is inside an obstacle")
+
+    direction = parse_direction(metadata.pop('direction', 'right'))
+    default_name = os.path.splitext(os.path.basename(source))[0] if source else 'arena'
+    name = metadata.pop('name', default_name)
+    return Arena(name, tiles, spawn, direction, metadata, source)
+
+def format_arena(arena):
+    """نص JSON للساحة يعيد parse_arena قراءته (لتضمينها في ملفات أخرى مثل الإعادات)"""
+    chars = {code: char for char, code in TILE_CODES.items() if char in '.#^'}
+    rows = [''.join(chars[int(code)] for code in row) for row in arena.tiles]
+    data = dict(arena.metadata, name=arena.name, rows=rows,
+                spawn=list(arena.spawn), direction=list(arena.direction))
+    return json.dumps(data)
+
+# === الذاكرة المؤقتة ===
+
+_arena_cache = {}
+
+def get_cache_path(path, digest):
+    """ملف الساحة المحسوبة على القرص (الاسم يتضمن بصمة المحتوى)"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(ARENA_CACHE_DIR, f"{stem}_{digest[:16]}.npz")
+
+def save_compiled(arena, cache_path):
+    """حفظ الساحة المحسوبة كملف npz"""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        header = {
+            'version': ARENA_FORMAT_VERSION,
+            'name': arena.name,
+            'spawn': list(arena.spawn),
+            'direction': list(arena.direction),
+            'metadata': arena.metadata,
+        }
+        temp_path = cache_path + ".tmp.npz"
+        np.savez_compressed(temp_path, header=np.array(json.dumps(header)),
+                            tiles=arena.tiles, distance=arena.distance,
+                            components=arena.components, dead_ends=arena.dead_ends,
+                            food_cells=arena.food_cells)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Error caching arena: {e}")
+
+def load_compiled(cache_path, source):
+    """قراءة ساحة محسوبة من القرص (None إذا لم توجد أو كانت قديمة)"""
+    try:
+        with np.load(cache_path) as data:
+            header = json.loads(str(data['header']))
+            if header['version'] != ARENA_FORMAT_VERSION:
+                return None
+            arena = Arena(header['name'], data['tiles'], tuple(header['spawn']),
+                          tuple(header['direction']), header['metadata'], source)
+            arena.distance = data['distance']
+            arena.components = data['components']
+            arena.dead_ends = data['dead_ends']
+            arena.food_cells = data['food_cells']
+    except (OSError, KeyError, ValueError):
+        return None
+    arena.build_lookups()
+    return arena
+
+def load_arena(path):
+    """تحميل ساحة: من الذاكرة، أو من القرص إذا لم يتغير الملف، وإلا قراءة وحساب وحفظ"""
+    with open(path, 'rb') as f:
+        source_bytes = f.read()
+    digest = hashlib.sha1(source_bytes).hexdigest()
+
+    key = (os.path.abspath(path), digest)
+    if key in _arena_cache:
+        return _arena_cache[key]
+
+    cache_path = get_cache_path(path, digest)
+    arena = load_compiled(cache_path, path)
+    if arena is None:
+        arena = parse_arena(source_bytes.decode('utf-8'), path).compile()
+        save_compiled(arena, cache_path)
+
+    _arena_cache[key] = arena
+    return arena
+
+def list_arenas(directory=ARENA_DIR):
+    """ملفات الساحات المتوفرة"""
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    return [os.path.join(directory, name) for name in names
+            if name.endswith(('.txt', '.json'))]
\ No newline at end of file
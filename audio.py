@@ -4,6 +4,8 @@
 
 import pygame
 import math
+import queue
+import threading
 import numpy as np
 from config import *
 
@@ -74,6 +76,118 @@ class SoundEffect:
         """تشغيل الصوت"""
         self.sound.play()
 
+class MusicGenerator:
+    """مولّد موسيقى إجرائي يعمل في خيط خلفي ويغذي قناة مخصصة"""
+    # المقامات والتتابعات لكل مقطوعة (فواصل نصف نغمية من الجذر)
+    TRACKS = {
+        'menu': {'root': 220.00, 'scale': [0, 3, 5, 7, 10], 'progression': [0, 5, 3, 4], 'wave': 'triangle'},
+        'game': {'root': 164.81, 'scale': [0, 2, 3, 5, 7, 8, 10], 'progression': [0, 0, 5, 4], 'wave': 'square'},
+    }
+    
+    def __init__(self, channel, sample_rate=22050, lookahead=4):
+        self.channel = channel
+        self.sample_rate = sample_rate
+        self.lookahead = lookahead
+        self.bpm = 100.0
+        self.track = self.TRACKS['game']
+        
+        # طابور محدود: الذاكرة ثابتة مهما طالت الجلسة
+        self.chunks = queue.Queue(maxsize=lookahead)
+        self.beat = 0
+        self.phase = {'bass': 0.0, 'lead': 0.0}
+        self.stop_event = threading.Event()
+        self.thread = None
+    
+    def start(self, track_name):
+        """بدء التوليد لمقطوعة معينة"""
+        self.track = self.TRACKS.get(track_name, self.TRACKS['game'])
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name="music-generator", daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """إيقاف التوليد وتفريغ القناة"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        self.channel.stop()
+        while not self.chunks.empty():
+            self.chunks.get_nowait()
+    
+    def set_volume(self, volume):
+        """مستوى الموسيقى على القناة فقط (المقاطع تبقى بمستواها الكامل)"""
+        self.channel.set_volume(volume)
+    
+    def set_tempo(self, speed):
+        """ربط الإيقاع بسرعة الثعبان"""
+        self.bpm = max(80.0, min(180.0, 100.0 + (speed - INITIAL_SPEED) * 6.0))
+    
+    def run(self):
+        """حلقة الخيط: توليد مسبق محدود + تغذية القناة عبر Channel.queue"""
+        pending = None
+        while not self.stop_event.is_set():
+            if pending is None and not self.chunks.full():
+                pending = self.generate_chunk()
+            if pending is not None:
+                try:
+                    self.chunks.put_nowait(pending)
+                    pending = None
+                except queue.Full:
+                    pass
+            
+            # الخيط هو من يغذي القناة، لذا لا يؤثر تعثر الإطار الرئيسي على الصوت
+            if self.channel.get_queue() is None and not self.chunks.empty():
+                sound = pygame.sndarray.make_sound(self.chunks.get_nowait())
+                if self.channel.get_busy():
+                    self.channel.queue(sound)
+                else:
+                    self.channel.play(sound)
+            else:
+                self.stop_event.wait(0.01)
+    
+    def oscillator(self, frequency, n_samples, voice, wave_type):
+        """مذبذب بطور مستمر بين المقاطع لتجنب النقرات"""
+        step = frequency / self.sample_rate
+        phase = self.phase[voice] + step * np.arange(n_samples)
+        self.phase[voice] = (self.phase[voice] + step * n_samples) % 1.0
+        phase %= 1.0
+        
+        if wave_type == 'square':
+            return np.where(phase < 0.5, 1.0, -1.0)
+        elif wave_type == 'triangle':
+            return 4.0 * np.abs(phase - 0.5) - 1.0
+        return np.sin(2 * np.pi * phase)
+    
+    def generate_chunk(self):
+        """توليد نبضة واحدة (باص + نغمتا أربيجيو)"""
+        beat_length = 60.0 / self.bpm
+        n_samples = int(beat_length * self.sample_rate)
+        scale = self.track['scale']
+        
+        chord_root = self.track['progression'][(self.beat // 4) % len(self.track['progression'])]
+        bass_freq = self.track['root'] * 2 ** (chord_root / 12.0) / 2
+        bass = self.oscillator(bass_freq, n_samples, 'bass', 'triangle')
+        
+        half = n_samples // 2
+        lead = np.empty(n_samples)
+        for i, (start, end) in enumerate(((0, half), (half, n_samples))):
+            degree = scale[(self.beat * 2 + i * 2 + chord_root) % len(scale)]
+            lead_freq = self.track['root'] * 2 ** ((chord_root + degree) / 12.0) * 2
+            lead[start:end] = self.oscillator(lead_freq, end - start, 'lead', self.track['wave'])
+            
+            # غلاف بسيط لكل نغمة
+            decay = np.linspace(1.0, 0.2, end - start)
+            lead[start:end] *= decay
+        
+        wave = bass * 0.35 + lead * 0.15
+        self.beat += 1
+        
+        wave_normalized = np.int16(wave * 32767)
+        return np.ascontiguousarray(np.array([wave_normalized, wave_normalized]).T)
+
 class AudioManager:
     """مدير الصوتيات"""
     def __init__(self):
@@ -83,6 +197,11 @@ class AudioManager:
         self.sfx_volume = 0.8
         self.music_playing = None
         
+        # قناة محجوزة للموسيقى الإجرائية
+        pygame.mixer.set_reserved(1)
+        self.music = MusicGenerator(pygame.mixer.Channel(0))
+        self.music.set_volume(self.music_volume)
+        
         # إنشاء الأصوات
         self.create_sounds()
     
@@ -165,18 +284,26 @@ class AudioManager:
     
     def play_music(self, track_name):
         """تشغيل الموسيقى"""
-        # يمكن إضافة ملفات MP3 هنا
-        pass
+        if self.music_playing == track_name:
+            return
+        if self.music_playing:
+            self.music.stop()
+        self.music.start(track_name)
+        self.music_playing = track_name
+    
+    def set_music_tempo(self, speed):
+        """ضبط إيقاع الموسيقى حسب سرعة الثعبان"""
+        self.music.set_tempo(speed)
     
     def stop_music(self):
         """إيقاف الموسيقى"""
-        pygame.mixer.music.stop()
+        self.music.stop()
         self.music_playing = None
     
     def set_music_volume(self, volume):
         """ضبط مستوى الموسيقى"""
         self.music_volume = max(0.0, min(1.0, volume))
-        pygame.mixer.music.set_volume(self.music_volume)
+        self.music.set_volume(self.music_volume)
     
     def set_sfx_volume(self, volume):
         """ضبط مستوى المؤثرات الصوتية"""
@@ -188,4 +315,13 @@ class AudioManager:
     
     def resume_all(self):
         """استئناف كل الصوتيات"""
-        pygame.mixer.unpause()
\ No newline at end of file
+        pygame.mixer.unpause()
+
+_audio_manager = None
+
+def get_audio_manager():
+    """مدير الصوت المشترك (إنشاؤه لكل جولة كان يعيد تهيئة الخالط وتوليد كل الأصوات)"""
+    global _audio_manager
+    if _audio_manager is None:
+        _audio_manager = AudioManager()
+    return _audio_manager
\ No newline at end of file
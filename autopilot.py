@@ -0,0 +1,274 @@
+"""
+🤖 الطيار الآلي: A* نحو الطعام مع التحقق من الوصول للذيل
+"""
+
+import heapq
+from array import array
+from config import *
+
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+class SearchArena:
+    """مصفوفات محجوزة مسبقاً لإعادة استخدامها في كل بحث (بدل مسح المجموعات)"""
+    def __init__(self, grid_width, grid_height):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        size = grid_width * grid_height
+        
+        self.g_score = array('i', [0]) * size
+        self.parent = array('i', [0]) * size
+        self.open_stamp = array('I', [0]) * size    # الخلية في قائمة البحث لهذا البحث
+        self.closed_stamp = array('I', [0]) * size  # الخلية أُغلقت في هذا البحث
+        self.occupied_stamp = array('I', [0]) * size
+        self.free_after = array('i', [0]) * size    # عدد الخطوات حتى تتحرر الخلية
+        self.stamp = 0
+        self.occupancy_stamp = 0
+        
+        # إشغال لوحة مشتركة اختياري (MultiSnakeSimulation.occupancy): أي قيمة غير 0 وغير own_id مغلقة
+        self.shared_occupancy = None
+        self.own_id = 0
+        
+        # العوائق الثابتة (الساحة) تُحذف من جدول الجيران مرة واحدة
+        self.static_blocked = bytearray(size)
+        self.neighbor_table = self.build_neighbor_table()
+    
+    def build_neighbor_table(self):
+        """جيران كل خلية داخل الشبكة، بدون الخلايا المغلقة دائماً"""
+        width = self.grid_width
+        size = width * self.grid_height
+        blocked = self.static_blocked
+        table = []
+        for index in range(size):
+            x = index % width
+            cells = []
+            if x + 1 < width:
+                cells.append(index + 1)
+            if x > 0:
+                cells.append(index - 1)
+            if index + width < size:
+                cells.append(index + width)
+            if index >= width:
+                cells.append(index - width)
+            table.append([cell for cell in cells if not blocked[cell]])
+        return table
+    
+    def set_static_blocked(self, cells):
+        """تسجيل عوائق ثابتة (x, y) لا تتغير طوال الجولة"""
+        self.static_blocked = bytearray(self.grid_width * self.grid_height)
+        for x, y in cells:
+            self.static_blocked[y * self.grid_width + x] = 1
+        self.neighbor_table = self.build_neighbor_table()
+    
+    def neighbors(self, index):
+        """جيران الخلية من الجدول المحسوب مسبقاً"""
+        return self.neighbor_table[index]
+    
+    def next_stamp(self):
+        """بدء بحث جديد دون مسح المصفوفات"""
+        self.stamp += 1
+        return self.stamp
+    
+    def mark_body(self, body, blocked=()):
+        """تسجيل الجسم (الرأس أولاً) والعوائق في مصفوفة الإشغال"""
+        self.occupancy_stamp += 1
+        stamp = self.occupancy_stamp
+        width = self.grid_width
+        length = len(body)
+        
+        for i, (x, y) in enumerate(body):
+            index = y * width + x
+            self.occupied_stamp[index] = stamp
+            # قطعة الجسم رقم i تُخلى بعد (length - i) خطوة، ويُسمح بدخولها في الخطوة التالية
+            # (القواعد تفحص الاصطدام قبل إزالة الذيل)
+            self.free_after[index] = length - i + 1
+        
+        for x, y in blocked:
+            index = y * width + x
+            self.occupied_stamp[index] = stamp
+            self.free_after[index] = 1 << 30
+    
+    def find_path(self, start, goal, max_nodes=None):
+        """A* بمسافة مانهاتن؛ يرجع قائمة الخلايا من بعد البداية حتى الهدف أو None"""
+        width = self.grid_width
+        start_index = start[1] * width + start[0]
+        goal_index = goal[1] * width + goal[0]
+        goal_x, goal_y = goal
+        
+        stamp = self.next_stamp()
+        occupancy = self.occupancy_stamp
+        g_score, parent = self.g_score, self.parent
+        open_stamp, closed_stamp = self.open_stamp, self.closed_stamp
+        occupied_stamp, free_after = self.occupied_stamp, self.free_after
+        shared, own_id = self.shared_occupancy, self.own_id
+        neighbors = self.neighbors
+        
+        g_score[start_index] = 0
+        open_stamp[start_index] = stamp
+        heap = [(abs(start[0] - goal_x) + abs(start[1] - goal_y), 0, start_index)]
+        expanded = 0
+        
+        while heap:
+            _, g, index = heapq.heappop(heap)
+            if closed_stamp[index] == stamp:
+                continue
+            closed_stamp[index] = stamp
+            
+            if index == goal_index:
+                return self.build_path(start_index, goal_index)
+            
+            expanded += 1
+            if max_nodes and expanded > max_nodes:
+                return None
+            
+            next_g = g + 1
+            for neighbor in neighbors(index):
+                if closed_stamp[neighbor] == stamp:
+                    continue
+                if shared is not None and shared[neighbor] and shared[neighbor] != own_id:
+                    continue
+                # الخلية المشغولة مسموحة فقط إذا تحررت قبل الوصول إليها
+                if occupied_stamp[neighbor] == occupancy and free_after[neighbor] > next_g:
+                    continue
+                if open_stamp[neighbor] == stamp and g_score[neighbor] <= next_g:
+                    continue
+                
+                open_stamp[neighbor] = stamp
+                g_score[neighbor] = next_g
+                parent[neighbor] = index
+                nx, ny = neighbor % width, neighbor // width
+                h = abs(nx - goal_x) + abs(ny - goal_y)
+                heapq.heappush(heap, (next_g + h, h, neighbor))
+        
+        return None
+    
+    def build_path(self, start_index, goal_index):
+        """إعادة بناء المسار من مصفوفة الآباء"""
+        width = self.grid_width
+        path = []
+        index = goal_index
+        while index != start_index:
+            path.append((index % width, index // width))
+            index = self.parent[index]
+        path.reverse()
+        return path
+    
+    def count_reachable(self, start, limit):
+        """عدد الخلايا الحرة القابلة للوصول (حتى حد معين)"""
+        width = self.grid_width
+        start_index = start[1] * width + start[0]
+        stamp = self.next_stamp()
+        occupancy = self.occupancy_stamp
+        shared, own_id = self.shared_occupancy, self.own_id
+        
+        self.closed_stamp[start_index] = stamp
+        frontier = [start_index]
+        count = 0
+        while frontier and count < limit:
+            index = frontier.pop()
+            count += 1
+            for neighbor in self.neighbors(index):
+                if self.closed_stamp[neighbor] == stamp:
+                    continue
+                if shared is not None and shared[neighbor] and shared[neighbor] != own_id:
+                    continue
+                if self.occupied_stamp[neighbor] == occupancy and self.free_after[neighbor] > 1:
+                    continue
+                self.closed_stamp[neighbor] = stamp
+                frontier.append(neighbor)
+        return count
+
+class Autopilot:
+    """طيار آلي لوضع العرض وكخصم مرجعي"""
+    def __init__(self, grid_width, grid_height, max_nodes=AUTOPILOT_MAX_NODES):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.arena = SearchArena(grid_width, grid_height)
+        self.max_nodes = max_nodes
+        self.components = None
+    
+    def set_arena(self, arena):
+        """جدران الساحة تدخل جدول الجيران مرة واحدة بدل تمريرها كعوائق في كل خطوة"""
+        self.arena.set_static_blocked(arena.blocked_cells if arena else ())
+        self.components = arena.components if arena else None
+    
+    def next_direction(self, snake, food, obstacles=(), direction=None, occupancy=None, own_id=0):
+        """اختيار الاتجاه التالي؛ snake قائمة خلايا والرأس أولاً"""
+        head = snake[0]
+        arena = self.arena
+        
+        # لوحة مشتركة: أجسام الآخرين تُقرأ من مصفوفة الإشغال مباشرة بدل قائمة عوائق
+        arena.shared_occupancy = occupancy
+        arena.own_id = own_id
+        
+        # ثعبان بطول 1 لا يستطيع الرجوع للخلف: نعامل الخلية الخلفية كعائق
+        if len(snake) == 1 and direction:
+            behind = (head[0] - direction[0], head[1] - direction[1])
+            if 0 <= behind[0] < self.grid_width and 0 <= behind[1] < self.grid_height:
+                obstacles = list(obstacles) + [behind]
+        
+        # طعام في مكون آخر من الساحة: لا مسار إليه، فلا داعي للبحث
+        if food is not None and self.components is not None \
+                and self.components[food[1], food[0]] != self.components[head[1], head[0]]:
+            food = None
+        
+        # 1) أقصر مسار نحو الطعام
+        if food is not None:
+            arena.mark_body(snake, obstacles)
+            path = arena.find_path(head, food, self.max_nodes)
+            if path and self.tail_reachable_after(snake, path, obstacles):
+                return self.direction_to(head, path[0])
+        
+        # 2) ملاحقة الذيل
+        if len(snake) > 1:
+            arena.mark_body(snake, obstacles)
+            path = arena.find_path(head, snake[-1], self.max_nodes)
+            if path:
+                return self.direction_to(head, path[0])
+        
+        # 3) أكثر حركة آمنة مساحةً
+        return self.safest_direction(snake, obstacles)
+    
+    def tail_reachable_after(self, snake, path, obstacles):
+        """محاكاة الأكل ثم التحقق بـ A* من إمكانية الوصول للذيل"""
+        length = len(snake) + 1
+        virtual_body = list(reversed(path))[:length]
+        if len(virtual_body) < length:
+            virtual_body.extend(snake[:length - len(virtual_body)])
+        
+        if len(virtual_body) < 2:
+            return True
+        
+        self.arena.mark_body(virtual_body, obstacles)
+        return self.arena.find_path(virtual_body[0], virtual_body[-1], self.max_nodes) is not None
+    
+    def safest_direction(self, snake, obstacles):
+        """الحركة التي تترك أكبر مساحة حرة"""
+        head = snake[0]
+        self.arena.mark_body(snake, obstacles)
+        width = self.grid_width
+        best_direction = None
+        best_space = -1
+        
+        for dx, dy in DIRECTIONS:
+            x, y = head[0] + dx, head[1] + dy
+            if not (0 <= x < width and 0 <= y < self.grid_height):
+                continue
+            index = y * width + x
+            if self.arena.static_blocked[index]:
+                continue
+            shared = self.arena.shared_occupancy
+            if shared is not None and shared[index] and shared[index] != self.arena.own_id:
+                continue
+            if self.arena.occupied_stamp[index] == self.arena.occupancy_stamp \
+                    and self.arena.free_after[index] > 1:
+                continue
+            space = self.arena.count_reachable((x, y), len(snake) * 2)
+            if space > best_space:
+                best_space = space
+                best_direction = (dx, dy)
+        
+        return best_direction or (1, 0)
+    
+    def direction_to(self, head, cell):
+        """الاتجاه من الرأس إلى خلية مجاورة"""
+        return (cell[0] - head[0], cell[1] - head[1])
\ No newline at end of file
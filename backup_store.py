@@ -0,0 +1,122 @@
+"""
+🗃️ نسخ احتياطي تزايدي بعناوين المحتوى
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+from persistence import atomic_write
+
+class BackupStore:
+    """مخزن كائنات (sha256) + ملف manifest صغير لكل نسخة احتياطية"""
+    def __init__(self, backup_dir):
+        self.backup_dir = backup_dir
+        self.objects_dir = os.path.join(backup_dir, "objects")
+        self.manifests_dir = os.path.join(backup_dir, "manifests")
+        self.stat_cache_file = os.path.join(backup_dir, "stat_cache.json")
+        self.lock = threading.Lock()
+        
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+    
+    def get_object_path(self, digest):
+        """مسار الكائن حسب بصمته"""
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+    
+    def get_manifest_path(self, backup_name):
+        """مسار ملف manifest"""
+        return os.path.join(self.manifests_dir, f"{backup_name}.json")
+    
+    def load_stat_cache(self):
+        """ذاكرة (الحجم، وقت التعديل) -> البصمة لتجنب إعادة حساب الملفات غير المتغيرة"""
+        try:
+            with open(self.stat_cache_file, 'r') as f:
+                return json.load(f)
+        except:
+            return {}
+    
+    def hash_file(self, path, stat_cache):
+        """حساب بصمة الملف، وتخزين محتواه إن لم يكن موجوداً في المخزن"""
+        stat = os.stat(path)
+        cached = stat_cache.get(path)
+        if cached and cached['size'] == stat.st_size and cached['mtime'] == stat.st_mtime_ns:
+            if os.path.exists(self.get_object_path(cached['hash'])):
+                return cached['hash'], stat.st_size
+        
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        
+        object_path = self.get_object_path(digest)
+        if not os.path.exists(object_path):
+            atomic_write(object_path, zlib.compress(data))
+        
+        stat_cache[path] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'hash': digest}
+        return digest, stat.st_size
+    
+    def create_backup(self, backup_name, root_dir, files, snapshots=None):
+        """إنشاء نسخة احتياطية؛ الملفات غير المتغيرة لا تُنسخ مرة أخرى
+
+        snapshots: {المسار النسبي: ملف لقطة} لملفات لا تُقرأ مباشرة (مثل قاعدة SQLite مفتوحة).
+        """
+        with self.lock:
+            stat_cache = self.load_stat_cache()
+            entries = {}
+            
+            for path in files:
+                if not os.path.exists(path):
+                    continue
+                digest, size = self.hash_file(path, stat_cache)
+                relative_path = os.path.relpath(path, root_dir).replace(os.sep, '/')
+                entries[relative_path] = {'hash': digest, 'size': size}
+            
+            for relative_path, path in (snapshots or {}).items():
+                digest, size = self.hash_file(path, stat_cache)
+                entries[relative_path] = {'hash': digest, 'size': size}
+            
+            manifest = {
+                'name': backup_name,
+                'date': datetime.now().isoformat(),
+                'files': entries
+            }
+            manifest_path = self.get_manifest_path(backup_name)
+            atomic_write(manifest_path, json.dumps(manifest, indent=2))
+            atomic_write(self.stat_cache_file, json.dumps(stat_cache))
+            return manifest_path
+    
+    def load_manifest(self, backup_name):
+        """تحميل manifest نسخة احتياطية"""
+        with open(self.get_manifest_path(backup_name), 'r') as f:
+            return json.load(f)
+    
+    def list_backups(self):
+        """قائمة أسماء النسخ الاحتياطية"""
+        return sorted(name[:-5] for name in os.listdir(self.manifests_dir) if name.endswith('.json'))
+    
+    def restore_backup(self, backup_name, root_dir, tracked_files, redirects=None):
+        """إعادة بناء الملفات من manifest وحذف الملفات المتتبعة غير الموجودة فيه
+
+        redirects: {المسار النسبي: مسار بديل} لكتابة لقطة في مكان آخر بدل ملفها الأصلي.
+        """
+        with self.lock:
+            manifest = self.load_manifest(backup_name)
+            restored = set()
+            
+            for relative_path, entry in manifest['files'].items():
+                with open(self.get_object_path(entry['hash']), 'rb') as f:
+                    data = zlib.decompress(f.read())
+                if hashlib.sha256(data).hexdigest() != entry['hash']:
+                    raise ValueError(f"Corrupt backup object for {relative_path}")
+                
+                path = (redirects or {}).get(relative_path) or os.path.join(root_dir, *relative_path.split('/'))
+                atomic_write(path, data)
+                restored.add(os.path.normpath(path))
+            
+            for path in tracked_files:
+                if os.path.normpath(path) not in restored and os.path.exists(path):
+                    os.remove(path)
+            
+            return True
\ No newline at end of file
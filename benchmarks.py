@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ قياسات الأداء للمسارات الساخنة (JSON ثابت الصيغة + مقارنة بخط أساس)
+
+الاستخدام:
+    python benchmarks.py --output baseline.json
+    python benchmarks.py --compare baseline.json --threshold 0.10
+    python benchmarks.py --input current.json --compare baseline.json
+"""
+
+import os
+
+# القياس بدون نافذة أو جهاز صوت حقيقي
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pygame
+from config import *
+
+BENCH_FORMAT_VERSION = 1
+DEFAULT_REPEATS = 5
+DEFAULT_MIN_TIME = 0.2       # ثواني لكل تكرار (يحدد عدد الحلقات تلقائياً)
+DEFAULT_THRESHOLD = 0.10     # تراجع إذا زاد الوسيط أكثر من 10%
+
+SNAKE_LENGTHS = (10, 1000, 10000)
+PARTICLE_COUNTS = (1000, 10000)
+
+# (الاسم، دالة التهيئة، المعامل) - التهيئة ترجع دالة بدون معاملات للقياس
+BENCHMARKS = []
+
+def register(name, setup, *args):
+    """تسجيل قياس"""
+    BENCHMARKS.append((name, setup, args))
+
+# ===== تهيئة القياسات =====
+
+def make_snake(length):
+    """ثعبان أفقي بطول محدد"""
+    from snake import Snake
+    snake = Snake(GRID_SIZE * 5, GRID_SIZE * 5)
+    snake.growth_pending = 0
+    for i in range(length):
+        snake.add_segment(snake.head.x - (i + 1) * GRID_SIZE, snake.head.y)
+    return snake
+
+def setup_snake_move(length):
+    return make_snake(length).move
+
+def setup_snake_update_body(length):
+    return make_snake(length).update_body
+
+def setup_snake_self_collision(length):
+    # بدون اصطدام: الحلقة تفحص الجسم كاملاً
+    return make_snake(length).check_self_collision
+
+def setup_spawn_special_food(fill_ratio):
+    """لوحة مزدحمة: الثعبان يغطي نسبة من الخلايا فتفشل معظم المحاولات"""
+    from food import FoodManager
+    rng = random.Random(1)
+    manager = FoodManager(GRID_WIDTH, GRID_HEIGHT, random.Random(2))
+    cells = [(x, y) for x in range(GRID_WIDTH) for y in range(GRID_HEIGHT)]
+    rng.shuffle(cells)
+    snake_positions = [(x * GRID_SIZE + GRID_SIZE // 2, y * GRID_SIZE + GRID_SIZE // 2)
+                       for x, y in cells[:int(len(cells) * fill_ratio)]]
+    for _ in range(3):
+        manager.spawn_food(snake_positions)
+
+    def spawn():
+        manager.spawn_special_food(snake_positions)
+        manager.special_foods.clear()
+    return spawn
+
+def setup_obstacle_collision(hit):
+    from obstacles import ObstacleManager
+    manager = ObstacleManager(GRID_WIDTH, GRID_HEIGHT, random.Random(3))
+    if hit:
+        # آخر عائق في القائمة: أسوأ حالة للإصابة
+        target = (manager.obstacles + manager.moving_obstacles)[-1]
+        x, y = target.x, target.y
+    else:
+        x, y = GRID_WIDTH * GRID_SIZE // 2 + 7, GRID_HEIGHT * GRID_SIZE // 2 + 7
+        while manager.check_collision(x, y, GRID_SIZE * 0.4):
+            x += GRID_SIZE
+    return lambda: manager.check_collision(x, y, GRID_SIZE * 0.4)
+
+def setup_particle_update(count):
+    from particles import Particle, ParticleSystem
+    system = ParticleSystem(random.Random(4))
+    for _ in range(count):
+        # عمر طويل حتى يبقى العدد ثابتاً بين التكرارات
+        system.add_particle(Particle(400, 300, 'spark', (255, 255, 255), lifetime=1e9, rng=system.rng))
+    return lambda: system.update(1 / 60)
+
+def setup_generate_sound(wave_type):
+    from audio import SoundEffect
+    if not pygame.mixer.get_init():
+        pygame.mixer.init(22050, -16, 2, 512)
+    effect = SoundEffect(440, 0.3, wave_type)
+    return effect.generate_sound
+
+def make_game_data(body_length=200):
+    """بيانات حفظ بحجم جولة متوسطة (نفس شكل PlayingState.get_save_data)"""
+    rng = np.random.default_rng(5)
+    return {
+        'score': 12345,
+        'level': 7,
+        'combo': 3,
+        'max_combo': 9,
+        'foods_eaten': 150,
+        'special_eaten': 12,
+        'play_time': 600.5,
+        'multiplier': 1.0,
+        'snake_speed': 12,
+        'snake_direction': [1.0, 0.0],
+        'next_direction': [1, 0],
+        'growth_pending': 0,
+        'move_timer': 0.4,
+        'snake_body': rng.integers(0, 800, size=(body_length, 2)),
+        'foods': rng.integers(0, 800, size=(2, 2)),
+        'special_foods': rng.integers(0, 800, size=(3, 2)),
+        'special_times': rng.random(3) * 10,
+        'special_food_types': ['golden', 'speed', 'shield'],
+        'food_spawn_timer': 2.5,
+        'powerups': rng.integers(0, 800, size=(2, 2)),
+        'powerup_times': rng.random(2) * 10,
+        'powerup_types': ['ghost', 'bomb'],
+        'powerup_timer': 7.5,
+        'active_effects': {},
+        'obstacles': rng.integers(0, 800, size=(120, 2)),
+        'obstacle_types': ['wall'] * 120,
+        'moving_obstacles': rng.random((2, 7)) * 800,
+        'timer_names': ['shield'],
+        'timers': np.array([4.5]),
+    }
+
+_save_manager = None
+
+def get_bench_save_manager():
+    """مدير حفظ مشترك داخل مجلد العمل المؤقت"""
+    global _save_manager
+    if _save_manager is None:
+        from save_manager import SaveManager
+        _save_manager = SaveManager()
+    return _save_manager
+
+def setup_save_write():
+    manager = get_bench_save_manager()
+    game_data = make_game_data()
+
+    def write():
+        manager.save_game(dict(game_data), slot=0)
+        manager.writer.flush()
+    return write
+
+def setup_save_load():
+    manager = get_bench_save_manager()
+    manager.save_game(make_game_data(), slot=1)
+    return lambda: manager.load_game(1)
+
+def setup_save_slots():
+    manager = get_bench_save_manager()
+    for slot in range(3):
+        manager.save_game(make_game_data(), slot=slot)
+    return manager.get_save_slots
+
+def setup_save_high_score():
+    manager = get_bench_save_manager()
+    scores = iter(range(10 ** 9))
+
+    def write():
+        manager.save_high_score('Bench', next(scores), 1, 10, 60.0)
+        manager.writer.flush()
+    return write
+
+def setup_save_stats_append():
+    manager = get_bench_save_manager()
+
+    def append():
+        manager.save_game_stats({'player_name': 'Bench', 'score': 100, 'level': 2})
+        manager.writer.flush()
+    return append
+
+def setup_save_player_stats():
+    manager = get_bench_save_manager()
+    for i in range(1000):
+        manager.save_game_stats({'player_name': f'Player{i % 10}', 'score': i, 'level': 1})
+    manager.writer.flush()
+    return lambda: manager.get_player_stats('Player3')
+
+for length in SNAKE_LENGTHS:
+    register(f'snake.move[len={length}]', setup_snake_move, length)
+for length in SNAKE_LENGTHS:
+    register(f'snake.update_body[len={length}]', setup_snake_update_body, length)
+for length in SNAKE_LENGTHS:
+    register(f'snake.check_self_collision[len={length}]', setup_snake_self_collision, length)
+register('food.spawn_special_food[fill=0.5]', setup_spawn_special_food, 0.5)
+register('food.spawn_special_food[fill=0.9]', setup_spawn_special_food, 0.9)
+register('obstacles.check_collision[miss]', setup_obstacle_collision, False)
+register('obstacles.check_collision[hit]', setup_obstacle_collision, True)
+for count in PARTICLE_COUNTS:
+    register(f'particles.update[n={count}]', setup_particle_update, count)
+register('audio.generate_sound[sine]', setup_generate_sound, 'sine')
+register('audio.generate_sound[square]', setup_generate_sound, 'square')
+register('save.save_game', setup_save_write)
+register('save.load_game', setup_save_load)
+register('save.get_save_slots', setup_save_slots)
+register('save.save_high_score', setup_save_high_score)
+register('save.save_game_stats', setup_save_stats_append)
+register('save.get_player_stats', setup_save_player_stats)
+
+# ===== القياس =====
+
+def time_loops(func, loops):
+    """زمن تشغيل func عدد loops مرة (بدون جامع القمامة مثل timeit)"""
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+def calibrate(func, min_time):
+    """مضاعفة عدد الحلقات حتى يستغرق التكرار min_time على الأقل"""
+    loops = 1
+    while True:
+        elapsed = time_loops(func, loops)
+        if elapsed >= min_time or loops >= 10 ** 7:
+            return loops
+        # قفزة تقديرية بدل المضاعفة البطيئة
+        if elapsed > 0:
+            loops = max(loops * 2, int(loops * min_time / elapsed * 1.2))
+        else:
+            loops *= 10
+
+def measure(func, repeats, min_time):
+    """نتيجة قياس واحد: ثواني لكل عملية"""
+    loops = calibrate(func, min_time)
+    samples = [time_loops(func, loops) / loops for _ in range(repeats)]
+    return {
+        'loops': loops,
+        'repeats': repeats,
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if repeats > 1 else 0.0,
+    }
+
+def run_benchmarks(name_filter=None, repeats=DEFAULT_REPEATS, min_time=DEFAULT_MIN_TIME, report=None):
+    """تشغيل القياسات المسجلة في مجلد مؤقت وإرجاع نتيجة بصيغة JSON"""
+    global _save_manager
+    results = {}
+    skipped = {}
+
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='snake-bench-') as work_dir:
+        os.chdir(work_dir)
+        try:
+            for name, setup, args in BENCHMARKS:
+                if name_filter and name_filter not in name:
+                    continue
+                try:
+                    func = setup(*args)
+                    results[name] = measure(func, repeats, min_time)
+                except Exception as e:
+                    print(f"Error running benchmark {name}: {e}")
+                    skipped[name] = str(e)
+                    continue
+                if report:
+                    report(name, results[name])
+        finally:
+            if _save_manager is not None:
+                _save_manager.writer.flush()
+                _save_manager = None
+            os.chdir(original_dir)
+
+    return {
+        'format_version': BENCH_FORMAT_VERSION,
+        'created': datetime.now().isoformat(),
+        'machine': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pygame': pygame.version.ver,
+        },
+        'settings': {'repeats': repeats, 'min_time': min_time},
+        'benchmarks': results,
+        'skipped': skipped,
+    }
+
+def load_results(path):
+    """قراءة ملف نتائج والتحقق من الصيغة"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('format_version') != BENCH_FORMAT_VERSION:
+        raise ValueError(f"Unsupported benchmark format in {path}: {data.get('format_version')}")
+    return data
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """مقارنة الوسيط لكل قياس؛ يرجع قائمة (الاسم، الحالة، النسبة)"""
+    rows = []
+    current_benchmarks = current['benchmarks']
+    baseline_benchmarks = baseline['benchmarks']
+    for name in sorted(set(current_benchmarks) | set(baseline_benchmarks)):
+        if name not in baseline_benchmarks:
+            rows.append((name, 'new', None))
+            continue
+        if name not in current_benchmarks:
+            rows.append((name, 'missing', None))
+            continue
+
+        ratio = current_benchmarks[name]['median'] / baseline_benchmarks[name]['median']
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append((name, status, ratio))
+    return rows
+
+def format_time(seconds):
+    """تنسيق زمن العملية بوحدة مناسبة"""
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    if seconds >= 1e-6:
+        return f"{seconds * 1e6:.3f} us"
+    return f"{seconds * 1e9:.1f} ns"
+
+def main(argv=None):
+    """واجهة سطر الأوامر"""
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the game's hot paths")
+    parser.add_argument('--filter', help="only run benchmarks whose name contains this text")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME)
+    parser.add_argument('--output', help="write results JSON here")
+    parser.add_argument('--input', help="compare an existing results file instead of running")
+    parser.add_argument('--compare', help="baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown of the median that counts as a regression")
+    args = parser.parse_args(argv)
+
+    if args.input:
+        current = load_results(args.input)
+    else:
+        def report(name, result):
+            print(f"{name:<45} {format_time(result['median']):>12}  "
+                  f"(±{format_time(result['stdev'])}, {result['loops']} loops)")
+
+        current = run_benchmarks(args.filter, args.repeats, args.min_time, report)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f"💾 Results saved: {args.output}")
+
+    if not args.compare:
+        return 0
+
+    baseline = load_results(args.compare)
+    rows = compare_results(current, baseline, args.threshold)
+    print("=" * 50)
+    regressions = 0
+    for name, status, ratio in rows:
+        change = f"{(ratio - 1) * 100:+.1f}%" if ratio is not None else ""
+        marker = '❌' if status == 'regression' else '✅' if status == 'improvement' else ' '
+        print(f"{marker} {name:<45} {status:<12} {change}")
+        if status == 'regression':
+            regressions += 1
+
+    print(f"{regressions} regression(s) over {args.threshold:.0%} threshold")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
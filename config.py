@@ -112,4 +112,61 @@ SNAKE_TURN_SPEED = 0.2   # سرعة دوران الثعبان
 # ===== ملفات الحفظ =====
 SAVE_DIR = "saves"
 HIGH_SCORES_FILE = "saves/high_scores.json"
-GAME_SETTINGS_FILE = "saves/settings.json"
\ No newline at end of file
+GAME_SETTINGS_FILE = "saves/settings.json"
+# ===== لوحة المتصدرين =====
+LEADERBOARD_ENABLED = True                   # قاعدة SQLite لكل الجولات (اختياري)
+LEADERBOARD_DB = "saves/leaderboard.db"
+
+# ===== الإعادة =====
+RECORD_REPLAYS = True                        # تسجيل كل جولة في saves/replays
+REPLAY_KEEP = 50                             # عدد ملفات الإعادة المحفوظة (الأقدم يُحذف)
+
+# ===== محلل الإطارات =====
+PROFILER_HISTORY = 600                       # عدد الإطارات في الحلقة الدائرية (10 ثواني عند 60 FPS)
+PROFILE_DIR = "saves/profiles"               # مكان ملفات CSV (F4)
+
+# ===== مجمعات الكائنات =====
+PARTICLE_POOL_SIZE = 600                     # أكبر عدد جسيمات حرة محفوظة (انفجار = 50، مستوى جديد = 50 + باعث)
+PICKUP_POOL_SIZE = 8                         # لكل نوع من الطعام والمكافآت
+SEGMENT_POOL_SIZE = 400                      # قطع جسم الثعبان المحفوظة بين الجولات
+
+# ===== الإدخال =====
+INPUT_QUEUE_SIZE = 3                         # أقصى عدد انعطافات محفوظة بانتظار الخطوات التالية
+INPUT_LATENCY_HISTORY = 240                  # عدد عينات زمن الإدخال حتى الحركة
+
+# ===== الطيار الآلي =====
+AUTOPILOT_MAX_NODES = 20000                  # حد الخلايا الموسعة في كل بحث A* (None = بلا حد)
+
+# ===== الساحات =====
+ARENA = None                                 # مسار ملف ساحة لحالة اللعب (مثل "arenas/pillars.txt")، None = عوائق عشوائية
+ARENA_DIR = "arenas"
+ARENA_CACHE_DIR = "saves/arenas"             # الساحات المحسوبة مسبقاً (npz)
+
+# ===== اللعب الجماعي المحلي =====
+MULTI_SNAKES = 4                             # عدد الثعابين (لاعبون محليون + بوتات)
+MULTI_MIN_SNAKES = 2
+MULTI_MAX_SNAKES = 8
+MULTI_LOCAL_PLAYERS = 1                      # اللاعب 1: الأسهم، اللاعب 2: WASD، والباقي بوتات
+MULTI_START_LENGTH = 3
+MULTI_SPEED = 8                              # خطوات في الثانية
+MULTI_SNAKE_COLORS = [
+    (50, 205, 50),    # أخضر
+    (65, 105, 225),   # أزرق
+    (255, 140, 0),    # برتقالي
+    (186, 85, 211),   # بنفسجي
+    (255, 215, 0),    # ذهبي
+    (0, 206, 209),    # فيروزي
+    (255, 99, 71),    # أحمر فاتح
+    (240, 240, 240),  # أبيض
+]
+
+# ===== اللعب عبر الشبكة =====
+NET_HOST = "127.0.0.1"
+NET_PORT = 8765
+NET_TICK_RATE = 20                           # خطوات في الثانية على الخادم
+NET_MATCH_SIZE = 4                           # لاعبون في كل مباراة
+NET_GRID_WIDTH = 40
+NET_GRID_HEIGHT = 30
+NET_MAX_MESSAGE_SIZE = 65536                 # أكبر رسالة مقبولة (بايت)
+NET_WRITE_BUFFER_LIMIT = 256 * 1024          # عميل بطيء يُفصل إذا تجاوز مخزن الإرسال هذا الحد
+NET_RESTART_DELAY = 1.0                      # ثواني بين نهاية جولة وبداية التالية
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""
+🧪 تهيئة مشتركة للاختبارات: كل اختبار يعمل في مجلد مؤقت مع خدمات مشتركة جديدة
+"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pytest
+
+@pytest.fixture
+def save_dir(tmp_path, monkeypatch):
+    """مجلد عمل مؤقت؛ المسارات النسبية (saves/...) تُكتب فيه، والنسخ المشتركة تُنشأ من جديد"""
+    import high_scores
+    import leaderboard
+    import save_manager
+    from persistence import get_persistence_writer
+
+    monkeypatch.chdir(tmp_path)
+    high_scores._services.clear()
+    save_manager._save_manager = None
+    yield tmp_path
+
+    get_persistence_writer().flush()
+    high_scores._services.clear()
+    save_manager._save_manager = None
+    if leaderboard._leaderboard is not None:
+        leaderboard._leaderboard.close()
+        leaderboard._leaderboard = None
\ No newline at end of file
@@ -6,12 +6,19 @@ import pygame
 import random
 import math
 from config import *
+from pools import get_pool
 
 class Food:
     """فئة الطعام الأساسي"""
-    def __init__(self, grid_width, grid_height):
+    def __init__(self, grid_width, grid_height, rng=None, arena=None):
+        self.reset(grid_width, grid_height, rng, arena)
+    
+    def reset(self, grid_width, grid_height, rng=None, arena=None):
+        """تهيئة كاملة (تُستدعى أيضاً عند إعادة الاستخدام من المجمع)"""
         self.grid_width = grid_width
         self.grid_height = grid_height
+        self.rng = rng or random.Random()
+        self.arena = arena
         self.position = self.generate_position()
         self.color = FOOD_COLOR
         self.size = GRID_SIZE * 0.7
@@ -20,9 +27,11 @@ class Food:
         self.pulse_speed = 3
         
     def generate_position(self):
-        """توليد موقع عشوائي للطعام"""
-        x = random.randint(0, self.grid_width - 1) * GRID_SIZE + GRID_SIZE // 2
-        y = random.randint(0, self.grid_height - 1) * GRID_SIZE + GRID_SIZE // 2
+        """توليد موقع عشوائي للطعام (من خلايا الساحة المحسوبة مسبقاً إن وجدت)"""
+        if self.arena is not None:
+            return self.arena.random_world_position(self.rng)
+        x = self.rng.randint(0, self.grid_width - 1) * GRID_SIZE + GRID_SIZE // 2
+        y = self.rng.randint(0, self.grid_height - 1) * GRID_SIZE + GRID_SIZE // 2
         return [x, y]
     
     def update(self, dt):
@@ -62,8 +71,12 @@ class Food:
 
 class SpecialFood(Food):
     """طعام خاص بقدرات مختلفة"""
-    def __init__(self, grid_width, grid_height, food_type='golden'):
-        super().__init__(grid_width, grid_height)
+    def __init__(self, grid_width, grid_height, food_type='golden', rng=None, arena=None):
+        self.reset(grid_width, grid_height, food_type, rng, arena)
+    
+    def reset(self, grid_width, grid_height, food_type='golden', rng=None, arena=None):
+        """تهيئة كاملة (تُستدعى أيضاً عند إعادة الاستخدام من المجمع)"""
+        super().reset(grid_width, grid_height, rng, arena)
         self.food_type = food_type
         self.color = SPECIAL_FOOD_COLORS.get(food_type, (255, 215, 0))
         self.size = GRID_SIZE * 0.8
@@ -102,13 +115,17 @@ class SpecialFood(Food):
 
 class FoodManager:
     """مدير الطعام"""
-    def __init__(self, grid_width, grid_height):
+    def __init__(self, grid_width, grid_height, rng=None):
         self.grid_width = grid_width
         self.grid_height = grid_height
+        self.rng = rng or random.Random()
+        self.arena = None
         self.foods = []
         self.special_foods = []
         self.spawn_timer = 0
         self.spawn_interval = 5.0  # ثواني بين ظهور الطعام الخاص
+        self.food_pool = get_pool('food', Food, PICKUP_POOL_SIZE)
+        self.special_pool = get_pool('special_food', SpecialFood, PICKUP_POOL_SIZE)
         
     def update(self, dt, snake_positions):
         """تحديث كل الطعام"""
@@ -121,6 +138,7 @@ class FoodManager:
             food.update(dt)
             if food.is_expired():
                 self.special_foods.remove(food)
+                self.special_pool.release(food)
         
         # توليد طعام خاص جديد
         self.spawn_timer += dt
@@ -130,7 +148,7 @@ class FoodManager:
     
     def spawn_food(self, snake_positions):
         """توليد طعام عادي"""
-        food = Food(self.grid_width, self.grid_height)
+        food = self.food_pool.acquire(self.grid_width, self.grid_height, self.rng, self.arena)
         food.respawn(snake_positions)
         self.foods.append(food)
     
@@ -140,8 +158,9 @@ class FoodManager:
         food_types = ['golden', 'speed', 'slow', 'reverse', 'shield', 'magnet']
         weights = [0.3, 0.15, 0.15, 0.1, 0.2, 0.1]  # أوزان الظهور
         
-        food_type = random.choices(food_types, weights=weights, k=1)[0]
-        food = SpecialFood(self.grid_width, self.grid_height, food_type)
+        food_type = self.rng.choices(food_types, weights=weights, k=1)[0]
+        food = self.special_pool.acquire(self.grid_width, self.grid_height, food_type,
+                                         self.rng, self.arena)
         
         # محاولة إيجاد مكان مناسب
         attempts = 0
@@ -177,9 +196,12 @@ class FoodManager:
                 return
             
             attempts += 1
+        
+        # لم يوجد مكان مناسب
+        self.special_pool.release(food)
     
     def check_collisions(self, snake_head_pos):
-        """التحقق من اصطدام الثعبان بالطعام"""
+        """التحقق من اصطدام الثعبان بالطعام (أرجع المأكول بـ release بعد استخدامه)"""
         eaten_foods = []
         eaten_specials = []
         
@@ -206,7 +228,21 @@ class FoodManager:
             positions.append(food.position)
         return positions
     
+    def release(self, food):
+        """إرجاع طعام مأكول لمجمعه"""
+        if isinstance(food, SpecialFood):
+            self.special_pool.release(food)
+        else:
+            self.food_pool.release(food)
+    
+    def reset(self):
+        """بداية جولة جديدة"""
+        self.clear()
+        self.spawn_timer = 0
+    
     def clear(self):
         """مسح كل الطعام"""
+        self.food_pool.release_all(self.foods)
+        self.special_pool.release_all(self.special_foods)
         self.foods.clear()
         self.special_foods.clear()
\ No newline at end of file
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🌐 خادم اللعب الجماعي الموثوق - قواعد MultiSnakeSimulation بخطوة ثابتة على asyncio
+
+العملاء يرسلون الإدخال فقط، والخادم يرسل الحالة الكاملة عند بداية كل جولة ثم الفروقات في كل خطوة.
+
+الاستخدام:
+    python game_server.py --port 8765 --tick-rate 20 --match-size 4
+    python game_server.py --bots          # البوتات تملأ المقاعد الفارغة
+"""
+
+import argparse
+import asyncio
+import itertools
+import sys
+import time
+from collections import deque
+import numpy as np
+from config import *
+from multi_simulation import MultiSnakeSimulation, plan_bot_direction
+from net_protocol import (DeltaEncoder, ProtocolError, encode_message, parse_direction,
+                          read_message)
+
+# عدد الخطوات المحفوظة لحساب إحصائيات زمن الخطوة
+TICK_HISTORY = 400
+
+class PlayerConnection:
+    """اتصال لاعب واحد: مقعده في المباراة وطابور انعطافاته"""
+    def __init__(self, server, reader, writer):
+        from input_queue import TurnQueue
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.match = None
+        self.snake_id = None
+        self.turn_queue = TurnQueue()
+        self.closed = False
+
+    def send(self, frame):
+        """إرسال رسالة مؤطرة؛ العميل الذي لا يقرأ يُفصل بدل أن تتراكم الذاكرة"""
+        if self.closed:
+            return
+        if self.writer.transport.get_write_buffer_size() > NET_WRITE_BUFFER_LIMIT:
+            self.server.slow_clients += 1
+            self.close()
+            return
+        self.writer.write(frame)
+        self.server.bytes_sent += len(frame)
+        self.server.messages_sent += 1
+
+    def close(self):
+        """إغلاق الاتصال (مرة واحدة)"""
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+class Match:
+    """مباراة واحدة: محاكاة ومقاعد اللاعبين ومشفر الفروقات"""
+    def __init__(self, match_id, size=NET_MATCH_SIZE, use_bots=False, tick_rate=NET_TICK_RATE, seed=None):
+        self.match_id = match_id
+        self.size = size
+        self.tick_rate = tick_rate
+        self.use_bots = use_bots
+        self.sim = MultiSnakeSimulation(NET_GRID_WIDTH, NET_GRID_HEIGHT, size, seed)
+        self.encoder = DeltaEncoder(self.sim)
+        self.players = {}
+        self.bots = {}
+        self.started = False
+        self.restart_at = None
+        self.rounds = 0
+
+    def has_free_seat(self):
+        return len(self.players) < self.size
+
+    def add_player(self, player):
+        """إجلاس لاعب في أول مقعد فارغ؛ المباراة تبدأ عند الامتلاء (أو فوراً مع البوتات)"""
+        snake_id = next(snake_id for snake_id in range(1, self.size + 1)
+                        if snake_id not in self.players)
+        self.players[snake_id] = player
+        self.bots.pop(snake_id, None)
+        player.match = self
+        player.snake_id = snake_id
+
+        if self.started:
+            # انضمام لجولة جارية: الحالة الكاملة لهذا اللاعب وحده
+            player.send(encode_message(self.get_start_message(snake_id)))
+        elif self.use_bots or not self.has_free_seat():
+            self.start_round()
+        return snake_id
+
+    def remove_player(self, player):
+        """تحرير المقعد؛ مع البوتات يتولى بوت ثعبانه فوراً، وإلا يكمل بلا إدخال"""
+        from autopilot import Autopilot
+        if self.players.get(player.snake_id) is player:
+            del self.players[player.snake_id]
+            if self.use_bots and self.started:
+                self.bots[player.snake_id] = Autopilot(self.sim.grid_width, self.sim.grid_height)
+        player.match = None
+
+    def get_start_message(self, snake_id):
+        """الحالة الكاملة مع رقم ثعبان المستقبل"""
+        return {
+            'type': 'start',
+            'match': self.match_id,
+            'snake_id': snake_id,
+            'tick_rate': self.tick_rate,
+            'state': self.sim.get_state(),
+        }
+
+    def start_round(self):
+        """جولة جديدة: الحالة الكاملة لكل لاعب ثم الفروقات"""
+        from autopilot import Autopilot
+        self.sim.reset()
+        self.encoder.reset()
+        for player in self.players.values():
+            player.turn_queue.clear()
+        if self.use_bots:
+            for snake_id in range(1, self.size + 1):
+                if snake_id not in self.players and snake_id not in self.bots:
+                    self.bots[snake_id] = Autopilot(self.sim.grid_width, self.sim.grid_height)
+        self.started = True
+        self.restart_at = None
+        self.rounds += 1
+        for snake_id, player in self.players.items():
+            player.send(encode_message(self.get_start_message(snake_id)))
+
+    def tick(self, now):
+        """خطوة واحدة وإرسال الفرق لكل اللاعبين"""
+        if not self.started:
+            return
+        sim = self.sim
+        if sim.game_over:
+            if now >= self.restart_at:
+                self.start_round()
+            return
+
+        directions = {}
+        for snake_id, player in self.players.items():
+            turn = player.turn_queue.pop()
+            if turn:
+                directions[snake_id] = turn[0]
+        for snake_id, bot in self.bots.items():
+            snake = sim.get_snake(snake_id)
+            if snake.alive:
+                directions[snake_id] = plan_bot_direction(sim, snake, bot)
+
+        events = sim.step(directions)
+
+        # نفس البايتات لكل لاعبي المباراة (تشفير مرة واحدة)
+        frame = encode_message(self.encoder.encode(events))
+        for player in list(self.players.values()):
+            player.send(frame)
+
+        if sim.game_over:
+            self.restart_at = now + NET_RESTART_DELAY
+
+class GameServer:
+    """خادم TCP: اتصالات اللاعبين، توزيعهم على المباريات، وحلقة الخطوات الثابتة"""
+    def __init__(self, tick_rate=NET_TICK_RATE, match_size=NET_MATCH_SIZE, use_bots=False):
+        self.tick_rate = tick_rate
+        self.match_size = match_size
+        self.use_bots = use_bots
+        self.matches = {}
+        self.match_ids = itertools.count(1)
+        self.connections = set()
+        self.server = None
+        self.tick_task = None
+
+        # الإحصائيات
+        self.tick_times = deque(maxlen=TICK_HISTORY)
+        self.ticks = 0
+        self.late_ticks = 0
+        self.skipped_ticks = 0
+        self.bytes_sent = 0
+        self.messages_sent = 0
+        self.slow_clients = 0
+        self.started_at = time.perf_counter()
+
+    def find_match(self):
+        """أول مباراة فيها مقعد فارغ، أو مباراة جديدة"""
+        for match in self.matches.values():
+            if match.has_free_seat():
+                return match
+        match = Match(next(self.match_ids), self.match_size, self.use_bots, self.tick_rate)
+        self.matches[match.match_id] = match
+        return match
+
+    async def handle_client(self, reader, writer):
+        """دورة حياة اتصال: join ثم رسائل الإدخال حتى الإغلاق"""
+        player = PlayerConnection(self, reader, writer)
+        self.connections.add(player)
+        loop = asyncio.get_running_loop()
+        try:
+            while not player.closed:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                message_type = message['type']
+
+                if message_type == 'join' and player.match is None:
+                    self.find_match().add_player(player)
+                elif message_type == 'input' and player.match is not None:
+                    direction = parse_direction(message.get('dir'))
+                    snake = player.match.sim.get_snake(player.snake_id)
+                    if direction and snake.alive:
+                        player.turn_queue.push(direction, snake.direction, loop.time() * 1000)
+                elif message_type == 'stats':
+                    player.send(encode_message({'type': 'stats', 'stats': self.get_stats()}))
+                elif message_type == 'leave':
+                    break
+        except ProtocolError as e:
+            print(f"Error reading client message: {e}")
+        except ConnectionError:
+            pass
+        finally:
+            match = player.match
+            if match is not None:
+                match.remove_player(player)
+                if not match.players:
+                    del self.matches[match.match_id]
+            self.connections.discard(player)
+            player.close()
+
+    async def tick_loop(self):
+        """الخطوات بمعدل ثابت؛ الموعد التالي يُحسب من الموعد السابق حتى لا يتراكم الانحراف"""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            next_tick += interval
+            start = time.perf_counter()
+            now = loop.time()
+            for match in list(self.matches.values()):
+                match.tick(now)
+            self.tick_times.append(time.perf_counter() - start)
+            self.ticks += 1
+
+            delay = next_tick - loop.time()
+            if delay < 0:
+                self.late_ticks += 1
+                if delay < -interval:
+                    # متأخرون أكثر من خطوة: لا نحاول اللحاق بخطوات متتالية
+                    missed = int(-delay / interval)
+                    self.skipped_ticks += missed
+                    next_tick += missed * interval
+            await asyncio.sleep(max(0.0, delay))
+
+    def get_stats(self):
+        """إحصائيات الخادم الحالية"""
+        tick_ms = np.array(self.tick_times) * 1000.0 if self.tick_times else np.zeros(1)
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            'uptime': round(elapsed, 2),
+            'connections': len(self.connections),
+            'matches': len(self.matches),
+            'running_matches': sum(1 for match in self.matches.values() if match.started),
+            'tick_rate': self.tick_rate,
+            'ticks': self.ticks,
+            'tick_mean_ms': round(float(tick_ms.mean()), 3),
+            'tick_p95_ms': round(float(np.percentile(tick_ms, 95)), 3),
+            'tick_max_ms': round(float(tick_ms.max()), 3),
+            'late_ticks': self.late_ticks,
+            'skipped_ticks': self.skipped_ticks,
+            'bytes_sent': self.bytes_sent,
+            'messages_sent': self.messages_sent,
+            'slow_clients': self.slow_clients,
+        }
+
+    async def start(self, host=NET_HOST, port=NET_PORT):
+        """فتح المنفذ (port=0 لمنفذ حر) وبدء حلقة الخطوات"""
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        self.tick_task = asyncio.create_task(self.tick_loop())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """إيقاف الخطوات وإغلاق كل الاتصالات"""
+        self.tick_task.cancel()
+        self.server.close()
+        for player in list(self.connections):
+            player.close()
+        await self.server.wait_closed()
+
+async def run_server(host, port, tick_rate, match_size, use_bots, stats_interval):
+    """تشغيل الخادم حتى الإيقاف مع طباعة الإحصائيات دورياً"""
+    server = GameServer(tick_rate, match_size, use_bots)
+    port = await server.start(host, port)
+    print(f"🌐 Serving on {host}:{port} at {tick_rate} Hz, {match_size} players per match", flush=True)
+    try:
+        previous = server.get_stats()
+        while True:
+            await asyncio.sleep(stats_interval)
+            stats = server.get_stats()
+            ticks = stats['ticks'] - previous['ticks']
+            late = stats['late_ticks'] - previous['late_ticks']
+            sent = stats['bytes_sent'] - previous['bytes_sent']
+            print(f"📊 {stats['connections']} clients, {stats['running_matches']}/{stats['matches']} matches | "
+                  f"tick {stats['tick_mean_ms']:.2f} ms (p95 {stats['tick_p95_ms']:.2f}) | "
+                  f"late {late}/{ticks} | {sent / stats_interval / 1024:.1f} KiB/s", flush=True)
+            previous = stats
+    finally:
+        await server.stop()
+
+def main(argv=None):
+    """واجهة سطر الأوامر"""
+    parser = argparse.ArgumentParser(description="Authoritative multiplayer tick server")
+    parser.add_argument('--host', default=NET_HOST)
+    parser.add_argument('--port', type=int, default=NET_PORT)
+    parser.add_argument('--tick-rate', type=int, default=NET_TICK_RATE)
+    parser.add_argument('--match-size', type=int, default=NET_MATCH_SIZE)
+    parser.add_argument('--bots', action='store_true', help="fill empty seats with autopilot bots")
+    parser.add_argument('--stats-interval', type=float, default=5.0)
+    args = parser.parse_args(argv)
+    if not MULTI_MIN_SNAKES <= args.match_size <= MULTI_MAX_SNAKES:
+        parser.error(f"--match-size must be between {MULTI_MIN_SNAKES} and {MULTI_MAX_SNAKES}")
+
+    try:
+        asyncio.run(run_server(args.host, args.port, args.tick_rate, args.match_size,
+                               args.bots, args.stats_interval))
+    except KeyboardInterrupt:
+        print("👋 Server stopped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
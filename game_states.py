@@ -3,9 +3,24 @@
 """
 
 import math
+import os
 import random
 import pygame
 from config import *
+from input_queue import event_timestamp
+from persistence import get_persistence_writer
+
+# مفاتيح الاتجاهات (الأسهم و WASD)
+KEY_DIRECTIONS = {
+    pygame.K_UP: (0, -1),
+    pygame.K_DOWN: (0, 1),
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0),
+    pygame.K_w: (0, -1),
+    pygame.K_s: (0, 1),
+    pygame.K_a: (-1, 0),
+    pygame.K_d: (1, 0),
+}
 
 class GameState:
     """حالة اللعبة الأساسية"""
@@ -36,53 +51,32 @@ class MainMenuState(GameState):
         self.screen_height = screen_height
         from ui import Menu
         self.menu = Menu(screen_width, screen_height)
-        self.background_phase = 0
+        self.mouse_clicked = False
         
     def handle_events(self, events):
         """معالجة أحداث القائمة"""
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_clicked = False
-        keys = pygame.key.get_pressed()
-        
+        self.mouse_clicked = False
         for event in events:
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_clicked = True
-        
-        self.menu.update(mouse_pos, mouse_clicked, keys)
-        
-        # التحقق من تغيير الحالة
-        result = self.menu.update(mouse_pos, mouse_clicked, keys)
-        if result == "start_game":
-            self.next_state = "playing"
-        elif result == "exit":
-            self.next_state = "quit"
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.mouse_clicked = True
     
     def update(self, dt):
-        """تحديث القائمة"""
-        self.background_phase += dt * 0.5
+        """تحديث القائمة والتحقق من تغيير الحالة"""
+        result = self.menu.update(pygame.mouse.get_pos(), self.mouse_clicked,
+                                  pygame.key.get_pressed(), dt)
+        if result in ("playing", "classic", "multiplayer"):
+            self.next_state = result
+        elif result == "exit":
+            self.next_state = "quit"
     
     def draw(self, screen):
-        """رسم القائمة"""
-        # خلفية متحركة
+        """رسم القائمة (الخلفية المتحركة يرسمها Menu نفسه)"""
         screen.fill(BACKGROUND_COLOR)
-        
-        # رسم نمط خلفي
-        for i in range(0, self.screen_width, 50):
-            for j in range(0, self.screen_height, 50):
-                x = i + math.sin(self.background_phase + i * 0.01) * 10
-                y = j + math.cos(self.background_phase + j * 0.01) * 10
-                
-                color_val = 30 + abs(math.sin(self.background_phase + i * 0.02 + j * 0.01)) * 20
-                color = (color_val, color_val + 10, color_val + 20)
-                
-                pygame.draw.rect(screen, color, (x, y, 45, 45), border_radius=8)
-        
-        # التعديل هنا: تمرير screen فقط بدون graphics
         self.menu.draw(screen)
 
 class PlayingState(GameState):
     """حالة اللعب"""
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, seed=None):
         super().__init__()
         from snake import Snake
         from food import FoodManager
@@ -92,22 +86,88 @@ class PlayingState(GameState):
         from particles import ParticleSystem
         from obstacles import ObstacleManager
         from powerups import PowerUpManager
-        from audio import AudioManager
+        from audio import get_audio_manager
+        from random_streams import RandomStreams
+        from profiler import get_frame_profiler
+        
+        # مولدات عشوائية مستقلة لكل نظام (نفس البذرة = نفس الجولة)
+        self.streams = RandomStreams(seed)
         
         # تهيئة المكونات
-        self.grid = Grid(screen_width, screen_height)
+        self.grid = Grid(screen_width, screen_height, self.streams.grid)
         self.camera = Camera(screen_width, screen_height)
         self.graphics = Graphics(pygame.Surface((1, 1)))  # سطح مؤقت
         self.graphics.set_camera(self.camera)
         
         # إدارة الكيانات
         self.snake = Snake(GRID_SIZE * 5, GRID_SIZE * 5)
-        self.food_manager = FoodManager(GRID_WIDTH, GRID_HEIGHT)
-        self.obstacle_manager = ObstacleManager(GRID_WIDTH, GRID_HEIGHT)
-        self.powerup_manager = PowerUpManager(GRID_WIDTH, GRID_HEIGHT)
+        self.food_manager = FoodManager(GRID_WIDTH, GRID_HEIGHT, self.streams.food)
+        self.obstacle_manager = ObstacleManager(GRID_WIDTH, GRID_HEIGHT, self.streams.obstacles)
+        self.powerup_manager = PowerUpManager(GRID_WIDTH, GRID_HEIGHT, self.streams.powerups)
         self.score_manager = ScoreManager()
-        self.particle_system = ParticleSystem()
-        self.audio = AudioManager()
+        self.particle_system = ParticleSystem(self.streams.particles)
+        self.audio = get_audio_manager()
+        self.profiler = get_frame_profiler()
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.pause_menu = None
+        self.shake_surface = None
+        
+        # ساحة من ملف (اختيارية): عوائق ثابتة وأماكن طعام محسوبة مسبقاً
+        self.arena = self.load_arena(ARENA)
+        if self.arena is not None:
+            self.grid.load_arena(self.arena)
+            self.obstacle_manager.load_arena(self.arena)
+            self.food_manager.arena = self.arena
+            self.powerup_manager.arena = self.arena
+            self.snake.reset(*self.get_spawn_position(), self.get_spawn_direction())
+        
+        self.start_round()
+    
+    def load_arena(self, path):
+        """تحميل الساحة المحددة في الإعدادات (None إذا لم تحدد أو لم تناسب الشبكة)"""
+        if not path:
+            return None
+        from arenas import load_arena
+        try:
+            arena = load_arena(path)
+        except (OSError, ValueError) as e:
+            print(f"Error loading arena: {e}")
+            return None
+        if (arena.width, arena.height) != (GRID_WIDTH, GRID_HEIGHT):
+            print(f"Error loading arena: {arena.name} is {arena.width}x{arena.height}, "
+                  f"expected {GRID_WIDTH}x{GRID_HEIGHT}")
+            return None
+        return arena
+    
+    def get_spawn_position(self):
+        """نقطة بداية الثعبان بإحداثيات العالم"""
+        if self.arena is not None:
+            return self.arena.get_spawn_world_position()
+        return GRID_SIZE * 5, GRID_SIZE * 5
+    
+    def get_spawn_direction(self):
+        """اتجاه البداية"""
+        return self.arena.direction if self.arena is not None else (1, 0)
+    
+    def reset(self, seed=None):
+        """جولة جديدة بنفس الكائنات: لا استيراد ولا تحميل خطوط أو نسيج أو أصوات"""
+        self.streams.reseed(seed)
+        self.grid.reset()
+        self.camera.reset()
+        self.snake.reset(*self.get_spawn_position(), self.get_spawn_direction())
+        self.food_manager.reset()
+        self.obstacle_manager.reset()
+        self.powerup_manager.reset()
+        self.particle_system.clear()
+        self.score_manager.start_game()
+        self.score_manager.load_high_score()
+        self.next_state = None
+        self.start_round()
+    
+    def start_round(self):
+        """ما تحتاجه كل جولة بعد تجهيز المكونات"""
+        self.audio.play_music('game')
         
         # توليد الطعام الأولي
         self.food_manager.spawn_food(self.snake.get_body_positions())
@@ -116,10 +176,20 @@ class PlayingState(GameState):
         # الحالة
         self.paused = False
         self.game_over = False
-        self.screen_width = screen_width
-        self.screen_height = screen_height
         self.shake_intensity = 0
     
+    def get_pause_menu(self):
+        """قائمة الإيقاف (تُنشأ عند أول إيقاف فقط)"""
+        if self.pause_menu is None:
+            from ui import PauseMenu
+            self.pause_menu = PauseMenu(self.screen_width, self.screen_height)
+        return self.pause_menu
+    
+    def save_game(self, slot=0):
+        """حفظ الجولة الحالية في خانة حفظ (الكتابة في خيط الخلفية)"""
+        from save_manager import get_save_manager
+        return get_save_manager().save_game(self.get_save_data(), slot)
+    
     def handle_events(self, events):
         """معالجة أحداث اللعب"""
         if self.game_over:
@@ -132,8 +202,7 @@ class PlayingState(GameState):
             return
         
         if self.paused:
-            from ui import PauseMenu
-            pause_menu = PauseMenu(self.screen_width, self.screen_height)
+            pause_menu = self.get_pause_menu()
             
             mouse_pos = pygame.mouse.get_pos()
             mouse_clicked = False
@@ -145,11 +214,16 @@ class PlayingState(GameState):
                     if event.key == pygame.K_ESCAPE:
                         self.paused = False
             
-            pause_menu.update(mouse_pos, mouse_clicked)
             result = pause_menu.update(mouse_pos, mouse_clicked)
             
             if result == "resume":
                 self.paused = False
+            elif result == "save":
+                self.save_game()
+                self.paused = False
+            elif result == "load":
+                if self.load_game():
+                    self.paused = False
             elif result == "restart":
                 self.next_state = "restart"
             elif result == "main_menu":
@@ -161,50 +235,49 @@ class PlayingState(GameState):
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.paused = True
-                elif event.key == pygame.K_UP:
-                    self.snake.change_direction((0, -1))
-                elif event.key == pygame.K_DOWN:
-                    self.snake.change_direction((0, 1))
-                elif event.key == pygame.K_LEFT:
-                    self.snake.change_direction((-1, 0))
-                elif event.key == pygame.K_RIGHT:
-                    self.snake.change_direction((1, 0))
-                elif event.key == pygame.K_w:
-                    self.snake.change_direction((0, -1))
-                elif event.key == pygame.K_s:
-                    self.snake.change_direction((0, 1))
-                elif event.key == pygame.K_a:
-                    self.snake.change_direction((-1, 0))
-                elif event.key == pygame.K_d:
-                    self.snake.change_direction((1, 0))
+                elif event.key in KEY_DIRECTIONS:
+                    self.snake.change_direction(KEY_DIRECTIONS[event.key], event_timestamp(event))
     
     def update(self, dt):
         """تحديث حالة اللعب"""
         if self.paused or self.game_over:
             return
         
+        profiler = self.profiler
+        profiler.lap('input')
+        
         # تحديث الثعبان
         self.snake.update(dt, self.food_manager.get_all_food_positions())
+        profiler.lap('snake')
         
         # تحديث الطعام
         self.food_manager.update(dt, self.snake.get_body_positions())
+        profiler.lap('food')
         
         # تحديث العوائق
         self.obstacle_manager.update(dt)
+        profiler.lap('obstacles')
         
         # تحديث المكافآت
         self.powerup_manager.update(dt, self.snake.get_body_positions())
+        profiler.lap('powerups')
         
         # تحديث النقاط
         self.score_manager.update(dt)
         
+        # ربط إيقاع الموسيقى بسرعة الثعبان
+        self.audio.set_music_tempo(self.snake.speed)
+        profiler.lap('score')
+        
         # تحديث الجسيمات
         self.particle_system.update(dt)
+        profiler.lap('particles')
         
         # تحديث الكاميرا لمتابعة الثعبان
         snake_head = self.snake.get_head_position()
         self.camera.follow(snake_head[0], snake_head[1])
         self.camera.update(dt)
+        profiler.lap('camera')
         
         # التحقق من اصطدام الطعام
         eaten_foods, eaten_specials = self.food_manager.check_collisions(snake_head)
@@ -241,6 +314,12 @@ class PlayingState(GameState):
             self.particle_system.create_food_particles(food.position[0], food.position[1], food.food_type)
             self.audio.play_special_eat(food.food_type)
         
+        # إرجاع المأكول للمجمعات
+        for food in eaten_foods:
+            self.food_manager.release(food)
+        for food in eaten_specials:
+            self.food_manager.release(food)
+        
         # التحقق من اصطدام المكافآت
         collected_powerups = self.powerup_manager.check_collisions(snake_head)
         
@@ -249,11 +328,10 @@ class PlayingState(GameState):
             
             # تطبيق التأثير
             if powerup.powerup_type == 'teleport':
-                # الانتقال العشوائي
-                new_x = random.randint(2, GRID_WIDTH - 3) * GRID_SIZE + GRID_SIZE // 2
-                new_y = random.randint(2, GRID_HEIGHT - 3) * GRID_SIZE + GRID_SIZE // 2
-                self.snake.head.x = new_x
-                self.snake.head.y = new_y
+                # الانتقال لخلية حرة عشوائية
+                position = self.get_teleport_position()
+                if position is not None:
+                    self.snake.head.x, self.snake.head.y = position
             elif powerup.powerup_type == 'bomb':
                 # تدمير العوائق القريبة
                 bomb_radius = GRID_SIZE * 3
@@ -270,6 +348,7 @@ class PlayingState(GameState):
             # تأثيرات
             self.audio.play_powerup(powerup.powerup_type)
             self.particle_system.create_explosion(powerup.x, powerup.y, powerup.color)
+            self.powerup_manager.release(powerup)
         
         # التحقق من الاصطدام بالعوائق
         if not self.snake.powerups['invincible']:
@@ -293,6 +372,34 @@ class PlayingState(GameState):
         # تحديث اهتزاز الشاشة
         if self.shake_intensity > 0:
             self.shake_intensity -= dt * 10
+        profiler.lap('collisions')
+    
+    def get_teleport_position(self):
+        """هدف الانتقال: خلية حرة عشوائية (لا عائق ولا مسار عائق متحرك ولا جسم الثعبان)"""
+        rng = self.streams.powerups
+        body = self.snake.get_body_positions()
+        
+        # خلايا الساحة المحسوبة مسبقاً حرة وفي مكون البداية
+        if self.arena is not None:
+            return self.arena.random_world_position(rng, body)
+        
+        blocked = set()
+        for obstacle in self.obstacle_manager.obstacles:
+            blocked.add((int(obstacle.x // GRID_SIZE), int(obstacle.y // GRID_SIZE)))
+        for obstacle in self.obstacle_manager.moving_obstacles:
+            (start_x, start_y), (end_x, end_y) = obstacle.start_pos, obstacle.end_pos
+            for x in range(int(min(start_x, end_x) // GRID_SIZE), int(max(start_x, end_x) // GRID_SIZE) + 1):
+                for y in range(int(min(start_y, end_y) // GRID_SIZE), int(max(start_y, end_y) // GRID_SIZE) + 1):
+                    blocked.add((x, y))
+        for x, y in body:
+            blocked.add((int(x // GRID_SIZE), int(y // GRID_SIZE)))
+        
+        free_cells = [(x, y) for x in range(2, GRID_WIDTH - 2) for y in range(2, GRID_HEIGHT - 2)
+                      if (x, y) not in blocked]
+        if not free_cells:
+            return None
+        x, y = rng.choice(free_cells)
+        return x * GRID_SIZE + GRID_SIZE // 2, y * GRID_SIZE + GRID_SIZE // 2
     
     def handle_collision(self, collision_type):
         """معالجة الاصطدام"""
@@ -311,6 +418,7 @@ class PlayingState(GameState):
         # نهاية اللعبة
         self.game_over = True
         self.snake.die()
+        self.audio.stop_music()
         self.audio.play_game_over()
         self.particle_system.create_explosion(
             self.snake.head.x, 
@@ -320,26 +428,190 @@ class PlayingState(GameState):
         
         # حفظ النقاط
         self.score_manager.save_high_score()
+        
+        # سطر الجولة في سجل الإحصائيات (بعد لوحة المتصدرين حتى لا يستوردها مرتين)
+        from save_manager import get_save_manager
+        stats = self.score_manager.get_game_stats()
+        stats['player_name'] = 'Player'
+        get_save_manager().save_game_stats(stats)
+    
+    def get_save_data(self):
+        """تجميع حالة اللعب كمصفوفات رقمية مضغوطة لملف الحفظ"""
+        import numpy as np
+        
+        def pack(rows, columns):
+            # الحركة سلسة فالمواقع قد تكون عشرية؛ تُضغط كأعداد صحيحة فقط إذا كانت كلها صحيحة
+            array = np.array(rows, dtype=float).reshape(-1, columns)
+            if np.array_equal(array, np.round(array)):
+                return array.astype(np.int32)
+            return array
+        
+        specials = self.food_manager.special_foods
+        powerups = self.powerup_manager.powerups
+        obstacles = self.obstacle_manager.obstacles
+        moving = self.obstacle_manager.moving_obstacles
+        timers = list(self.snake.powerup_timers.items())
+        
+        return {
+            'score': self.score_manager.score,
+            'level': self.score_manager.level,
+            'combo': self.score_manager.combo,
+            'max_combo': self.score_manager.max_combo,
+            'foods_eaten': self.score_manager.foods_eaten,
+            'special_eaten': self.score_manager.special_foods_eaten,
+            'play_time': self.score_manager.play_time,
+            'multiplier': self.score_manager.multiplier,
+            'snake_speed': self.snake.speed,
+            'snake_direction': [float(value) for value in self.snake.direction],
+            'next_direction': list(self.snake.next_direction),
+            'growth_pending': self.snake.growth_pending,
+            'move_timer': self.snake.move_timer,
+            'snake_body': pack(self.snake.get_body_positions(), 2),
+            'foods': pack([food.position for food in self.food_manager.foods], 2),
+            'special_foods': pack([food.position for food in specials], 2),
+            'special_times': np.array([food.time_alive for food in specials], dtype=float),
+            'special_food_types': [food.food_type for food in specials],
+            'food_spawn_timer': self.food_manager.spawn_timer,
+            'powerups': pack([(p.x, p.y) for p in powerups], 2),
+            'powerup_times': np.array([p.time_alive for p in powerups], dtype=float),
+            'powerup_types': [p.powerup_type for p in powerups],
+            'powerup_timer': self.powerup_manager.spawn_timer,
+            'active_effects': {name: dict(active) for name, active
+                               in self.powerup_manager.active_effects.items()},
+            'obstacles': pack([(o.x, o.y) for o in obstacles], 2),
+            'obstacle_types': [o.obstacle_type for o in obstacles],
+            # العائق المتحرك يحتاج مساره وتقدمه واتجاهه، لا موقعه فقط
+            'moving_obstacles': np.array([(*o.start_pos, *o.end_pos, o.speed, o.progress, o.direction)
+                                          for o in moving], dtype=float).reshape(-1, 7),
+            'timer_names': [name for name, _ in timers],
+            'timers': np.array([value for _, value in timers], dtype=float),
+            'seed': self.streams.seed,
+            'rng_state': self.streams.get_state(),
+        }
+    
+    def load_save_data(self, game_data):
+        """استعادة جولة من بيانات get_save_data (أو load_game في مدير الحفظ)"""
+        from obstacles import Obstacle, MovingObstacle
+        
+        def rows(key):
+            # المقاطع المحملة مصفوفات للقراءة فقط؛ القوائم الفارغة تعود من البيانات الوصفية
+            value = game_data.get(key, [])
+            return value.tolist() if hasattr(value, 'tolist') else list(value)
+        
+        # النقاط
+        score = self.score_manager
+        score.start_game()
+        score.score = game_data['score']
+        score.level = game_data['level']
+        score.combo = game_data['combo']
+        score.max_combo = game_data.get('max_combo', score.combo)
+        score.foods_eaten = game_data['foods_eaten']
+        score.special_foods_eaten = game_data.get('special_eaten', 0)
+        score.play_time = game_data['play_time']
+        score.multiplier = game_data.get('multiplier', 1.0)
+        
+        # الثعبان: الرأس ثم الجسم من نفس المجمع
+        body = rows('snake_body')
+        direction = tuple(rows('snake_direction'))
+        self.snake.reset(*body[0], direction)
+        self.snake.growth_pending = 0
+        for x, y in body[1:]:
+            self.snake.add_segment(x, y)
+        self.snake.growth_pending = game_data.get('growth_pending', 0)
+        self.snake.next_direction = tuple(rows('next_direction')) or direction
+        self.snake.head.next_direction = self.snake.next_direction
+        self.snake.speed = game_data['snake_speed']
+        self.snake.move_timer = game_data.get('move_timer', 0)
+        for name, value in zip(game_data['timer_names'], rows('timers')):
+            self.snake.powerups[name] = True
+            self.snake.powerup_timers[name] = value
+        if self.snake.powerups['invincible']:
+            self.snake.head.color = (255, 255, 255)
+        
+        # الطعام
+        food_manager = self.food_manager
+        food_manager.reset()
+        for position in rows('foods'):
+            food = food_manager.food_pool.acquire(GRID_WIDTH, GRID_HEIGHT, food_manager.rng, self.arena)
+            food.position = list(position)
+            food_manager.foods.append(food)
+        for position, food_type, time_alive in zip(rows('special_foods'), game_data['special_food_types'],
+                                                  rows('special_times')):
+            food = food_manager.special_pool.acquire(GRID_WIDTH, GRID_HEIGHT, food_type,
+                                                     food_manager.rng, self.arena)
+            food.position = list(position)
+            food.time_alive = time_alive
+            food_manager.special_foods.append(food)
+        food_manager.spawn_timer = game_data.get('food_spawn_timer', 0)
+        
+        # المكافآت
+        powerup_manager = self.powerup_manager
+        powerup_manager.reset()
+        for (x, y), powerup_type, time_alive in zip(rows('powerups'), game_data['powerup_types'],
+                                                  rows('powerup_times')):
+            powerup = powerup_manager.pool.acquire(x, y, powerup_type, powerup_manager.rng)
+            powerup.time_alive = time_alive
+            powerup_manager.powerups.append(powerup)
+        powerup_manager.spawn_timer = game_data.get('powerup_timer', 0)
+        powerup_manager.active_effects.update(game_data.get('active_effects', {}))
+        
+        # العوائق (عدد جدران الحدود لا يتغير)
+        obstacle_manager = self.obstacle_manager
+        obstacle_manager.obstacles = [Obstacle(x, y, obstacle_type) for (x, y), obstacle_type
+                                      in zip(rows('obstacles'), game_data['obstacle_types'])]
+        obstacle_manager.moving_obstacles = []
+        for start_x, start_y, end_x, end_y, speed, progress, direction in rows('moving_obstacles'):
+            obstacle = MovingObstacle(start_x, start_y, end_x, end_y, speed)
+            obstacle.progress = progress
+            obstacle.direction = int(direction)
+            obstacle.x = start_x + (end_x - start_x) * progress
+            obstacle.y = start_y + (end_y - start_y) * progress
+            obstacle_manager.moving_obstacles.append(obstacle)
+        
+        # المولدات أخيراً: إعادة بناء الكائنات أعلاه تستهلك منها
+        self.streams.reseed(game_data.get('seed'))
+        if 'rng_state' in game_data:
+            self.streams.set_state(game_data['rng_state'])
+        
+        self.particle_system.clear()
+        self.camera.reset()
+        self.audio.play_music('game')
+        self.next_state = None
+        self.paused = False
+        self.game_over = False
+        self.shake_intensity = 0
+    
+    def load_game(self, slot=0):
+        """تحميل خانة حفظ في الجولة الحالية (False إذا كانت فارغة أو تالفة)"""
+        from save_manager import get_save_manager
+        game_data = get_save_manager().load_game(slot)
+        if game_data is None:
+            return False
+        try:
+            self.load_save_data(game_data)
+            return True
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            print(f"Error restoring game: {e}")
+            return False
     
     def draw(self, screen):
         """رسم حالة اللعب"""
-        # استخدام سطح مؤقت للاهتزاز
+        # سطح الاهتزاز يُنشأ عند أول اهتزاز ثم يُعاد استخدامه
         if self.shake_intensity > 0:
-            temp_surface = pygame.Surface((self.screen_width, self.screen_height))
-            self.draw_game(temp_surface)
+            if self.shake_surface is None:
+                self.shake_surface = pygame.Surface((self.screen_width, self.screen_height))
+            self.draw_game(self.shake_surface)
             
             # تطبيق الاهتزاز
-            shake_x = random.uniform(-self.shake_intensity, self.shake_intensity)
-            shake_y = random.uniform(-self.shake_intensity, self.shake_intensity)
-            screen.blit(temp_surface, (shake_x, shake_y))
+            shake_x = self.streams.effects.uniform(-self.shake_intensity, self.shake_intensity)
+            shake_y = self.streams.effects.uniform(-self.shake_intensity, self.shake_intensity)
+            screen.blit(self.shake_surface, (shake_x, shake_y))
         else:
             self.draw_game(screen)
         
         # رسم واجهة الإيقاف المؤقت
         if self.paused:
-            from ui import PauseMenu
-            pause_menu = PauseMenu(self.screen_width, self.screen_height)
-            pause_menu.draw(screen, self.graphics)
+            self.get_pause_menu().draw(screen, self.graphics)
         
         # رسم واجهة نهاية اللعبة
         if self.game_over:
@@ -347,34 +619,44 @@ class PlayingState(GameState):
                 self.score_manager.score,
                 self.score_manager.high_score,
                 self.screen_width,
-                self.screen_height
+                self.screen_height,
+                self.score_manager.leaderboard_rank
             )
+        self.profiler.lap('draw_overlay')
     
     def draw_game(self, screen):
         """رسم عناصر اللعبة"""
         # تعيين السطح للرسومات
         self.graphics.screen = screen
         
+        profiler = self.profiler
+        
         # مسح الشاشة
         self.graphics.clear_screen()
         
         # رسم الشبكة
         self.graphics.draw_grid()
+        profiler.lap('draw_background')
         
         # رسم العوائق
         self.obstacle_manager.draw(screen, self.camera)
+        profiler.lap('draw_obstacles')
         
         # رسم الطعام
-        self.food_manager.draw(screen, self.camera)
+        self.graphics.draw_food(self.food_manager)
+        profiler.lap('draw_food')
         
         # رسم المكافآت
         self.powerup_manager.draw(screen, self.camera)
+        profiler.lap('draw_powerups')
         
         # رسم الثعبان
         self.graphics.draw_snake(self.snake)
+        profiler.lap('draw_snake')
         
         # رسم الجسيمات
         self.particle_system.draw(screen)
+        profiler.lap('draw_particles')
         
         # رسم النقاط والمعلومات
         self.graphics.draw_score(
@@ -386,11 +668,13 @@ class PlayingState(GameState):
         
         # رسم مؤشرات القدرات
         self.graphics.draw_powerup_indicators(self.snake, self.screen_width, self.screen_height)
+        profiler.lap('draw_hud')
 
 class GameOverState(GameState):
     """حالة نهاية اللعبة"""
-    def __init__(self, score, high_score, screen_width, screen_height):
+    def __init__(self, score, high_score, screen_width, screen_height, rng=None):
         super().__init__()
+        self.rng = rng or random.Random()
         self.score = score
         self.high_score = high_score
         self.screen_width = screen_width
@@ -398,32 +682,41 @@ class GameOverState(GameState):
         self.timer = 0
         self.particles = []
         
+        # الخطوط تُنشأ مرة واحدة بدلاً من كل إطار
+        self.title_font = pygame.font.Font(None, 72)
+        self.score_font = pygame.font.Font(None, 48)
+        self.message_font = pygame.font.Font(None, 36)
+        self.instruction_font = pygame.font.Font(None, 24)
+        
+        # أسطح الرسم تُنشأ مرة واحدة: صورة لكل (لون، حجم) وطبقة التوهج
+        self.particle_sprites = {}
+        self.glow_surface = pygame.Surface((520, 420), pygame.SRCALPHA)
+        pygame.draw.rect(self.glow_surface, (80, 200, 80, 50),
+                        self.glow_surface.get_rect(), border_radius=27)
+        
         # إنشاء تأثيرات الجسيمات
         self.create_particles()
     
     def create_particles(self):
         """إنشاء جسيمات النهاية"""
-        import random
-        import math
-        
         for _ in range(50):
-            x = random.randint(0, self.screen_width)
-            y = random.randint(0, self.screen_height)
+            x = self.rng.randint(0, self.screen_width)
+            y = self.rng.randint(0, self.screen_height)
             
             self.particles.append({
                 'x': x,
                 'y': y,
-                'vx': random.uniform(-2, 2),
-                'vy': random.uniform(-2, 2),
-                'color': random.choice([
+                'vx': self.rng.uniform(-2, 2),
+                'vy': self.rng.uniform(-2, 2),
+                'color': self.rng.choice([
                     (255, 50, 50),    # أحمر
                     (255, 150, 50),   # برتقالي
                     (255, 255, 50),   # أصفر
                     (50, 255, 50),    # أخضر
                     (50, 150, 255),   # أزرق
                 ]),
-                'size': random.uniform(3, 8),
-                'life': random.uniform(1, 3)
+                'size': self.rng.uniform(3, 8),
+                'life': self.rng.uniform(1, 3)
             })
     
     def handle_events(self, events):
@@ -442,7 +735,7 @@ class GameOverState(GameState):
         self.timer += dt
         
         # تحديث الجسيمات
-        for particle in self.particles:
+        for i, particle in enumerate(self.particles):
             particle['x'] += particle['vx']
             particle['y'] += particle['vy']
             particle['vy'] += 0.1  # جاذبية
@@ -454,25 +747,33 @@ class GameOverState(GameState):
             if particle['y'] < 0 or particle['y'] > self.screen_height:
                 particle['vy'] *= -0.8
             
-            # إزالة الجسيمات الميتة
+            # استبدال الجسيمات الميتة في مكانها (الحذف أثناء التكرار كان يتخطى عناصر)
             if particle['life'] <= 0:
-                self.particles.remove(particle)
-                # إضافة جسيم جديد
-                self.particles.append({
-                    'x': random.randint(0, self.screen_width),
+                self.particles[i] = {
+                    'x': self.rng.randint(0, self.screen_width),
                     'y': 0,
-                    'vx': random.uniform(-2, 2),
-                    'vy': random.uniform(1, 3),
-                    'color': random.choice([
+                    'vx': self.rng.uniform(-2, 2),
+                    'vy': self.rng.uniform(1, 3),
+                    'color': self.rng.choice([
                         (255, 50, 50),
                         (255, 150, 50),
                         (255, 255, 50),
                         (50, 255, 50),
                         (50, 150, 255),
                     ]),
-                    'size': random.uniform(3, 8),
-                    'life': random.uniform(1, 3)
-                })
+                    'size': self.rng.uniform(3, 8),
+                    'life': self.rng.uniform(1, 3)
+                }
+    
+    def get_particle_sprite(self, color, size):
+        """صورة جسيم معتمة بحجم صحيح (الشفافية تُضبط عند الرسم)"""
+        key = (color, size)
+        sprite = self.particle_sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (size, size), size)
+            self.particle_sprites[key] = sprite
+        return sprite
     
     def draw(self, screen):
         """رسم حالة النهاية"""
@@ -482,11 +783,9 @@ class GameOverState(GameState):
         # رسم الجسيمات
         for particle in self.particles:
             alpha = int(255 * (particle['life'] / 3))
-            color_with_alpha = (*particle['color'], alpha)
             
-            particle_surface = pygame.Surface((particle['size']*2, particle['size']*2), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surface, color_with_alpha,
-                             (particle['size'], particle['size']), particle['size'])
+            particle_surface = self.get_particle_sprite(particle['color'], int(particle['size']))
+            particle_surface.set_alpha(alpha)
             screen.blit(particle_surface, 
                        (particle['x'] - particle['size'], particle['y'] - particle['size']))
         
@@ -502,16 +801,13 @@ class GameOverState(GameState):
         pygame.draw.rect(screen, (80, 200, 80), game_over_rect, 3, border_radius=25)
         
         # تأثير توهج
-        glow_surface = pygame.Surface((520, 420), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surface, (80, 200, 80, 50), 
-                        glow_surface.get_rect(), border_radius=27)
-        screen.blit(glow_surface, (game_over_rect.x - 10, game_over_rect.y - 10))
+        screen.blit(self.glow_surface, (game_over_rect.x - 10, game_over_rect.y - 10))
         
         # النصوص
-        title_font = pygame.font.Font(None, 72)
-        score_font = pygame.font.Font(None, 48)
-        message_font = pygame.font.Font(None, 36)
-        instruction_font = pygame.font.Font(None, 24)
+        title_font = self.title_font
+        score_font = self.score_font
+        message_font = self.message_font
+        instruction_font = self.instruction_font
         
         # العنوان
         title_text = title_font.render("GAME OVER", True, (255, 100, 100))
@@ -547,4 +843,484 @@ class GameOverState(GameState):
                     game_over_rect.y + 300))
         screen.blit(instruction2, 
                    (self.screen_width//2 - instruction2.get_width()//2, 
-                    game_over_rect.y + 330))
\ No newline at end of file
+                    game_over_rect.y + 330))
+class ClassicState(GameState):
+    """لعبة الشبكة الكلاسيكية: قواعد SnakeSimulation مع الطيار الآلي والتسجيل والإعادة"""
+    def __init__(self, screen_width, screen_height):
+        super().__init__()
+        from autopilot import Autopilot
+        from hamiltonian import HamiltonianSolver
+        from simulation import SnakeSimulation
+        from profiler import get_frame_profiler
+        from input_queue import TurnQueue, get_input_latency_tracker
+        
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.profiler = get_frame_profiler()
+        
+        # إعدادات لعبة الثعبان
+        self.grid_size = 20
+        self.grid_width = screen_width // self.grid_size
+        self.grid_height = screen_height // self.grid_size
+        
+        # الطيار الآلي (وضع العرض) - F2 للتبديل بين: إيقاف، A*، لعب مثالي
+        self.bots = {
+            'astar': Autopilot(self.grid_width, self.grid_height),
+            'hamiltonian': HamiltonianSolver(self.grid_width, self.grid_height),
+        }
+        self.autopilot_modes = [None, 'astar', 'hamiltonian']
+        self.autopilot_mode = None
+        
+        # قواعد اللعبة + التسجيل/الإعادة
+        self.sim = SnakeSimulation(self.grid_width, self.grid_height)
+        self.recorder = None
+        self.replay_player = None
+        self.high_score = 0
+        
+        # انعطاف واحد من الطابور في كل خطوة
+        self.turn_queue = TurnQueue()
+        self.latency = get_input_latency_tracker()
+        
+        # الخطوط وخلفية الشبكة تُجهز مرة واحدة
+        self.hud_font = pygame.font.Font(None, 36)
+        self.controls_font = pygame.font.Font(None, 24)
+        self.game_over_font = pygame.font.Font(None, 72)
+        self.final_score_font = pygame.font.Font(None, 48)
+        self.restart_font = pygame.font.Font(None, 32)
+        self.background = self.create_background()
+        
+        # الألوان
+        self.snake_color = SNAKE_HEAD_COLOR
+        self.food_color = FOOD_COLOR
+        
+        self.reset()
+    
+    def create_background(self):
+        """خلفية الشبكة كسطح جاهز للنسخ"""
+        background = pygame.Surface((self.screen_width, self.screen_height))
+        background.fill(BACKGROUND_COLOR)
+        for x in range(0, self.screen_width, self.grid_size):
+            pygame.draw.line(background, GRID_LINE_COLOR, (x, 0), (x, self.screen_height), 1)
+        for y in range(0, self.screen_height, self.grid_size):
+            pygame.draw.line(background, GRID_LINE_COLOR, (0, y), (self.screen_width, y), 1)
+        return background
+    
+    def reset(self, seed=None):
+        """إعادة تعيين لعبة الثعبان"""
+        from simulation import SnakeSimulation
+        
+        self.stop_recording('quit')
+        
+        if self.replay_player:
+            # الخروج من وضع الإعادة
+            self.replay_player = None
+            self.sim = SnakeSimulation(self.grid_width, self.grid_height)
+        
+        # الثعبان والطعام والنقاط
+        self.sim.reset(seed)
+        self.next_direction = (1, 0)
+        self.turn_queue.clear()
+        self.high_score = 0
+        self.next_state = None
+        
+        # السرعة
+        self.speed_timer = 0
+    
+    # حالة اللعبة تُقرأ من المحاكاة
+    @property
+    def snake(self):
+        return self.sim.snake
+    
+    @property
+    def food(self):
+        return self.sim.food
+    
+    @property
+    def score(self):
+        return self.sim.score
+    
+    @property
+    def snake_speed(self):
+        return self.sim.speed
+    
+    @property
+    def snake_direction(self):
+        return self.sim.direction
+    
+    @property
+    def game_over(self):
+        return self.sim.game_over
+    
+    def start_replay(self, path):
+        """عرض إعادة عبر مسار الرسم العادي"""
+        from replay import ReplayPlayer
+        
+        self.stop_recording('quit')
+        self.replay_player = ReplayPlayer(path)
+        self.sim = self.replay_player.start()
+        self.speed_timer = 0
+    
+    def stop_recording(self, cause=None):
+        """إغلاق ملف التسجيل الحالي ثم حذف الإعادات الأقدم في خيط الكتابة"""
+        if self.recorder:
+            from replay import prune_replays
+            self.recorder.close(self.sim, None if self.sim.game_over else cause)
+            self.recorder = None
+            get_persistence_writer().submit('replay-prune', prune_replays)
+    
+    def replay_latest(self):
+        """عرض آخر جولة مسجلة (مفتاح R)"""
+        from replay import get_latest_replay
+        
+        self.stop_recording('quit')
+        path = get_latest_replay()
+        if path is None:
+            return
+        try:
+            self.start_replay(path)
+        except (OSError, ValueError) as e:
+            print(f"Error loading replay: {e}")
+    
+    def handle_events(self, events):
+        """معالجة أحداث اللعب"""
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            
+            if event.key == pygame.K_ESCAPE:
+                self.next_state = "menu"
+            elif event.key == pygame.K_F2:
+                index = self.autopilot_modes.index(self.autopilot_mode)
+                self.autopilot_mode = self.autopilot_modes[(index + 1) % len(self.autopilot_modes)]
+            elif event.key == pygame.K_SPACE:
+                self.reset()
+            elif event.key == pygame.K_r:
+                self.replay_latest()
+            
+            # تحكم في الثعبان: الانعطافات تُحفظ بالترتيب، واحد لكل خطوة
+            elif not self.game_over and event.key in KEY_DIRECTIONS:
+                self.turn_queue.push(KEY_DIRECTIONS[event.key], self.snake_direction, event_timestamp(event))
+    
+    def update(self, dt):
+        """تحديث حالة الثعبان"""
+        if self.game_over:
+            return
+        
+        # تحديث السرعة
+        self.speed_timer += dt
+        
+        if self.speed_timer >= 1.0 / self.snake_speed:
+            self.speed_timer = 0
+            
+            turn = self.turn_queue.pop()
+            if self.replay_player:
+                event = self.replay_player.step()
+            else:
+                if turn:
+                    self.next_direction = turn[0]
+                
+                # الطيار الآلي يخطط للخطوة التالية
+                if self.autopilot_mode:
+                    bot = self.bots[self.autopilot_mode]
+                    self.next_direction = bot.next_direction(self.snake, self.food,
+                                                             direction=self.snake_direction)
+                    self.profiler.lap('autopilot')
+                
+                # تسجيل الإدخال قبل الخطوة
+                if self.recorder is None and RECORD_REPLAYS:
+                    from replay import REPLAY_DIR, ReplayRecorder
+                    path = os.path.join(REPLAY_DIR, f"replay_{self.sim.seed}.snr")
+                    self.recorder = ReplayRecorder(path, self.sim)
+                if self.recorder:
+                    self.recorder.record_tick(self.sim, self.next_direction)
+                
+                event = self.sim.step(self.next_direction)
+                
+                # زمن الاستجابة: من ضغط المفتاح حتى الخطوة التي نفذته
+                if turn and not self.autopilot_mode:
+                    self.latency.record(turn[1])
+            
+            if event == 'ate' or event == 'full':
+                if self.score > self.high_score:
+                    self.high_score = self.score
+            
+            if self.game_over:
+                self.stop_recording()
+        self.profiler.lap('snake')
+    
+    def draw_snake(self, screen):
+        """رسم الثعبان والطعام"""
+        # رسم الطعام
+        if self.food:
+            food_x, food_y = self.food
+            pygame.draw.rect(screen, self.food_color,
+                            (food_x * self.grid_size, food_y * self.grid_size,
+                             self.grid_size - 2, self.grid_size - 2),
+                            border_radius=5)
+        
+        # رسم الثعبان
+        for i, (x, y) in enumerate(self.snake):
+            color = self.snake_color if i == 0 else SNAKE_BODY_COLOR
+            
+            # الرأس
+            if i == 0:
+                pygame.draw.rect(screen, color,
+                                (x * self.grid_size, y * self.grid_size,
+                                 self.grid_size - 2, self.grid_size - 2),
+                                border_radius=7)
+                
+                # العيون
+                eye_size = 3
+                if self.snake_direction == (1, 0):  # يمين
+                    pygame.draw.circle(screen, SNAKE_EYE_COLOR,
+                                     (x * self.grid_size + self.grid_size - 6,
+                                      y * self.grid_size + 6), eye_size)
+                    pygame.draw.circle(screen, SNAKE_EYE_COLOR,
+                                     (x * self.grid_size + self.grid_size - 6,
+                                      y * self.grid_size + self.grid_size - 6), eye_size)
+                elif self.snake_direction == (-1, 0):  # يسار
+                    pygame.draw.circle(screen, SNAKE_EYE_COLOR,
+                                     (x * self.grid_size + 6,
+                                      y * self.grid_size + 6), eye_size)
+                    pygame.draw.circle(screen, SNAKE_EYE_COLOR,
+                                     (x * self.grid_size + 6,
+                                      y * self.grid_size + self.grid_size - 6), eye_size)
+                elif self.snake_direction == (0, -1):  # أعلى
+                    pygame.draw.circle(screen, SNAKE_EYE_COLOR,
+                                     (x * self.grid_size + 6,
+                                      y * self.grid_size + 6), eye_size)
+                    pygame.draw.circle(screen, SNAKE_EYE_COLOR,
+                                     (x * self.grid_size + self.grid_size - 6,
+                                      y * self.grid_size + 6), eye_size)
+                elif self.snake_direction == (0, 1):  # أسفل
+                    pygame.draw.circle(screen, SNAKE_EYE_COLOR,
+                                     (x * self.grid_size + 6,
+                                      y * self.grid_size + self.grid_size - 6), eye_size)
+                    pygame.draw.circle(screen, SNAKE_EYE_COLOR,
+                                     (x * self.grid_size + self.grid_size - 6,
+                                      y * self.grid_size + self.grid_size - 6), eye_size)
+            else:
+                # الجسم
+                pygame.draw.rect(screen, color,
+                                (x * self.grid_size, y * self.grid_size,
+                                 self.grid_size - 2, self.grid_size - 2),
+                                border_radius=5)
+    
+    def draw(self, screen):
+        """رسم اللعبة"""
+        # خلفية الشبكة
+        screen.blit(self.background, (0, 0))
+        self.profiler.lap('draw_background')
+        
+        # رسم الثعبان والطعام
+        self.draw_snake(screen)
+        self.profiler.lap('draw_snake')
+        
+        # عرض النقاط
+        score_text = self.hud_font.render(f"Score: {self.score}", True, UI_TEXT_COLOR)
+        high_score_text = self.hud_font.render(f"High Score: {self.high_score}", True, UI_TEXT_COLOR)
+        speed_text = self.hud_font.render(f"Speed: {self.snake_speed}", True, UI_TEXT_COLOR)
+        
+        screen.blit(score_text, (10, 10))
+        screen.blit(high_score_text, (10, 50))
+        screen.blit(speed_text, (10, 90))
+        
+        # تعليمات التحكم
+        controls = [
+            "Use ARROW KEYS to move",
+            "Press SPACE to restart",
+            "Press R to replay the last run",
+            "Press ESC to return to menu"
+        ]
+        
+        for i, text in enumerate(controls):
+            control_text = self.controls_font.render(text, True, (150, 150, 150))
+            screen.blit(control_text, 
+                       (self.screen_width - control_text.get_width() - 10, 
+                        10 + i * 30))
+        self.profiler.lap('draw_hud')
+        
+        # عرض حالة game over
+        if self.game_over:
+            overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 150))
+            screen.blit(overlay, (0, 0))
+            
+            game_over_text = self.game_over_font.render("GAME OVER", True, (255, 50, 50))
+            screen.blit(game_over_text, 
+                       (self.screen_width//2 - game_over_text.get_width()//2,
+                        self.screen_height//2 - 100))
+            
+            final_score_text = self.final_score_font.render(f"Final Score: {self.score}", True, UI_TEXT_COLOR)
+            screen.blit(final_score_text,
+                       (self.screen_width//2 - final_score_text.get_width()//2,
+                        self.screen_height//2))
+            
+            # الإعادة تعرض سبب النهاية كما سُجل (انسحاب، اصطدام...)
+            if self.replay_player:
+                cause_text = self.restart_font.render(f"Replay ended: {self.sim.death_cause or 'unknown'}",
+                                                      True, (200, 200, 200))
+                screen.blit(cause_text,
+                           (self.screen_width//2 - cause_text.get_width()//2,
+                            self.screen_height//2 + 45))
+            
+            restart_text = self.restart_font.render("Press SPACE to restart or ESC for menu", True, (200, 200, 200))
+            screen.blit(restart_text,
+                       (self.screen_width//2 - restart_text.get_width()//2,
+                        self.screen_height//2 + 80))
+            self.profiler.lap('draw_overlay')
+
+# مفاتيح كل لاعب محلي في اللعب الجماعي
+PLAYER_KEYS = [
+    {pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1), pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0)},
+    {pygame.K_w: (0, -1), pygame.K_s: (0, 1), pygame.K_a: (-1, 0), pygame.K_d: (1, 0)},
+]
+
+class MultiplayerState(GameState):
+    """لعب جماعي محلي: 2-8 ثعابين (لاعبون محليون + بوتات) بقواعد MultiSnakeSimulation"""
+    def __init__(self, screen_width, screen_height, num_snakes=MULTI_SNAKES,
+                 local_players=MULTI_LOCAL_PLAYERS):
+        super().__init__()
+        from autopilot import Autopilot
+        from multi_simulation import MultiSnakeSimulation
+        from profiler import get_frame_profiler
+        from input_queue import TurnQueue
+        
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.profiler = get_frame_profiler()
+        
+        self.grid_size = 20
+        self.grid_width = screen_width // self.grid_size
+        self.grid_height = screen_height // self.grid_size
+        self.sim = MultiSnakeSimulation(self.grid_width, self.grid_height, num_snakes)
+        
+        # أول الثعابين للاعبين المحليين، والباقي بوتات
+        self.local_players = min(local_players, len(PLAYER_KEYS), num_snakes)
+        self.turn_queues = {snake_id: TurnQueue() for snake_id in range(1, self.local_players + 1)}
+        self.bots = {snake_id: Autopilot(self.grid_width, self.grid_height)
+                     for snake_id in range(self.local_players + 1, num_snakes + 1)}
+        
+        # الخطوط والخلفية تُجهز مرة واحدة
+        self.hud_font = pygame.font.Font(None, 28)
+        self.game_over_font = pygame.font.Font(None, 72)
+        self.restart_font = pygame.font.Font(None, 32)
+        self.background = self.create_background()
+        
+        self.reset()
+    
+    def create_background(self):
+        """خلفية الشبكة كسطح جاهز للنسخ"""
+        background = pygame.Surface((self.screen_width, self.screen_height))
+        background.fill(BACKGROUND_COLOR)
+        for x in range(0, self.screen_width, self.grid_size):
+            pygame.draw.line(background, GRID_LINE_COLOR, (x, 0), (x, self.screen_height), 1)
+        for y in range(0, self.screen_height, self.grid_size):
+            pygame.draw.line(background, GRID_LINE_COLOR, (0, y), (self.screen_width, y), 1)
+        return background
+    
+    def reset(self, seed=None):
+        """جولة جديدة بنفس المحاكاة والبوتات"""
+        self.sim.reset(seed)
+        for queue in self.turn_queues.values():
+            queue.clear()
+        self.speed_timer = 0
+        self.next_state = None
+    
+    def handle_events(self, events):
+        """معالجة أحداث اللعب الجماعي"""
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            
+            if event.key == pygame.K_ESCAPE:
+                self.next_state = "menu"
+            elif event.key == pygame.K_SPACE and self.sim.game_over:
+                self.reset()
+            else:
+                for snake_id, queue in self.turn_queues.items():
+                    direction = PLAYER_KEYS[snake_id - 1].get(event.key)
+                    snake = self.sim.get_snake(snake_id)
+                    if direction and snake.alive:
+                        queue.push(direction, snake.direction, event_timestamp(event))
+    
+    def update(self, dt):
+        """خطوة متزامنة لكل الثعابين بسرعة ثابتة"""
+        from multi_simulation import plan_bot_direction
+        
+        if self.sim.game_over:
+            return
+        
+        self.speed_timer += dt
+        if self.speed_timer < 1.0 / self.sim.speed:
+            return
+        self.speed_timer = 0
+        
+        directions = {}
+        for snake_id, queue in self.turn_queues.items():
+            turn = queue.pop()
+            if turn:
+                directions[snake_id] = turn[0]
+        for snake_id, bot in self.bots.items():
+            snake = self.sim.get_snake(snake_id)
+            if snake.alive:
+                directions[snake_id] = plan_bot_direction(self.sim, snake, bot)
+        self.profiler.lap('autopilot')
+        
+        self.sim.step(directions)
+        
+        # لا داعي لمتابعة البوتات وحدها بعد خروج كل اللاعبين المحليين
+        if self.turn_queues and not self.sim.game_over and \
+                not any(self.sim.get_snake(snake_id).alive for snake_id in self.turn_queues):
+            self.sim.end(self.sim.get_alive_snakes())
+        self.profiler.lap('snake')
+    
+    def draw(self, screen):
+        """رسم اللوحة والثعابين والنقاط"""
+        screen.blit(self.background, (0, 0))
+        size = self.grid_size
+        
+        for x, y in self.sim.foods:
+            pygame.draw.rect(screen, FOOD_COLOR, (x * size, y * size, size - 2, size - 2),
+                             border_radius=5)
+        
+        for snake in self.sim.snakes:
+            if not snake.alive:
+                continue
+            color = MULTI_SNAKE_COLORS[(snake.snake_id - 1) % len(MULTI_SNAKE_COLORS)]
+            body_color = tuple(channel * 2 // 3 for channel in color)
+            for i, (x, y) in enumerate(snake.body):
+                pygame.draw.rect(screen, color if i == 0 else body_color,
+                                 (x * size, y * size, size - 2, size - 2),
+                                 border_radius=7 if i == 0 else 5)
+        self.profiler.lap('draw_snake')
+        
+        # نقاط كل ثعبان بلونه
+        for index, snake in enumerate(self.sim.snakes):
+            color = MULTI_SNAKE_COLORS[index % len(MULTI_SNAKE_COLORS)]
+            owner = f"P{snake.snake_id}" if snake.snake_id in self.turn_queues else "Bot"
+            status = "" if snake.alive else f" ({snake.death_cause})"
+            text = self.hud_font.render(f"{owner} #{snake.snake_id}: {snake.score}{status}",
+                                        True, color if snake.alive else (120, 120, 120))
+            screen.blit(text, (10, 10 + index * 24))
+        self.profiler.lap('draw_hud')
+        
+        if self.sim.game_over:
+            overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 150))
+            screen.blit(overlay, (0, 0))
+            
+            if self.sim.winner is None:
+                title, color = "DRAW", UI_TEXT_COLOR
+            else:
+                title = f"SNAKE #{self.sim.winner} WINS"
+                color = MULTI_SNAKE_COLORS[(self.sim.winner - 1) % len(MULTI_SNAKE_COLORS)]
+            title_text = self.game_over_font.render(title, True, color)
+            screen.blit(title_text, (self.screen_width // 2 - title_text.get_width() // 2,
+                                     self.screen_height // 2 - 60))
+            
+            restart_text = self.restart_font.render("Press SPACE to restart or ESC for menu",
+                                                    True, (200, 200, 200))
+            screen.blit(restart_text, (self.screen_width // 2 - restart_text.get_width() // 2,
+                                       self.screen_height // 2 + 30))
+            self.profiler.lap('draw_overlay')
\ No newline at end of file
@@ -14,6 +14,7 @@ class Graphics:
         self.load_textures()
         self.camera = None
         self.effects = []
+        self.game_over_overlay = None
         
     def load_fonts(self):
         """تحميل الخطوط"""
@@ -407,12 +408,13 @@ class Graphics:
         level_rect = level_text.get_rect(topright=(screen_width - 40, 30))
         self.screen.blit(level_text, level_rect)
     
-    def draw_game_over(self, score, high_score, screen_width, screen_height):
+    def draw_game_over(self, score, high_score, screen_width, screen_height, rank_info=None):
         """رسم شاشة انتهاء اللعبة"""
-        # طبقة شفافة
-        overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        # طبقة شفافة (تُبنى مرة واحدة وتُرسم في كل إطار)
+        if self.game_over_overlay is None or self.game_over_overlay.get_size() != (screen_width, screen_height):
+            self.game_over_overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
+            self.game_over_overlay.fill((0, 0, 0, 180))
+        self.screen.blit(self.game_over_overlay, (0, 0))
         
         # نافذة النهاية
         game_over_rect = pygame.Rect(screen_width//2 - 200, screen_height//2 - 150, 400, 300)
@@ -438,6 +440,14 @@ class Graphics:
         else:
             message = self.score_font.render("Press SPACE to play again", True, (200, 200, 200))
             self.screen.blit(message, (screen_width//2 - message.get_width()//2, game_over_rect.y + 220))
+        
+        # الترتيب بين كل الجولات
+        if rank_info:
+            rank_text = self.small_font.render(
+                f"Rank #{rank_info['rank']} of {rank_info['total_runs']} "
+                f"(better than {rank_info['percentile']:.0f}%)",
+                True, (180, 180, 180))
+            self.screen.blit(rank_text, (screen_width//2 - rank_text.get_width()//2, game_over_rect.y + 260))
 
     def draw_controls_hint(self, screen, screen_width, screen_height):
         """رسم تلميح التحكم"""
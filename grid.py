@@ -9,14 +9,29 @@ from config import *
 
 class Grid:
     """فئة الشبكة والفيزياء"""
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None):
         self.width = width
         self.height = height
+        self.rng = rng or random.Random()
         self.grid_width = GRID_WIDTH
         self.grid_height = GRID_HEIGHT
         self.obstacles = []
+        self.arena = None
         self.generate_obstacles()
         
+    def reset(self):
+        """عوائق جديدة في نفس القائمة (عوائق الساحة ثابتة بين الجولات)"""
+        if self.arena is not None:
+            return
+        self.obstacles.clear()
+        self.generate_obstacles()
+    
+    def load_arena(self, arena):
+        """ملء العوائق من الساحة دفعة واحدة"""
+        self.arena = arena
+        self.obstacles = [{'type': arena.get_tile_type(x, y), 'x': x, 'y': y}
+                          for x, y in arena.blocked_cells]
+    
     def generate_obstacles(self):
         """توليد عوائق عشوائية"""
         # جدران الحدود
@@ -29,11 +44,11 @@ class Grid:
             self.obstacles.append({'type': 'wall', 'x': self.grid_width-1, 'y': y})
         
         # عوائق داخلية
-        num_obstacles = random.randint(5, 10)
+        num_obstacles = self.rng.randint(5, 10)
         for _ in range(num_obstacles):
-            obs_type = random.choice(['wall', 'spike'])
-            x = random.randint(2, self.grid_width - 3)
-            y = random.randint(2, self.grid_height - 3)
+            obs_type = self.rng.choice(['wall', 'spike'])
+            x = self.rng.randint(2, self.grid_width - 3)
+            y = self.rng.randint(2, self.grid_height - 3)
             self.obstacles.append({'type': obs_type, 'x': x, 'y': y})
     
     def check_collision(self, x, y, radius, check_ghost=False):
@@ -91,6 +106,12 @@ class Camera:
         self.width = width
         self.height = height
         
+    def reset(self):
+        """العودة لمنتصف الشاشة بدون تقريب"""
+        self.x = self.target_x = self.width // 2
+        self.y = self.target_y = self.height // 2
+        self.zoom = self.target_zoom = 1.0
+    
     def follow(self, target_x, target_y):
         """متابعة هدف"""
         self.target_x = target_x
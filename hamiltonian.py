@@ -0,0 +1,196 @@
+"""
+♾️ حل مثالي بدورة هاميلتونية مع اختصارات آمنة نحو الطعام
+"""
+
+import os
+from array import array
+from config import *
+
+CYCLES_DIR = os.path.join(SAVE_DIR, "cycles")
+
+_cycle_cache = {}
+
+def build_cycle(grid_width, grid_height):
+    """بناء ترتيب الخلايا على الدورة (قائمة مواقع x, y)
+
+    - ارتفاع زوجي: متعرج على الأعمدة 1.. والعودة عبر العمود 0
+    - عرض زوجي: نفس البناء بعد تبديل المحورين
+    - فردي × فردي: لا توجد دورة كاملة، فتُستثنى الخلية (0, h-1)
+    """
+    if grid_width < 2 or grid_height < 2:
+        raise ValueError("Board must be at least 2x2")
+    
+    if grid_height % 2 == 0:
+        return build_even_cycle(grid_width, grid_height)
+    if grid_width % 2 == 0:
+        return [(x, y) for y, x in build_even_cycle(grid_height, grid_width)]
+    return build_odd_cycle(grid_width, grid_height)
+
+def build_even_cycle(width, height):
+    """دورة لشبكة ذات ارتفاع زوجي"""
+    cells = [(x, 0) for x in range(width)]
+    for y in range(1, height):
+        columns = range(width - 1, 0, -1) if y % 2 == 1 else range(1, width)
+        cells.extend((x, y) for x in columns)
+    cells.extend((0, y) for y in range(height - 1, 0, -1))
+    return cells
+
+def build_odd_cycle(width, height):
+    """دورة تغطي كل الخلايا عدا الزاوية (0, h-1) لشبكة فردية الأبعاد"""
+    cells = [(x, 0) for x in range(width)]
+    for y in range(1, height - 2):
+        columns = range(width - 1, 0, -1) if y % 2 == 1 else range(1, width)
+        cells.extend((x, y) for x in columns)
+    
+    # الصفان الأخيران بتعرج عمودي
+    for offset, x in enumerate(range(width - 1, 0, -1)):
+        rows = (height - 2, height - 1) if offset % 2 == 0 else (height - 1, height - 2)
+        cells.extend((x, y) for y in rows)
+    
+    cells.extend((0, y) for y in range(height - 2, 0, -1))
+    return cells
+
+def is_valid_cycle(order, grid_width, grid_height):
+    """التحقق من دورة محفوظة: الطول المتوقع، خلايا مختلفة داخل اللوحة، وكل خطوة لخلية مجاورة"""
+    cell_count = grid_width * grid_height
+    expected = cell_count - 1 if grid_width % 2 and grid_height % 2 else cell_count
+    if len(order) != expected or len(set(order)) != expected:
+        return False
+    if min(order) < 0 or max(order) >= cell_count:
+        return False
+    
+    # order[-1] يسبق order[0]: الدورة مغلقة
+    previous = order[-1]
+    for cell in order:
+        if abs(cell % grid_width - previous % grid_width) + abs(cell // grid_width - previous // grid_width) != 1:
+            return False
+        previous = cell
+    return True
+
+def get_cycle(grid_width, grid_height):
+    """الدورة من الذاكرة أو القرص، وإلا تُبنى وتُحفظ"""
+    key = (grid_width, grid_height)
+    if key in _cycle_cache:
+        return _cycle_cache[key]
+    
+    cycle_file = os.path.join(CYCLES_DIR, f"cycle_{grid_width}x{grid_height}.bin")
+    order = array('i')
+    try:
+        with open(cycle_file, 'rb') as f:
+            order.frombytes(f.read())
+    except (OSError, ValueError):
+        order = array('i')
+    
+    # ملف تالف أو من لوحة بمقاس آخر: يُعاد بناؤه
+    if order and not is_valid_cycle(order, grid_width, grid_height):
+        print(f"Error loading hamiltonian cycle: {cycle_file} does not match {grid_width}x{grid_height}")
+        order = array('i')
+    
+    if not order:
+        order = array('i', (y * grid_width + x for x, y in build_cycle(grid_width, grid_height)))
+        try:
+            os.makedirs(CYCLES_DIR, exist_ok=True)
+            temp_file = cycle_file + ".tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(order.tobytes())
+            os.replace(temp_file, cycle_file)
+        except OSError as e:
+            print(f"Error caching hamiltonian cycle: {e}")
+    
+    _cycle_cache[key] = order
+    return order
+
+class HamiltonianSolver:
+    """بوت يتبع الدورة ويأخذ اختصارات لا تتجاوز الذيل؛ يملأ اللوحات الزوجية دائماً"""
+    SHORTCUT_LIMIT = 0.5  # تعطيل الاختصارات بعد ملء نصف اللوحة
+    SAFETY_MARGIN = 3
+    
+    def __init__(self, grid_width, grid_height):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.order = array('i', get_cycle(grid_width, grid_height))
+        self.cycle_length = len(self.order)
+        
+        self.position = array('i', [-1]) * (grid_width * grid_height)
+        for i, cell in enumerate(self.order):
+            self.position[cell] = i
+        
+        # في اللوحات الفردية: بديل يبدل الخلية المستثناة مع جارتها
+        self.skipped_cell = None
+        self.swap_cell = None
+        if self.cycle_length < grid_width * grid_height:
+            self.skipped_cell = (grid_height - 1) * grid_width
+            self.swap_cell = (grid_height - 2) * grid_width + 1
+    
+    def distance(self, a, b):
+        """المسافة على الدورة من الخلية a إلى b"""
+        return (self.position[b] - self.position[a]) % self.cycle_length
+    
+    def swap_skipped_cell(self):
+        """تبديل الخلية المستثناة (ممكن فقط إذا لم تكن الأخرى من الجسم)"""
+        slot = self.position[self.swap_cell]
+        self.order[slot] = self.skipped_cell
+        self.position[self.skipped_cell] = slot
+        self.position[self.swap_cell] = -1
+        self.skipped_cell, self.swap_cell = self.swap_cell, self.skipped_cell
+    
+    def next_direction(self, snake, food, obstacles=(), direction=None):
+        """الاتجاه التالي؛ snake قائمة خلايا والرأس أولاً"""
+        width = self.grid_width
+        cells = [y * width + x for x, y in snake]
+        head, tail = cells[0], cells[-1]
+        food_cell = food[1] * width + food[0] if food is not None else None
+        
+        # الطعام على الخلية المستثناة: نبدل إذا كانت جارتها خارج الجسم
+        if self.skipped_cell is not None and food_cell == self.skipped_cell \
+                and self.swap_cell not in cells:
+            self.swap_skipped_cell()
+        
+        next_cell = self.order[(self.position[head] + 1) % self.cycle_length]
+        
+        # الجسم يغطي الدورة كلها (لوحة فردية): التالي هو الذيل ولا يمكن دخوله،
+        # فالحركة الوحيدة هي أكل الخلية الأخيرة إن كانت مجاورة للرأس.
+        # اللوحة الفردية لا تمتلئ دائماً: بطول N-2 تبقى خليتان إحداهما من اللون الأكثر
+        # (x + y زوجي)، وإن ظهر الطعام عليها فلا يوجد مسار يملأ اللوحة
+        if len(cells) >= self.cycle_length and food_cell is not None \
+                and abs(food_cell % width - snake[0][0]) + abs(food_cell // width - snake[0][1]) == 1:
+            next_cell = food_cell
+        
+        # اختصار: أقرب جار للطعام دون تجاوز الذيل أو الطعام
+        if food_cell is not None and self.position[food_cell] >= 0 \
+                and len(cells) < self.cycle_length * self.SHORTCUT_LIMIT:
+            body = set(cells)
+            room = self.distance(head, tail) if len(cells) > 1 else self.cycle_length
+            room -= self.SAFETY_MARGIN
+            food_distance = self.distance(head, food_cell)
+            best_remaining = self.distance(next_cell, food_cell)
+            
+            x, y = snake[0]
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < self.grid_height):
+                    continue
+                neighbor = ny * width + nx
+                if neighbor in body or self.position[neighbor] < 0:
+                    continue
+                jump = self.distance(head, neighbor)
+                if jump > room or jump > food_distance:
+                    continue
+                remaining = self.distance(neighbor, food_cell)
+                # الخلايا المتخطاة لا تعود أمام الرأس قبل أن يعبر الذيل الجسم الحالي كله؛
+                # الأكل قبل ذلك قد يتكرر (طعام جديد أمام الرأس) حتى يصطدم بذيله
+                if jump > 1 and remaining <= len(cells):
+                    continue
+                if remaining < best_remaining:
+                    best_remaining = remaining
+                    next_cell = neighbor
+        
+        move = (next_cell % width - snake[0][0], next_cell // width - snake[0][1])
+        
+        # ثعبان بطول 1 لا يستطيع الرجوع للخلف؛ أي خلية أخرى آمنة
+        if len(cells) == 1 and direction and move == (-direction[0], -direction[1]):
+            x, y = snake[0]
+            for dx, dy in ((0, 1), (0, -1), direction):
+                if 0 <= x + dx < width and 0 <= y + dy < self.grid_height:
+                    return (dx, dy)
+        return move
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+🥇 خدمة أعلى النقاط المشتركة (نسخة واحدة في الذاكرة)
+"""
+
+import bisect
+import heapq
+import json
+import os
+import threading
+from config import *
+from persistence import get_persistence_writer
+from leaderboard import get_leaderboard
+
+MAX_HIGH_SCORES = 10
+
+class HighScoreService:
+    """جدول أعلى النقاط محمّل مرة واحدة ومرتب دائماً"""
+    def __init__(self, scores_file=HIGH_SCORES_FILE, max_scores=MAX_HIGH_SCORES):
+        self.scores_file = scores_file
+        self.max_scores = max_scores
+        self.scores = []
+        self.keys = []  # مفاتيح الترتيب (-score) بنفس ترتيب الجدول
+        self.loaded = False
+        self.lock = threading.RLock()
+    
+    def load(self):
+        """تحميل الجدول من القرص (مرة واحدة فقط)"""
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+            try:
+                if os.path.exists(self.scores_file):
+                    with open(self.scores_file, 'r') as f:
+                        scores = json.load(f)
+                    scores.sort(key=lambda x: x['score'], reverse=True)
+                    self.scores = scores[:self.max_scores]
+                    self.keys = [-entry['score'] for entry in self.scores]
+            except:
+                self.scores = []
+                self.keys = []
+    
+    def insert_entry(self, entry):
+        """إدراج نتيجة بالبحث الثنائي دون حفظ (يُستدعى مع القفل)"""
+        key = -entry['score']
+        position = bisect.bisect_right(self.keys, key)
+        if position >= self.max_scores:
+            return None
+        
+        self.keys.insert(position, key)
+        self.scores.insert(position, entry)
+        del self.keys[self.max_scores:]
+        del self.scores[self.max_scores:]
+        return position + 1
+    
+    def add_score(self, entry, on_recorded=None):
+        """إضافة نتيجة وإرجاع ترتيبها أو None إن لم تدخل الجدول
+
+        on_recorded يُستدعى من خيط الكتابة بترتيب الجولة بين كل الجولات بعد تسجيلها.
+        """
+        # كل الجولات تُسجل في لوحة المتصدرين (في خيط الكتابة)، حتى النتائج الصفرية
+        get_persistence_writer().submit(None, lambda: self.record_run(entry, on_recorded))
+        if entry['score'] <= 0:
+            return None
+        
+        with self.lock:
+            self.load()
+            rank = self.insert_entry(entry)
+            if rank is not None:
+                self.save()
+            return rank
+    
+    def record_run(self, entry, on_recorded=None):
+        """تسجيل الجولة في لوحة المتصدرين إن كانت مفعلة"""
+        leaderboard = get_leaderboard()
+        if leaderboard:
+            leaderboard.record_run(entry)
+            if on_recorded:
+                on_recorded(leaderboard.get_standing(entry['score']))
+    
+    def replace_scores(self, entries):
+        """استبدال الجدول بقائمة مرتبة مسبقاً ثم الحفظ مرة واحدة"""
+        with self.lock:
+            self.loaded = True
+            self.scores = list(entries[:self.max_scores])
+            self.keys = [-entry['score'] for entry in self.scores]
+            self.save()
+    
+    def reload(self):
+        """إعادة التحميل من القرص (بعد الاستعادة من نسخة احتياطية)"""
+        with self.lock:
+            self.loaded = False
+            self.scores = []
+            self.keys = []
+            self.load()
+    
+    def get_scores(self, limit=None):
+        """الحصول على نسخة من الجدول"""
+        with self.lock:
+            self.load()
+            scores = self.scores if limit is None else self.scores[:limit]
+            return [dict(entry) for entry in scores]
+    
+    def get_high_score(self):
+        """الحصول على أعلى نقاط"""
+        with self.lock:
+            self.load()
+            return self.scores[0]['score'] if self.scores else 0
+    
+    def clear(self):
+        """مسح الجدول من الذاكرة والقرص"""
+        with self.lock:
+            self.scores = []
+            self.keys = []
+            self.loaded = True
+            get_persistence_writer().remove_file(self.scores_file)
+    
+    def save(self):
+        """الكاتب الوحيد لملف أعلى النقاط (عبر كاتب الخلفية)"""
+        with self.lock:
+            snapshot = [dict(entry) for entry in self.scores]
+        get_persistence_writer().write_file(self.scores_file,
+                                            lambda: json.dumps(snapshot, indent=2))
+        return True
+
+def score_sort_key(entry):
+    """ترتيب كلي للنتائج: النقاط تنازلياً ثم التاريخ ثم اللاعب"""
+    return (-entry['score'], entry.get('date', ''), entry.get('player', ''))
+
+def format_score_export(entries):
+    """تنسيق ملف تصدير مرتب مسبقاً (سطر JSON لكل نتيجة)"""
+    lines = [json.dumps(entry) + '\n' for entry in sorted(entries, key=score_sort_key)]
+    return ''.join(lines)
+
+def read_score_export(path):
+    """قراءة ملف تصدير كتيار مرتب"""
+    with open(path, 'r') as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        
+        if first == '[':
+            # صيغة التصدير القديمة (قائمة JSON غير مرتبة بالضرورة)
+            yield from sorted(json.load(f), key=score_sort_key)
+            return
+        
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def merge_score_streams(streams, limit):
+    """دمج k تيار مرتب مع إزالة التكرار، والذاكرة محدودة بحجم الناتج"""
+    merged = []
+    seen = set()
+    current_score = None
+    
+    for entry in heapq.merge(*streams, key=score_sort_key):
+        # التكرارات متجاورة حسب النقاط، لذا نحتفظ بمفاتيح النقاط الحالية فقط
+        if entry['score'] != current_score:
+            current_score = entry['score']
+            seen.clear()
+        
+        identity = (entry.get('player'), entry['score'], entry.get('date'))
+        if identity in seen:
+            continue
+        seen.add(identity)
+        
+        merged.append(entry)
+        if len(merged) >= limit:
+            break
+    
+    return merged
+
+_services = {}
+_services_lock = threading.Lock()
+
+def get_high_score_service(scores_file=HIGH_SCORES_FILE):
+    """الحصول على الخدمة المشتركة لملف معين"""
+    path = os.path.normpath(scores_file)
+    with _services_lock:
+        if path not in _services:
+            _services[path] = HighScoreService(path)
+        return _services[path]
\ No newline at end of file
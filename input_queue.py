@@ -0,0 +1,81 @@
+"""
+⌨️ طابور الإدخال - انعطافات محفوظة بترتيبها مع توقيتها، وقياس زمن الإدخال حتى الحركة
+"""
+
+import pygame
+import numpy as np
+from collections import deque
+from config import *
+
+def event_timestamp(event):
+    """توقيت الحدث بملي ثانية SDL (وقت القراءة إن لم يحمل الحدث توقيتاً)"""
+    timestamp = getattr(event, 'timestamp', None)
+    return timestamp if timestamp is not None else pygame.time.get_ticks()
+
+class TurnQueue:
+    """طابور انعطافات محدود: انعطاف واحد يُطبق في كل خطوة، فلا يضيع انعطافان سريعان"""
+    def __init__(self, max_size=INPUT_QUEUE_SIZE):
+        self.max_size = max_size
+        self.turns = deque()
+        self.dropped = 0
+
+    def push(self, direction, current_direction, timestamp=None):
+        """إضافة انعطاف؛ يُرفض التكرار والرجوع للخلف (مقارنة بآخر انعطاف في الطابور)"""
+        last = self.turns[-1][0] if self.turns else current_direction
+        if direction == last or (direction[0] == -last[0] and direction[1] == -last[1]):
+            return False
+        if len(self.turns) >= self.max_size:
+            self.dropped += 1
+            return False
+
+        if timestamp is None:
+            timestamp = pygame.time.get_ticks()
+        self.turns.append((direction, timestamp))
+        return True
+
+    def pop(self):
+        """الانعطاف التالي (الاتجاه، التوقيت) أو None"""
+        return self.turns.popleft() if self.turns else None
+
+    def clear(self):
+        """تفريغ الطابور"""
+        self.turns.clear()
+
+    def __len__(self):
+        return len(self.turns)
+
+class InputLatencyTracker:
+    """زمن الإدخال حتى الحركة (ملي ثانية) لآخر الانعطافات"""
+    def __init__(self, capacity=INPUT_LATENCY_HISTORY):
+        self.samples = deque(maxlen=capacity)
+        self.total_moves = 0
+
+    def record(self, timestamp):
+        """تسجيل حركة نفذت انعطافاً ضُغط في timestamp"""
+        self.samples.append(pygame.time.get_ticks() - timestamp)
+        self.total_moves += 1
+
+    def get_summary(self):
+        """المتوسط و p95 والأقصى لآخر العينات"""
+        if not self.samples:
+            return None
+        samples = np.fromiter(self.samples, dtype=float, count=len(self.samples))
+        return {
+            'count': len(samples),
+            'mean_ms': float(samples.mean()),
+            'p95_ms': float(np.percentile(samples, 95)),
+            'max_ms': float(samples.max()),
+        }
+
+    def clear(self):
+        """مسح العينات"""
+        self.samples.clear()
+
+_latency_tracker = None
+
+def get_input_latency_tracker():
+    """الحصول على متتبع زمن الإدخال المشترك"""
+    global _latency_tracker
+    if _latency_tracker is None:
+        _latency_tracker = InputLatencyTracker()
+    return _latency_tracker
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""
+📊 لوحة المتصدرين (SQLite) لكل الجولات وليس أول 10 فقط
+"""
+
+import json
+import os
+import threading
+from config import *
+
+try:
+    import sqlite3
+except ImportError:  # بعض توزيعات بايثون بدون sqlite3
+    sqlite3 = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER,
+    foods_eaten INTEGER,
+    play_time INTEGER,
+    date TEXT NOT NULL,
+    UNIQUE (player, score, date)
+);
+CREATE INDEX IF NOT EXISTS runs_score ON runs (score);
+CREATE INDEX IF NOT EXISTS runs_player_score ON runs (player, score DESC);
+CREATE INDEX IF NOT EXISTS runs_date ON runs (date);
+
+-- عدد الجولات لكل نتيجة (يُحدث مع كل إدراج) لبناء شجرة الترتيب دون المرور على كل الجولات
+CREATE TABLE IF NOT EXISTS score_counts (
+    score INTEGER PRIMARY KEY,
+    runs INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS runs_score_count AFTER INSERT ON runs
+BEGIN
+    INSERT OR IGNORE INTO score_counts (score, runs) VALUES (NEW.score, 0);
+    UPDATE score_counts SET runs = runs + 1 WHERE score = NEW.score;
+END;
+"""
+
+# قيمة user_version بعد استيراد ملفات JSON
+IMPORTED_VERSION = 1
+
+def run_key(entry):
+    """مفتاح مطابقة الجولة نفسها بين أعلى النقاط وسجل الإحصائيات"""
+    return (entry.get('player', entry.get('player_name', 'Player')), entry.get('score'),
+            entry.get('level'), entry.get('foods_eaten'), entry.get('play_time'))
+
+class ScoreHistogram:
+    """شجرة فنويك لعدد الجولات لكل نتيجة: عدّ النتائج الأعلى أو الأقل في O(log S)
+
+    S أكبر نتيجة مسجلة؛ الشجرة تتضاعف عند تجاوزها (إعادة بناء نادرة من القاموس).
+    """
+    def __init__(self, counts=None):
+        self.counts = {}
+        self.total = 0
+        self.size = 1
+        self.tree = [0] * 2
+        for score, runs in (counts or {}).items():
+            self.add(score, runs)
+    
+    def add(self, score, runs=1):
+        """إضافة جولات بنتيجة معينة (النتائج السالبة تُحسب كصفر)"""
+        score = max(score, 0)
+        if score >= self.size:
+            self.grow(score + 1)
+        self.counts[score] = self.counts.get(score, 0) + runs
+        self.total += runs
+        index = score + 1
+        while index <= self.size:
+            self.tree[index] += runs
+            index += index & -index
+    
+    def grow(self, minimum):
+        """مضاعفة الحجم ثم إعادة البناء في O(S)"""
+        size = self.size
+        while size < minimum:
+            size *= 2
+        tree = [0] * (size + 1)
+        for score, runs in self.counts.items():
+            tree[score + 1] += runs
+        for index in range(1, size + 1):
+            parent = index + (index & -index)
+            if parent <= size:
+                tree[parent] += tree[index]
+        self.size = size
+        self.tree = tree
+    
+    def count_below(self, score):
+        """عدد الجولات بنتيجة أقل من score"""
+        index = min(max(score, 0), self.size)
+        count = 0
+        while index > 0:
+            count += self.tree[index]
+            index -= index & -index
+        return count
+    
+    def count_above(self, score):
+        """عدد الجولات بنتيجة أعلى من score"""
+        if score < 0:
+            return self.total
+        return self.total - self.count_below(score + 1)
+
+class Leaderboard:
+    """مخزن الجولات مع استعلامات الترتيب والنسبة المئوية"""
+    def __init__(self, db_file=LEADERBOARD_DB):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(db_file, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        
+        # الترتيب من شجرة في الذاكرة تُبنى من جدول score_counts (صف لكل نتيجة مختلفة)
+        self.histogram = ScoreHistogram(self.load_score_counts())
+    
+    def load_score_counts(self):
+        """قراءة جدول score_counts، وبناؤه من runs إن لم يطابقها (قاعدة من إصدار أقدم)"""
+        with self.lock:
+            total = self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+            counted = self.connection.execute("SELECT SUM(runs) FROM score_counts").fetchone()[0] or 0
+            if counted != total:
+                self.connection.execute("DELETE FROM score_counts")
+                self.connection.execute(
+                    "INSERT INTO score_counts (score, runs) SELECT score, COUNT(*) FROM runs GROUP BY score")
+                self.connection.commit()
+            return dict(self.connection.execute("SELECT score, runs FROM score_counts").fetchall())
+    
+    def record_run(self, entry):
+        """تسجيل جولة (تُتجاهل المكررات)"""
+        with self.lock:
+            cursor = self.insert_run(entry)
+            self.connection.commit()
+            return cursor.rowcount > 0
+    
+    def insert_run(self, entry):
+        """إدراج صف دون commit (يُستدعى مع القفل)"""
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO runs (player, score, level, foods_eaten, play_time, date) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (entry.get('player', 'Player'), entry['score'], entry.get('level'),
+             entry.get('foods_eaten'), entry.get('play_time'), entry['date']))
+        if cursor.rowcount > 0:
+            self.histogram.add(entry['score'])
+        return cursor
+    
+    def get_rank(self, score):
+        """ترتيب النتيجة بين كل الجولات (1 = الأعلى)، في O(log S)"""
+        with self.lock:
+            return self.histogram.count_above(score) + 1
+    
+    def get_percentile(self, score):
+        """نسبة الجولات التي تقل نتيجتها عن هذه النتيجة"""
+        with self.lock:
+            if not self.histogram.total:
+                return 100.0
+            return 100.0 * self.histogram.count_below(score) / self.histogram.total
+    
+    def get_total_runs(self):
+        """عدد الجولات المسجلة"""
+        with self.lock:
+            return self.histogram.total
+    
+    def get_standing(self, score):
+        """الترتيب والنسبة المئوية وعدد الجولات معاً (لشاشة نهاية اللعبة)"""
+        with self.lock:
+            return {
+                'rank': self.get_rank(score),
+                'percentile': self.get_percentile(score),
+                'total_runs': self.histogram.total
+            }
+    
+    def get_top_scores(self, limit=10):
+        """أعلى النتائج بين كل اللاعبين"""
+        return self.query(
+            "SELECT player, score, level, foods_eaten, play_time, date FROM runs "
+            "ORDER BY score DESC LIMIT ?", (limit,))
+    
+    def get_player_top_scores(self, player, limit=10):
+        """أعلى نتائج لاعب معين (فهرس player, score)"""
+        return self.query(
+            "SELECT player, score, level, foods_eaten, play_time, date FROM runs "
+            "WHERE player = ? ORDER BY score DESC LIMIT ?", (player, limit))
+    
+    def get_player_bests(self, limit=10):
+        """أفضل نتيجة لكل لاعب (أعمدة SQLite المجردة تأتي من صف الحد الأقصى)"""
+        return self.query(
+            "SELECT player, MAX(score) AS score, level, foods_eaten, play_time, date FROM runs "
+            "GROUP BY player ORDER BY score DESC LIMIT ?", (limit,))
+    
+    def query(self, sql, params):
+        """تنفيذ استعلام وإرجاع قواميس"""
+        with self.lock:
+            rows = self.connection.execute(sql, params).fetchall()
+        keys = ('player', 'score', 'level', 'foods_eaten', 'play_time', 'date')
+        return [dict(zip(keys, row)) for row in rows]
+    
+    def is_imported(self):
+        """هل استُوردت ملفات JSON القديمة من قبل (PRAGMA user_version)"""
+        with self.lock:
+            return self.connection.execute("PRAGMA user_version").fetchone()[0] >= IMPORTED_VERSION
+    
+    def import_json_files(self, high_scores_file=HIGH_SCORES_FILE,
+                          stats_file=os.path.join(SAVE_DIR, "game_stats.jsonl")):
+        """استيراد ملفات JSON الحالية (سجل الإحصائيات وأعلى النقاط) مرة واحدة
+
+        نفس الجولة قد تكون في الملفين بتاريخين مختلفين، فنتيجة من أعلى النقاط
+        تُتجاهل إذا طابقت سطراً من السجل في اللاعب والنقاط والمستوى والطعام والوقت.
+        """
+        entries = []
+        logged = {}
+        
+        if os.path.exists(stats_file):
+            with open(stats_file, 'r') as f:
+                for line in f:
+                    try:
+                        stats = json.loads(line)
+                    except ValueError:
+                        continue
+                    if 'score' in stats and 'date' in stats:
+                        stats.setdefault('player', stats.get('player_name', 'Player'))
+                        entries.append(stats)
+                        key = run_key(stats)
+                        logged[key] = logged.get(key, 0) + 1
+        
+        if os.path.exists(high_scores_file):
+            try:
+                with open(high_scores_file, 'r') as f:
+                    high_scores = json.load(f)
+            except ValueError:
+                high_scores = []
+            for entry in high_scores:
+                key = run_key(entry)
+                if logged.get(key):
+                    logged[key] -= 1
+                else:
+                    entries.append(entry)
+        
+        # كل الصفوف في معاملة واحدة
+        imported = 0
+        with self.lock:
+            for entry in entries:
+                if 'score' in entry and 'date' in entry and self.insert_run(entry).rowcount:
+                    imported += 1
+            self.connection.execute(f"PRAGMA user_version = {IMPORTED_VERSION}")
+            self.connection.commit()
+        return imported
+    
+    def backup_to(self, path):
+        """لقطة متسقة من القاعدة في ملف آخر عبر Connection.backup (بدون نسخ الملف الخام)"""
+        with self.lock:
+            target = sqlite3.connect(path)
+            try:
+                self.connection.backup(target)
+            finally:
+                target.close()
+    
+    def restore_from(self, path):
+        """استبدال محتوى القاعدة المفتوحة بلقطة من backup_to ثم إعادة بناء شجرة الترتيب"""
+        with self.lock:
+            source = sqlite3.connect(path)
+            try:
+                source.backup(self.connection)
+            finally:
+                source.close()
+            self.histogram = ScoreHistogram(self.load_score_counts())
+    
+    def close(self):
+        """إغلاق قاعدة البيانات"""
+        with self.lock:
+            self.connection.close()
+
+_leaderboard = None
+_leaderboard_lock = threading.Lock()
+
+def get_leaderboard():
+    """لوحة المتصدرين المشتركة، أو None إذا كانت معطلة أو sqlite3 غير متوفر"""
+    global _leaderboard
+    if not LEADERBOARD_ENABLED or sqlite3 is None:
+        return None
+    with _leaderboard_lock:
+        if _leaderboard is None:
+            _leaderboard = Leaderboard(LEADERBOARD_DB)
+            if not _leaderboard.is_imported():
+                _leaderboard.import_json_files()
+        return _leaderboard
\ No newline at end of file
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 اختبار الحمل لخادم اللعب الجماعي: مئات العملاء بدون رسوم على localhost
+
+كل عميل ينضم لمباراة، يبني اللوحة من الحالة الكاملة ثم يطبق الفروقات، ويرسل انعطافات بسيطة.
+الحمل يزداد على مراحل، وفي كل مرحلة تُقارن إحصائيات الخادم (زمن الخطوة والخطوات المتأخرة)
+بما وصل للعملاء، لمعرفة أكبر عدد مباريات يحتفظ به الخادم بمعدل الخطوات المطلوب.
+
+الاستخدام:
+    python load_test.py --spawn-server --clients 40 120 240 400 --duration 10
+    python load_test.py --port 8765 --clients 200       # خادم يعمل مسبقاً
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import numpy as np
+from config import *
+from net_protocol import ClientView, encode_message, read_message
+
+DEFAULT_CLIENTS = [40, 120, 240, 400]
+DEFAULT_DURATION = 10.0       # ثواني القياس لكل مرحلة
+DEFAULT_WARMUP = 2.0          # ثواني بعد فتح الاتصالات قبل القياس
+CONNECT_BATCH = 50            # اتصالات تُفتح معاً في كل دفعة
+LATE_TOLERANCE = 0.01         # نسبة الخطوات المتأخرة المقبولة
+DELIVERY_TOLERANCE = 0.95     # أقل نسبة فروقات مستلمة من المتوقع
+
+TURNS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+class LoadStats:
+    """عدادات كل العملاء لنافذة القياس الحالية"""
+    def __init__(self):
+        self.connected = 0
+        self.errors = 0
+        self.reset()
+
+    def reset(self):
+        """بداية نافذة قياس جديدة"""
+        self.deltas = 0
+        self.starts = 0
+        self.missed_ticks = 0
+        self.inputs_sent = 0
+        self.gaps = []
+        self.started_at = time.perf_counter()
+
+def choose_turn(view, snake_id, previous_head, rng, turn_chance):
+    """انعطاف بسيط: تفادي الاصطدام المباشر، وانعطاف عشوائي أحياناً"""
+    head = view.heads.get(snake_id)
+    if head is None or previous_head is None:
+        return None
+    direction = (head[0] - previous_head[0], head[1] - previous_head[1])
+
+    def is_free(turn):
+        x, y = head[0] + turn[0], head[1] + turn[1]
+        return (0 <= x < view.width and 0 <= y < view.height
+                and view.occupancy[y * view.width + x] == 0)
+
+    if is_free(direction) and rng.random() >= turn_chance:
+        return None
+    options = [turn for turn in TURNS
+               if turn != direction and turn != (-direction[0], -direction[1]) and is_free(turn)]
+    return rng.choice(options) if options else None
+
+async def run_client(host, port, stats, rng, turn_chance, stop):
+    """عميل واحد: join ثم قراءة الرسائل وتطبيقها حتى الإيقاف"""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError as e:
+        stats.errors += 1
+        print(f"Error connecting client: {e}")
+        return
+    stats.connected += 1
+    writer.write(encode_message({'type': 'join'}))
+
+    view = None
+    snake_id = None
+    previous_head = None
+    last_delta = None
+    try:
+        while not stop.is_set():
+            message = await read_message(reader)
+            if message is None:
+                break
+            now = time.perf_counter()
+
+            if message['type'] == 'start':
+                view = ClientView(message['state'])
+                snake_id = message['snake_id']
+                previous_head = view.heads.get(snake_id)
+                last_delta = None
+                stats.starts += 1
+            elif message['type'] == 'delta' and view is not None:
+                stats.missed_ticks += max(0, view.apply(message))
+                stats.deltas += 1
+                if last_delta is not None:
+                    stats.gaps.append(now - last_delta)
+                last_delta = now
+
+                turn = choose_turn(view, snake_id, previous_head, rng, turn_chance)
+                previous_head = view.heads.get(snake_id)
+                if turn:
+                    writer.write(encode_message({'type': 'input', 'dir': list(turn)}))
+                    stats.inputs_sent += 1
+    except (ConnectionError, asyncio.IncompleteReadError):
+        stats.errors += 1
+    finally:
+        stats.connected -= 1
+        writer.close()
+
+async def request_stats(host, port):
+    """إحصائيات الخادم عبر اتصال منفصل"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(encode_message({'type': 'stats'}))
+        message = await read_message(reader)
+        return message['stats']
+    finally:
+        writer.close()
+
+async def run_load_test(host, port, client_steps, duration, warmup, turn_chance, seed, match_size):
+    """زيادة العملاء على مراحل وقياس كل مرحلة"""
+    stats = LoadStats()
+    stop = asyncio.Event()
+    rng = random.Random(seed)
+    tasks = []
+    results = []
+    try:
+        for target in client_steps:
+            # فتح الاتصالات الجديدة على دفعات
+            while len(tasks) < target:
+                batch = min(CONNECT_BATCH, target - len(tasks))
+                for _ in range(batch):
+                    client_rng = random.Random(rng.getrandbits(32))
+                    tasks.append(asyncio.create_task(
+                        run_client(host, port, stats, client_rng, turn_chance, stop)))
+                await asyncio.sleep(0.05)
+            await asyncio.sleep(warmup)
+
+            # نافذة القياس
+            before = await request_stats(host, port)
+            stats.reset()
+            await asyncio.sleep(duration)
+            after = await request_stats(host, port)
+            elapsed = time.perf_counter() - stats.started_at
+
+            ticks = after['ticks'] - before['ticks']
+            late = after['late_ticks'] - before['late_ticks']
+            skipped = after['skipped_ticks'] - before['skipped_ticks']
+            playing = after['running_matches'] * match_size
+            expected = playing * after['tick_rate'] * elapsed
+            gaps_ms = np.array(stats.gaps) * 1000.0 if stats.gaps else np.zeros(1)
+            result = {
+                'clients': target,
+                'connected': stats.connected,
+                'matches': after['running_matches'],
+                'server_tick_rate': ticks / elapsed,
+                'tick_mean_ms': after['tick_mean_ms'],
+                'tick_p95_ms': after['tick_p95_ms'],
+                'late_ratio': (late + skipped) / max(ticks + skipped, 1),
+                'delivery': stats.deltas / expected if expected else 0.0,
+                'gap_p95_ms': float(np.percentile(gaps_ms, 95)),
+                'missed_ticks': stats.missed_ticks,
+                'server_kib_s': (after['bytes_sent'] - before['bytes_sent']) / elapsed / 1024,
+                'slow_clients': after['slow_clients'],
+                'errors': stats.errors,
+            }
+            result['holds'] = (result['late_ratio'] <= LATE_TOLERANCE
+                               and result['delivery'] >= DELIVERY_TOLERANCE)
+            results.append(result)
+            print(f"{'✅' if result['holds'] else '❌'} {target:>5} clients {result['matches']:>4} matches | "
+                  f"server {result['server_tick_rate']:5.1f} Hz tick {result['tick_mean_ms']:6.2f} ms "
+                  f"(p95 {result['tick_p95_ms']:6.2f}) late {result['late_ratio'] * 100:5.1f}% | "
+                  f"delivered {result['delivery'] * 100:5.1f}% gap p95 {result['gap_p95_ms']:6.1f} ms | "
+                  f"{result['server_kib_s']:7.1f} KiB/s", flush=True)
+    finally:
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return results
+
+def spawn_server(host, tick_rate, match_size):
+    """تشغيل الخادم في عملية منفصلة على منفذ حر وقراءة المنفذ من أول سطر"""
+    process = subprocess.Popen(
+        [sys.executable, '-u', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game_server.py'),
+         '--host', host, '--port', '0',
+         '--tick-rate', str(tick_rate), '--match-size', str(match_size), '--stats-interval', '3600'],
+        stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if line.startswith('🌐 Serving on'):
+            port = int(line.split()[3].rsplit(':', 1)[1])
+            return process, port
+    raise RuntimeError("game server exited before listening")
+
+def main(argv=None):
+    """واجهة سطر الأوامر"""
+    parser = argparse.ArgumentParser(description="Headless load test for game_server.py")
+    parser.add_argument('--host', default=NET_HOST)
+    parser.add_argument('--port', type=int, default=NET_PORT)
+    parser.add_argument('--spawn-server', action='store_true',
+                        help="start game_server.py in a separate process on a free port")
+    parser.add_argument('--clients', type=int, nargs='+', default=DEFAULT_CLIENTS,
+                        help="client counts for each load step")
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION)
+    parser.add_argument('--warmup', type=float, default=DEFAULT_WARMUP)
+    parser.add_argument('--tick-rate', type=int, default=NET_TICK_RATE)
+    parser.add_argument('--match-size', type=int, default=NET_MATCH_SIZE)
+    parser.add_argument('--turn-chance', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    process = None
+    port = args.port
+    if args.spawn_server:
+        process, port = spawn_server(args.host, args.tick_rate, args.match_size)
+    print(f"🧪 Load testing {args.host}:{port} ({args.match_size} players per match, "
+          f"{args.tick_rate} Hz)", flush=True)
+
+    try:
+        results = asyncio.run(run_load_test(args.host, port, sorted(args.clients), args.duration,
+                                            args.warmup, args.turn_chance, args.seed,
+                                            args.match_size))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    held = [result['matches'] for result in results if result['holds']]
+    print("=" * 50)
+    if held:
+        print(f"🏁 Held {max(held)} concurrent matches at {args.tick_rate} Hz in one server process")
+    else:
+        print(f"🏁 The server did not hold {args.tick_rate} Hz at any tested load")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
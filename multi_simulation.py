@@ -0,0 +1,335 @@
+"""
+👥 قواعد لعبة الشبكة لعدة ثعابين (2-8) على لوحة واحدة بدون رسوم
+"""
+
+from collections import deque
+from random_streams import RandomStreams
+from config import *
+
+# قيم خاصة في شبكة الإشغال (أرقام الثعابين من 1 إلى MULTI_MAX_SNAKES)
+FREE = 0
+WALL = 255
+
+class MultiSnake:
+    """ثعبان واحد في اللعبة المشتركة: الجسم من الرأس للذيل مع النقاط وسبب الموت"""
+    def __init__(self, snake_id, body, direction):
+        self.snake_id = snake_id
+        self.body = deque(body)
+        self.direction = direction
+        self.alive = True
+        self.score = 0
+        self.kills = 0
+        self.death_cause = None
+        self.death_tick = None
+        self.killed_by = None
+
+    @property
+    def head(self):
+        return self.body[0]
+
+    @property
+    def length(self):
+        return len(self.body)
+
+class MultiSnakeSimulation:
+    """عدة ثعابين تتحرك في نفس اللحظة على شبكة إشغال مشتركة
+
+    occupancy مصفوفة بايتات بحجم اللوحة: 0 حرة، رقم الثعبان لخلايا جسمه، 255 للجدران.
+    كل فحوص الاصطدام بحث O(1) في الخلية، فتكلفة الخطوة تتبع عدد الثعابين لا مجموع أطوالها.
+
+    الحركة متزامنة وحتمية (الترتيب لا يؤثر): كل القرارات تُبنى على لوحة بداية الخطوة،
+    والذيل الذي سيتحرك هذه الخطوة يُعتبر حراً.
+    - رأسان في نفس الخلية، أو رأسان يتبادلان مكانيهما: يموت الاثنان ('head')
+    - رأس في جسم ثعبان آخر: 'body' (تُحسب قتلة لصاحب الجسم)، وفي جسمه نفسه: 'self'
+    - خارج اللوحة أو في جدار الساحة: 'wall'
+    """
+    def __init__(self, grid_width, grid_height, num_snakes=MULTI_SNAKES, seed=None,
+                 food_count=None, arena=None):
+        if not MULTI_MIN_SNAKES <= num_snakes <= MULTI_MAX_SNAKES:
+            raise ValueError(f"num_snakes must be between {MULTI_MIN_SNAKES} and {MULTI_MAX_SNAKES}")
+        self.arena = arena
+        if arena is not None:
+            grid_width, grid_height = arena.width, arena.height
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.num_snakes = num_snakes
+        self.food_count = food_count or num_snakes
+        self.occupancy = bytearray(grid_width * grid_height)
+        # خلايا الشبكة التي تغيرت في آخر خطوة {الفهرس: القيمة الجديدة} (لإرسال الفروقات فقط)
+        self.changes = {}
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """بدء جولة جديدة بنفس شبكة الإشغال"""
+        self.streams = RandomStreams(seed)
+        self.seed = self.streams.seed
+        self.rng = self.streams.food
+
+        # الشبكة: جدران الساحة فقط
+        occupancy = self.occupancy
+        occupancy[:] = bytes(len(occupancy))
+        if self.arena is not None:
+            for x, y in self.arena.blocked_cells:
+                occupancy[y * self.grid_width + x] = WALL
+
+        # الثعابين في أماكنها الابتدائية
+        self.snakes = []
+        for snake_id, (body, direction) in enumerate(self.get_spawn_layout(), start=1):
+            snake = MultiSnake(snake_id, body, direction)
+            for x, y in body:
+                occupancy[y * self.grid_width + x] = snake_id
+            self.snakes.append(snake)
+
+        # الطعام
+        self.foods = set()
+        for _ in range(self.food_count):
+            self.add_food()
+
+        # الحالة
+        self.changes.clear()
+        self.speed = MULTI_SPEED
+        self.tick = 0
+        self.game_over = False
+        self.winner = None
+
+    def get_spawn_layout(self):
+        """أماكن بداية متماثلة: نصف الثعابين على اليسار باتجاه اليمين والنصف الآخر بالعكس"""
+        length = MULTI_START_LENGTH
+        rows = (self.num_snakes + 1) // 2
+        layout = []
+        for index in range(self.num_snakes):
+            y = (index // 2 + 1) * self.grid_height // (rows + 1)
+            if index % 2 == 0:
+                head_x, direction = length + 1, (1, 0)
+            else:
+                head_x, direction = self.grid_width - length - 2, (-1, 0)
+            body = [(head_x - direction[0] * i, y) for i in range(length)]
+            layout.append((self.find_free_spawn(body), direction))
+        return layout
+
+    def find_free_spawn(self, body):
+        """إزاحة جسم البداية عمودياً حتى لا يقع على جدار أو ثعبان آخر"""
+        width = self.grid_width
+        for shift in range(self.grid_height):
+            for offset in (shift, -shift):
+                cells = [(x, y + offset) for x, y in body]
+                if all(0 <= y < self.grid_height and self.occupancy[y * width + x] == FREE
+                       for x, y in cells):
+                    return cells
+        raise ValueError("no free spawn row for snake")
+
+    def add_food(self):
+        """طعام جديد في خلية حرة (None إذا امتلأت اللوحة)"""
+        width = self.grid_width
+        occupancy = self.occupancy
+        foods = self.foods
+        # الساحة تحدد الخلايا الصالحة مسبقاً، وإلا فكل اللوحة
+        cells = self.arena.food_cell_list if self.arena is not None else None
+
+        food = None
+        for _ in range(100):
+            if cells is not None:
+                cell = cells[self.rng.randrange(len(cells))] if cells else None
+            else:
+                cell = (self.rng.randrange(width), self.rng.randrange(self.grid_height))
+            if cell is not None and occupancy[cell[1] * width + cell[0]] == FREE and cell not in foods:
+                food = cell
+                break
+        else:
+            # لوحة شبه ممتلئة: الاختيار من الخلايا الحرة مباشرة
+            if cells is None:
+                cells = [(index % width, index // width) for index in range(len(occupancy))]
+            free_cells = [cell for cell in cells
+                          if occupancy[cell[1] * width + cell[0]] == FREE and cell not in foods]
+            food = self.rng.choice(free_cells) if free_cells else None
+
+        if food is not None:
+            foods.add(food)
+        return food
+
+    def get_snake(self, snake_id):
+        """الثعبان برقمه (الأرقام تبدأ من 1)"""
+        return self.snakes[snake_id - 1]
+
+    def get_alive_snakes(self):
+        """الثعابين الحية"""
+        return [snake for snake in self.snakes if snake.alive]
+
+    def cell_owner(self, cell):
+        """رقم الثعبان في الخلية، أو 0 إن كانت حرة، أو 255 لجدار"""
+        x, y = cell
+        if not (0 <= x < self.grid_width and 0 <= y < self.grid_height):
+            return WALL
+        return self.occupancy[y * self.grid_width + x]
+
+    def step(self, directions=None):
+        """خطوة متزامنة لكل الثعابين؛ directions قاموس {رقم الثعبان: اتجاه}
+
+        يرجع قاموس الأحداث {رقم الثعبان: 'ate' أو 'wall' أو 'self' أو 'body' أو 'head'}.
+        """
+        if self.game_over:
+            return {}
+        directions = directions or {}
+        width = self.grid_width
+        height = self.grid_height
+        occupancy = self.occupancy
+        foods = self.foods
+        changes = self.changes
+        changes.clear()
+        self.tick += 1
+        alive = self.get_alive_snakes()
+
+        # 1) الاتجاهات والرؤوس الجديدة (منع الدوران المباشر للخلف)
+        moves = {}
+        heads = {}
+        for snake in alive:
+            direction = directions.get(snake.snake_id)
+            if direction and direction != (-snake.direction[0], -snake.direction[1]):
+                snake.direction = direction
+            head_x, head_y = snake.body[0]
+            new_head = (head_x + snake.direction[0], head_y + snake.direction[1])
+            moves[snake.snake_id] = new_head
+            heads.setdefault(new_head, []).append(snake.snake_id)
+
+        # 2) الذيول التي تتحرر هذه الخطوة (الثعبان الذي يأكل يحتفظ بذيله)
+        vacating = set()
+        for snake in alive:
+            if moves[snake.snake_id] not in foods:
+                tail = snake.body[-1]
+                vacating.add(tail[1] * width + tail[0])
+
+        # 3) الاصطدامات على لوحة بداية الخطوة
+        events = {}
+        for snake in alive:
+            snake_id = snake.snake_id
+            new_head = moves[snake_id]
+            x, y = new_head
+            if not (0 <= x < width and 0 <= y < height):
+                events[snake_id] = 'wall'
+                continue
+
+            if len(heads[new_head]) > 1:
+                events[snake_id] = 'head'
+                continue
+
+            index = y * width + x
+            owner = occupancy[index]
+            if owner == WALL:
+                events[snake_id] = 'wall'
+            elif owner != FREE:
+                if owner != snake_id and moves.get(owner) == snake.body[0] \
+                        and self.get_snake(owner).body[0] == new_head:
+                    # تبادل الرأسين
+                    events[snake_id] = 'head'
+                elif index in vacating:
+                    pass
+                elif owner == snake_id:
+                    events[snake_id] = 'self'
+                else:
+                    events[snake_id] = 'body'
+                    snake.killed_by = owner
+
+        # 4) إزالة الموتى ثم تحريك الأحياء: الذيول أولاً حتى يدخل رأس آخر مكانها
+        for snake in alive:
+            if snake.snake_id in events:
+                self.kill(snake, events[snake.snake_id])
+
+        eaten = []
+        survivors = [snake for snake in alive if snake.alive]
+        for snake in survivors:
+            new_head = moves[snake.snake_id]
+            if new_head in foods:
+                eaten.append(new_head)
+                snake.score += 10
+                events[snake.snake_id] = 'ate'
+            else:
+                tail_x, tail_y = snake.body.pop()
+                occupancy[tail_y * width + tail_x] = FREE
+                changes[tail_y * width + tail_x] = FREE
+
+        for snake in survivors:
+            new_head = moves[snake.snake_id]
+            snake.body.appendleft(new_head)
+            index = new_head[1] * width + new_head[0]
+            occupancy[index] = snake.snake_id
+            changes[index] = snake.snake_id
+
+        for food in eaten:
+            foods.discard(food)
+            self.add_food()
+
+        # 5) نهاية الجولة: ثعبان واحد أو لا أحد
+        if len(survivors) <= 1 or not foods:
+            self.end(survivors)
+        return events
+
+    def kill(self, snake, cause):
+        """موت ثعبان: تحرير خلاياه وتسجيل القاتل"""
+        width = self.grid_width
+        occupancy = self.occupancy
+        for x, y in snake.body:
+            index = y * width + x
+            if occupancy[index] == snake.snake_id:
+                occupancy[index] = FREE
+                self.changes[index] = FREE
+        snake.alive = False
+        snake.death_cause = cause
+        snake.death_tick = self.tick
+        if snake.killed_by:
+            self.get_snake(snake.killed_by).kills += 1
+
+    def end(self, survivors):
+        """إنهاء الجولة؛ الفائز آخر ثعبان حي، وإلا صاحب أعلى نقاط ثم الأطول بقاءً (None للتعادل)"""
+        self.game_over = True
+        if len(survivors) == 1:
+            self.winner = survivors[0].snake_id
+            return
+        ranking = sorted(((snake.score, snake.death_tick or self.tick), snake.snake_id)
+                         for snake in self.snakes)
+        if len(ranking) > 1 and ranking[-1][0] == ranking[-2][0]:
+            self.winner = None
+        else:
+            self.winner = ranking[-1][1]
+
+    def get_scores(self):
+        """نقاط كل ثعبان {رقم: نقاط}"""
+        return {snake.snake_id: snake.score for snake in self.snakes}
+
+    def get_state(self):
+        """لقطة كاملة للحالة (قابلة للتحويل لـ JSON)"""
+        return {
+            'width': self.grid_width,
+            'height': self.grid_height,
+            'tick': self.tick,
+            'seed': self.seed,
+            'game_over': self.game_over,
+            'winner': self.winner,
+            'foods': sorted(list(food) for food in self.foods),
+            'snakes': [{
+                'id': snake.snake_id,
+                'body': [list(cell) for cell in snake.body],
+                'direction': list(snake.direction),
+                'alive': snake.alive,
+                'score': snake.score,
+                'kills': snake.kills,
+                'death_cause': snake.death_cause,
+            } for snake in self.snakes],
+        }
+
+def plan_bot_direction(sim, snake, autopilot):
+    """اتجاه بوت: الطيار الآلي نحو أقرب طعام مع اعتبار الثعابين الأخرى وخلايا رؤوسها التالية عوائق"""
+    head_x, head_y = snake.body[0]
+    food = min(sim.foods, key=lambda cell: abs(cell[0] - head_x) + abs(cell[1] - head_y), default=None)
+
+    # الأجسام والجدران يقرؤها الطيار من sim.occupancy؛ القائمة لخلايا الرؤوس التالية فقط
+    obstacles = []
+    for other in sim.snakes:
+        if other is snake or not other.alive:
+            continue
+        other_x, other_y = other.body[0]
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            cell = (other_x + dx, other_y + dy)
+            if sim.cell_owner(cell) == FREE:
+                obstacles.append(cell)
+    return autopilot.next_direction(list(snake.body), food, obstacles, snake.direction,
+                                    sim.occupancy, snake.snake_id)
\ No newline at end of file
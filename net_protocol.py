@@ -0,0 +1,146 @@
+"""
+📡 بروتوكول اللعب عبر الشبكة - رسائل JSON بطول مسبق (4 بايت) وفروقات الحالة بين الخطوات
+"""
+
+import asyncio
+import json
+import struct
+from config import *
+
+# رأس كل رسالة: طول الحمولة (big-endian)
+HEADER = struct.Struct('>I')
+
+DIRECTIONS = {(1, 0), (-1, 0), (0, 1), (0, -1)}
+
+class ProtocolError(Exception):
+    """رسالة غير صالحة من الطرف الآخر"""
+
+# === التأطير ===
+
+def encode_message(message):
+    """رسالة كاملة جاهزة للإرسال (الرأس + JSON مضغوط المسافات)"""
+    payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    return HEADER.pack(len(payload)) + payload
+
+async def read_message(reader, max_size=NET_MAX_MESSAGE_SIZE):
+    """قراءة رسالة واحدة (None عند إغلاق الاتصال)"""
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    (size,) = HEADER.unpack(header)
+    if size > max_size:
+        raise ProtocolError(f"message of {size} bytes exceeds {max_size}")
+    try:
+        payload = await reader.readexactly(size)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    try:
+        message = json.loads(payload)
+    except ValueError as e:
+        raise ProtocolError(f"invalid JSON: {e}")
+    if not isinstance(message, dict) or 'type' not in message:
+        raise ProtocolError("message without a type")
+    return message
+
+def parse_direction(value):
+    """اتجاه صالح من رسالة إدخال، أو None"""
+    if not isinstance(value, list) or len(value) != 2:
+        return None
+    # عناصر غير قابلة للتجزئة ([[1], 0]) تكسر البحث في المجموعة
+    if not all(type(part) is int for part in value):
+        return None
+    direction = (value[0], value[1])
+    return direction if direction in DIRECTIONS else None
+
+# === فروقات الحالة ===
+
+class DeltaEncoder:
+    """يبني رسالة الفرق لكل خطوة: الخلايا المتغيرة، الرؤوس، وما تغير من نقاط وطعام وموت
+
+    يُبنى مرة واحدة لكل مباراة ويُرسل نفس البايتات لكل لاعبيها.
+    """
+    def __init__(self, sim):
+        self.sim = sim
+        self.reset()
+
+    def reset(self):
+        """بداية جولة: آخر نقاط وطعام معروفة للعملاء = الحالة الكاملة المرسلة"""
+        self.scores = {snake.snake_id: snake.score for snake in self.sim.snakes}
+        self.foods = set(self.sim.foods)
+
+    def encode(self, events):
+        """رسالة الفرق بعد sim.step() (قاموس جاهز لـ encode_message)"""
+        sim = self.sim
+        delta = {'type': 'delta', 'tick': sim.tick}
+
+        # الخلايا كقائمة مسطحة [فهرس، قيمة، فهرس، قيمة، ...]
+        cells = []
+        for index, value in sim.changes.items():
+            cells.append(index)
+            cells.append(value)
+        delta['cells'] = cells
+        delta['heads'] = {snake.snake_id: snake.body[0] for snake in sim.snakes if snake.alive}
+
+        scores = {}
+        for snake in sim.snakes:
+            if self.scores[snake.snake_id] != snake.score:
+                scores[snake.snake_id] = snake.score
+                self.scores[snake.snake_id] = snake.score
+        if scores:
+            delta['scores'] = scores
+
+        if sim.foods != self.foods:
+            delta['food_added'] = list(sim.foods - self.foods)
+            delta['food_removed'] = list(self.foods - sim.foods)
+            self.foods = set(sim.foods)
+
+        deaths = {snake_id: cause for snake_id, cause in events.items() if cause != 'ate'}
+        if deaths:
+            delta['deaths'] = deaths
+        if sim.game_over:
+            delta['winner'] = sim.winner
+        return delta
+
+class ClientView:
+    """نسخة العميل من اللوحة: تُبنى من الحالة الكاملة ثم تُحدث بالفروقات"""
+    def __init__(self, state):
+        self.width = state['width']
+        self.height = state['height']
+        self.tick = state['tick']
+        self.occupancy = bytearray(self.width * self.height)
+        self.foods = {tuple(food) for food in state['foods']}
+        self.scores = {}
+        self.heads = {}
+        for snake in state['snakes']:
+            snake_id = snake['id']
+            self.scores[snake_id] = snake['score']
+            if snake['alive']:
+                self.heads[snake_id] = tuple(snake['body'][0])
+                for x, y in snake['body']:
+                    self.occupancy[y * self.width + x] = snake_id
+        self.game_over = state['game_over']
+        self.winner = state['winner']
+
+    def apply(self, delta):
+        """تطبيق رسالة فرق؛ يرجع عدد الخطوات المفقودة قبلها (0 في الحالة الطبيعية)"""
+        missed = delta['tick'] - self.tick - 1
+        self.tick = delta['tick']
+
+        cells = delta['cells']
+        occupancy = self.occupancy
+        for i in range(0, len(cells), 2):
+            occupancy[cells[i]] = cells[i + 1]
+
+        # مفاتيح JSON نصوص دائماً
+        self.heads = {int(snake_id): tuple(head) for snake_id, head in delta['heads'].items()}
+        for snake_id, score in delta.get('scores', {}).items():
+            self.scores[int(snake_id)] = score
+        for food in delta.get('food_removed', ()):
+            self.foods.discard(tuple(food))
+        for food in delta.get('food_added', ()):
+            self.foods.add(tuple(food))
+        if 'winner' in delta:
+            self.game_over = True
+            self.winner = delta['winner']
+        return missed
\ No newline at end of file
@@ -5,6 +5,7 @@
 import pygame
 import random
 import math
+from collections import deque
 from config import *
 
 class Obstacle:
@@ -77,8 +78,8 @@ class MovingObstacle(Obstacle):
         self.speed = speed
         self.progress = 0.0
         self.direction = 1
-        self.trail = []
         self.max_trail_length = 5
+        self.trail = deque(maxlen=self.max_trail_length)
         
     def update(self, dt):
         """تحديث العائق المتحرك"""
@@ -95,10 +96,8 @@ class MovingObstacle(Obstacle):
         self.x = self.start_pos[0] + (self.end_pos[0] - self.start_pos[0]) * self.progress
         self.y = self.start_pos[1] + (self.end_pos[1] - self.start_pos[1]) * self.progress
         
-        # تحديث الأثر
+        # تحديث الأثر (deque محدود: الأقدم يسقط تلقائياً)
         self.trail.append((self.x, self.y))
-        if len(self.trail) > self.max_trail_length:
-            self.trail.pop(0)
     
     def draw(self, screen, camera):
         """رسم العائق المتحرك"""
@@ -118,16 +117,44 @@ class MovingObstacle(Obstacle):
 
 class ObstacleManager:
     """مدير العوائق"""
-    def __init__(self, grid_width, grid_height):
+    def __init__(self, grid_width, grid_height, rng=None):
         self.grid_width = grid_width
         self.grid_height = grid_height
+        self.rng = rng or random.Random()
         self.obstacles = []
         self.moving_obstacles = []
+        self.arena = None
         self.generate_obstacles()
+        
+        # جدران الحدود ثابتة في أول القائمة وتبقى بين الجولات
+        self.border_count = 2 * (grid_width + grid_height)
+    
+    def reset(self):
+        """عوائق عشوائية جديدة مع إعادة استخدام جدران الحدود"""
+        del self.obstacles[self.border_count:]
+        self.moving_obstacles.clear()
+        if self.arena is None:
+            self.generate_random_obstacles()
+    
+    def load_arena(self, arena):
+        """استبدال العوائق بعوائق الساحة (ثابتة بين الجولات)"""
+        self.clear()
+        self.arena = arena
+        for x, y in arena.blocked_cells:
+            self.obstacles.append(Obstacle(
+                x * GRID_SIZE + GRID_SIZE // 2,
+                y * GRID_SIZE + GRID_SIZE // 2,
+                arena.get_tile_type(x, y)
+            ))
+        self.border_count = len(self.obstacles)
     
     def generate_obstacles(self):
         """توليد العوائق"""
-        # جدران الحدود
+        self.generate_border_walls()
+        self.generate_random_obstacles()
+    
+    def generate_border_walls(self):
+        """جدران الحدود"""
         for x in range(self.grid_width):
             self.obstacles.append(Obstacle(
                 x * GRID_SIZE + GRID_SIZE // 2,
@@ -151,13 +178,15 @@ class ObstacleManager:
                 y * GRID_SIZE + GRID_SIZE // 2,
                 'wall'
             ))
-        
+    
+    def generate_random_obstacles(self):
+        """العوائق الداخلية والمتحركة"""
         # عوائق داخلية عشوائية
-        num_obstacles = random.randint(8, 15)
+        num_obstacles = self.rng.randint(8, 15)
         for _ in range(num_obstacles):
-            x = random.randint(2, self.grid_width - 3)
-            y = random.randint(2, self.grid_height - 3)
-            obstacle_type = random.choice(['wall', 'spike'])
+            x = self.rng.randint(2, self.grid_width - 3)
+            y = self.rng.randint(2, self.grid_height - 3)
+            obstacle_type = self.rng.choice(['wall', 'spike'])
             
             self.obstacles.append(Obstacle(
                 x * GRID_SIZE + GRID_SIZE // 2,
@@ -166,12 +195,12 @@ class ObstacleManager:
             ))
         
         # عوائق متحركة
-        num_moving = random.randint(2, 4)
+        num_moving = self.rng.randint(2, 4)
         for _ in range(num_moving):
-            start_x = random.randint(3, self.grid_width - 4)
-            start_y = random.randint(3, self.grid_height - 4)
-            end_x = start_x + random.choice([-2, 0, 2])
-            end_y = start_y + random.choice([-2, 0, 2])
+            start_x = self.rng.randint(3, self.grid_width - 4)
+            start_y = self.rng.randint(3, self.grid_height - 4)
+            end_x = start_x + self.rng.choice([-2, 0, 2])
+            end_y = start_y + self.rng.choice([-2, 0, 2])
             
             # التأكد من أن النهاية داخل الشبكة
             end_x = max(2, min(self.grid_width - 3, end_x))
@@ -182,7 +211,7 @@ class ObstacleManager:
                 start_y * GRID_SIZE + GRID_SIZE // 2,
                 end_x * GRID_SIZE + GRID_SIZE // 2,
                 end_y * GRID_SIZE + GRID_SIZE // 2,
-                speed=random.uniform(1.0, 3.0)
+                speed=self.rng.uniform(1.0, 3.0)
             )
             self.moving_obstacles.append(moving_obstacle)
     
@@ -6,47 +6,53 @@ import pygame
 import random
 import math
 from config import *
+from pools import get_pool
 
 class Particle:
     """جسيم واحد"""
-    def __init__(self, x, y, particle_type='spark', color=None, size=5, lifetime=1.0):
+    def __init__(self, x, y, particle_type='spark', color=None, size=5, lifetime=1.0, rng=None):
+        self.reset(x, y, particle_type, color, size, lifetime, rng)
+    
+    def reset(self, x, y, particle_type='spark', color=None, size=5, lifetime=1.0, rng=None):
+        """تهيئة كاملة (تُستدعى أيضاً عند إعادة الاستخدام من المجمع)"""
+        self.rng = rng or random.Random()
         self.x = x
         self.y = y
         self.particle_type = particle_type
         self.color = color or PARTICLE_COLORS.get(particle_type, (255, 255, 255))
-        self.size = random.uniform(size * 0.5, size * 1.5)
+        self.size = self.rng.uniform(size * 0.5, size * 1.5)
         self.lifetime = lifetime
         self.max_lifetime = lifetime
         self.velocity = self.get_initial_velocity()
         self.gravity = 0.1 if particle_type != 'spark' else 0.0
         self.drag = 0.98
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-5, 5)
+        self.rotation = self.rng.uniform(0, 360)
+        self.rotation_speed = self.rng.uniform(-5, 5)
         self.glow_intensity = 1.0
         
     def get_initial_velocity(self):
         """الحصول على السرعة الابتدائية"""
         if self.particle_type == 'spark':
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 8)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            speed = self.rng.uniform(2, 8)
             return [
                 math.cos(angle) * speed,
                 math.sin(angle) * speed
             ]
         elif self.particle_type == 'confetti':
             return [
-                random.uniform(-3, 3),
-                random.uniform(-5, -2)
+                self.rng.uniform(-3, 3),
+                self.rng.uniform(-5, -2)
             ]
         elif self.particle_type == 'explosion':
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(3, 15)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            speed = self.rng.uniform(3, 15)
             return [
                 math.cos(angle) * speed,
                 math.sin(angle) * speed
             ]
         else:  # default
-            return [random.uniform(-1, 1), random.uniform(-1, 1)]
+            return [self.rng.uniform(-1, 1), self.rng.uniform(-1, 1)]
     
     def update(self, dt):
         """تحديث الجسيم"""
@@ -117,17 +123,25 @@ class Particle:
 
 class ParticleSystem:
     """نظام إدارة الجسيمات"""
-    def __init__(self):
+    def __init__(self, rng=None):
         self.particles = []
         self.emitters = []
+        self.rng = rng or random.Random()
+        self.pool = get_pool('particles', Particle, PARTICLE_POOL_SIZE)
     
     def update(self, dt):
         """تحديث كل الجسيمات"""
-        # تحديث الجسيمات
-        for particle in self.particles[:]:
+        # تحديث الجسيمات مع ضغط القائمة في مكانها وإرجاع الميتة للمجمع
+        alive = 0
+        particles = self.particles
+        for particle in particles:
             particle.update(dt)
-            if not particle.is_alive():
-                self.particles.remove(particle)
+            if particle.is_alive():
+                particles[alive] = particle
+                alive += 1
+            else:
+                self.pool.release(particle)
+        del particles[alive:]
         
         # تحديث الباعثات
         for emitter in self.emitters[:]:
@@ -145,6 +159,10 @@ class ParticleSystem:
         """إضافة جسيم جديد"""
         self.particles.append(particle)
     
+    def spawn(self, x, y, particle_type='spark', color=None, size=5, lifetime=1.0):
+        """جسيم جديد من المجمع"""
+        self.particles.append(self.pool.acquire(x, y, particle_type, color, size, lifetime, self.rng))
+    
     def create_emitter(self, x, y, particle_type, color=None, count=10, 
                       interval=0.1, duration=1.0):
         """إنشاء باعث جسيمات"""
@@ -163,47 +181,41 @@ class ParticleSystem:
     def emit_from_emitter(self, emitter):
         """إصدار جسيمات من باعث"""
         for _ in range(emitter['count']):
-            particle = Particle(
+            self.spawn(
                 emitter['x'],
                 emitter['y'],
                 emitter['particle_type'],
                 emitter['color']
             )
-            self.add_particle(particle)
     
     def create_food_particles(self, x, y, food_type='normal'):
         """إنشاء جسيمات للطعام"""
         color = FOOD_COLOR if food_type == 'normal' else SPECIAL_FOOD_COLORS.get(food_type, (255, 215, 0))
         
         for _ in range(15):
-            particle = Particle(x, y, 'spark', color, size=3, lifetime=0.5)
-            self.add_particle(particle)
+            self.spawn(x, y, 'spark', color, size=3, lifetime=0.5)
     
     def create_snake_particles(self, x, y, count=5):
         """إنشاء جسيمات للثعبان"""
         for _ in range(count):
-            particle = Particle(x, y, 'spark', SNAKE_HEAD_COLOR, size=2, lifetime=0.3)
-            self.add_particle(particle)
+            self.spawn(x, y, 'spark', SNAKE_HEAD_COLOR, size=2, lifetime=0.3)
     
     def create_explosion(self, x, y, color=(255, 100, 100)):
         """إنشاء انفجار"""
         # انفجار مركزي
         for _ in range(20):
-            particle = Particle(x, y, 'explosion', color, size=5, lifetime=1.0)
-            self.add_particle(particle)
+            self.spawn(x, y, 'explosion', color, size=5, lifetime=1.0)
         
         # شرارات
         for _ in range(30):
-            particle = Particle(x, y, 'spark', color, size=3, lifetime=0.8)
-            self.add_particle(particle)
+            self.spawn(x, y, 'spark', color, size=3, lifetime=0.8)
     
     def create_level_up_effect(self, x, y):
         """إنشاء تأثير التقدم للمستوى"""
         # كونفيتي
         for _ in range(50):
-            color = random.choice(list(PARTICLE_COLORS.values()))
-            particle = Particle(x, y, 'confetti', color, size=4, lifetime=2.0)
-            self.add_particle(particle)
+            color = self.rng.choice(list(PARTICLE_COLORS.values()))
+            self.spawn(x, y, 'confetti', color, size=4, lifetime=2.0)
         
         # دائرة متوسعة
         emitter = {
@@ -225,5 +237,6 @@ class ParticleSystem:
     
     def clear(self):
         """مسح كل الجسيمات"""
+        self.pool.release_all(self.particles)
         self.particles.clear()
         self.emitters.clear()
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+🗄️ كاتب الحفظ في الخلفية (ذري، مع دمج الكتابات المكررة)
+"""
+
+import atexit
+import os
+import threading
+from collections import deque
+
+# قيمة معلقة لملف سيُحذف (get_pending يرجعها بدل None حتى لا يُقرأ الملف القديم من القرص)
+REMOVED = object()
+
+def atomic_write(path, data):
+    """كتابة ذرية: ملف مؤقت ثم os.replace"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+class PersistenceWriter:
+    """طابور كتابة في خيط خلفي حتى لا تنتظر حلقة اللعبة القرص"""
+    def __init__(self):
+        self.pending = {}      # المفتاح -> المهمة الأحدث
+        self.values = {}       # المفتاح -> القيمة التي ستكتبها (حتى تنتهي كتابتها)
+        self.order = deque()   # ترتيب المفاتيح
+        self.in_flight = 0
+        self.condition = threading.Condition()
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="persistence-writer", daemon=True)
+        self.thread.start()
+    
+    def submit(self, key, task, value=None):
+        """إضافة مهمة؛ المهام بنفس المفتاح تُدمج وتبقى الأحدث فقط
+
+        value (اختياري): ما ستكتبه المهمة، ليقرأه get_pending قبل أن يصل للقرص.
+        """
+        with self.condition:
+            if key is None:
+                key = object()  # مهمة غير قابلة للدمج
+            if key not in self.pending:
+                self.order.append(key)
+            self.pending[key] = task
+            if value is None:
+                self.values.pop(key, None)
+            else:
+                self.values[key] = value
+            self.condition.notify_all()
+    
+    def get_pending(self, key, default=None):
+        """القيمة المعلقة أو قيد الكتابة لمفتاح (REMOVED للحذف)، بدون انتظار الخيط"""
+        with self.condition:
+            return self.values.get(key, default)
+    
+    def write_file(self, path, serialize, value=None):
+        """كتابة ملف كاملاً؛ التسلسل يتم في خيط الكتابة"""
+        self.submit(path, lambda: atomic_write(path, serialize()), value)
+    
+    def remove_file(self, path):
+        """حذف ملف بالترتيب مع الكتابات المعلقة عليه"""
+        def remove():
+            if os.path.exists(path):
+                os.remove(path)
+        self.submit(path, remove, REMOVED)
+    
+    def run(self):
+        """حلقة خيط الكتابة"""
+        while True:
+            with self.condition:
+                while self.running and not self.order:
+                    self.condition.wait()
+                if not self.order:
+                    return
+                key = self.order.popleft()
+                task = self.pending.pop(key)
+                self.in_flight += 1
+            
+            try:
+                task()
+            except Exception as e:
+                print(f"Error in persistence writer: {e}")
+            finally:
+                with self.condition:
+                    self.in_flight -= 1
+                    # القيمة وصلت للقرص، إلا إذا أُضيفت مهمة أحدث بنفس المفتاح
+                    if key not in self.pending:
+                        self.values.pop(key, None)
+                    self.condition.notify_all()
+    
+    def flush(self, timeout=None):
+        """الانتظار حتى تُكتب كل المهام المعلقة"""
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.order and self.in_flight == 0, timeout)
+    
+    def shutdown(self, timeout=5.0):
+        """تفريغ الطابور وإيقاف الخيط (عند الخروج)"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join(timeout)
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_persistence_writer():
+    """الحصول على كاتب الحفظ المشترك"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = PersistenceWriter()
+            atexit.register(_writer.shutdown)
+        return _writer
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+♻️ مجمعات الكائنات - إعادة استخدام الكائنات قصيرة العمر بدلاً من إنشائها في أكثر الإطارات ازدحاماً
+"""
+
+from config import *
+
+class ObjectPool:
+    """قائمة حرة محدودة الحجم لنوع واحد
+
+    acquire() تمرر نفس معاملات المُنشئ: الكائن المعاد استخدامه يُستدعى عليه reset(...)
+    بها قبل تسليمه، فلا تبقى فيه أي حالة من استخدامه السابق.
+    """
+    def __init__(self, name, factory, max_size):
+        self.name = name
+        self.factory = factory
+        self.max_size = max_size
+        self.free = []
+
+        # عدادات لتحديد الحجم المناسب
+        self.hits = 0
+        self.misses = 0
+        self.discards = 0
+        self.in_use = 0
+        self.high_water = 0
+
+    def acquire(self, *args, **kwargs):
+        """كائن جاهز: من القائمة الحرة إن وجد، وإلا كائن جديد"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.hits += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            self.misses += 1
+
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        """إرجاع كائن لم يعد مستخدماً (يُهمل إذا امتلأت القائمة)"""
+        if self.in_use > 0:
+            self.in_use -= 1
+        if len(self.free) < self.max_size:
+            self.free.append(obj)
+        else:
+            self.discards += 1
+
+    def release_all(self, objects):
+        """إرجاع مجموعة كائنات دفعة واحدة"""
+        for obj in objects:
+            self.release(obj)
+
+    def get_stats(self):
+        """إحصائيات المجمع"""
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'discards': self.discards,
+            'in_use': self.in_use,
+            'high_water': self.high_water,
+            'free': len(self.free),
+            'max_size': self.max_size,
+        }
+
+    def reset_stats(self):
+        """تصفير العدادات (القائمة الحرة تبقى)"""
+        self.hits = self.misses = self.discards = 0
+        self.high_water = self.in_use
+
+_pools = {}
+
+def get_pool(name, factory, max_size):
+    """المجمع المشترك بالاسم (يُنشأ عند أول طلب)"""
+    if name not in _pools:
+        _pools[name] = ObjectPool(name, factory, max_size)
+    return _pools[name]
+
+def get_pool_stats():
+    """إحصائيات كل المجمعات"""
+    return {name: pool.get_stats() for name, pool in _pools.items()}
\ No newline at end of file
@@ -6,10 +6,16 @@ import pygame
 import random
 import math
 from config import *
+from pools import get_pool
 
 class PowerUp:
     """مكافأة/قدرة خاصة"""
-    def __init__(self, x, y, powerup_type='double_points'):
+    def __init__(self, x, y, powerup_type='double_points', rng=None):
+        self.reset(x, y, powerup_type, rng)
+    
+    def reset(self, x, y, powerup_type='double_points', rng=None):
+        """تهيئة كاملة (تُستدعى أيضاً عند إعادة الاستخدام من المجمع)"""
+        rng = rng or random.Random()
         self.x = x
         self.y = y
         self.powerup_type = powerup_type
@@ -17,8 +23,8 @@ class PowerUp:
         self.size = GRID_SIZE * 0.6
         self.rotation = 0
         self.float_height = 0
-        self.float_speed = random.uniform(2, 4)
-        self.float_phase = random.uniform(0, 2 * math.pi)
+        self.float_speed = rng.uniform(2, 4)
+        self.float_phase = rng.uniform(0, 2 * math.pi)
         self.lifetime = 15.0  # ثواني
         self.time_alive = 0.0
         self.active = True
@@ -106,7 +112,7 @@ class PowerUp:
             glow_radius = glow_size * (1 + i * 0.15)
             glow_alpha = int(70 * self.glow_intensity * (1 - i * 0.2))
             glow_surface = pygame.Surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*self.color, glow_alpha),
+            pygame.draw.circle(glow_surface, (*self.color[:3], glow_alpha),
                              (glow_radius, glow_radius), glow_radius)
             screen.blit(glow_surface, (screen_x - glow_radius, screen_y - glow_radius))
         
@@ -183,13 +189,16 @@ class PowerUp:
 
 class PowerUpManager:
     """مدير المكافآت"""
-    def __init__(self, grid_width, grid_height):
+    def __init__(self, grid_width, grid_height, rng=None):
         self.grid_width = grid_width
         self.grid_height = grid_height
+        self.rng = rng or random.Random()
+        self.arena = None
         self.powerups = []
         self.spawn_timer = 0
         self.spawn_interval = 20.0  # ثواني بين ظهور المكافآت
         self.active_effects = {}
+        self.pool = get_pool('powerups', PowerUp, PICKUP_POOL_SIZE)
         
     def update(self, dt, snake_positions):
         """تحديث المكافآت"""
@@ -198,6 +207,7 @@ class PowerUpManager:
             powerup.update(dt)
             if powerup.is_expired():
                 self.powerups.remove(powerup)
+                self.pool.release(powerup)
         
         # توليد مكافآت جديدة
         self.spawn_timer += dt
@@ -216,13 +226,16 @@ class PowerUpManager:
         powerup_types = ['double_points', 'invincible', 'teleport', 'ghost', 'bomb']
         weights = [0.3, 0.25, 0.15, 0.2, 0.1]  # أوزان الظهور
         
-        powerup_type = random.choices(powerup_types, weights=weights, k=1)[0]
+        powerup_type = self.rng.choices(powerup_types, weights=weights, k=1)[0]
         
         # محاولة إيجاد مكان مناسب
         attempts = 0
         while attempts < 50:
-            x = random.randint(1, self.grid_width - 2) * GRID_SIZE + GRID_SIZE // 2
-            y = random.randint(1, self.grid_height - 2) * GRID_SIZE + GRID_SIZE // 2
+            if self.arena is not None:
+                x, y = self.arena.random_world_position(self.rng)
+            else:
+                x = self.rng.randint(1, self.grid_width - 2) * GRID_SIZE + GRID_SIZE // 2
+                y = self.rng.randint(1, self.grid_height - 2) * GRID_SIZE + GRID_SIZE // 2
             
             # التأكد من أن الموقع ليس على الثعبان أو قريب منه
             valid_position = True
@@ -233,14 +246,14 @@ class PowerUpManager:
                     break
             
             if valid_position:
-                powerup = PowerUp(x, y, powerup_type)
+                powerup = self.pool.acquire(x, y, powerup_type, self.rng)
                 self.powerups.append(powerup)
                 return
             
             attempts += 1
     
     def check_collisions(self, snake_head_pos):
-        """التحقق من اصطدام الثعبان بالمكافآت"""
+        """التحقق من اصطدام الثعبان بالمكافآت (أرجع المجموع بـ release بعد استخدامه)"""
         collected = []
         
         for powerup in self.powerups[:]:
@@ -275,7 +288,17 @@ class PowerUpManager:
         for powerup in self.powerups:
             powerup.draw(screen, camera)
     
+    def release(self, powerup):
+        """إرجاع مكافأة مجموعة لمجمعها"""
+        self.pool.release(powerup)
+    
+    def reset(self):
+        """بداية جولة جديدة"""
+        self.clear()
+        self.spawn_timer = 0
+    
     def clear(self):
         """مسح المكافآت"""
+        self.pool.release_all(self.powerups)
         self.powerups.clear()
         self.active_effects.clear()
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+📊 محلل الإطارات - زمن كل مرحلة في حلقة دائرية ثابتة الحجم، مع طبقة عرض (F3) وتصدير CSV (F4)
+"""
+
+import io
+import os
+import time
+import pygame
+import numpy as np
+from datetime import datetime
+from config import *
+from persistence import get_persistence_writer
+from pools import get_pool_stats
+from input_queue import get_input_latency_tracker
+
+# المراحل بالترتيب الذي تظهر به في ملف CSV
+PROFILER_STAGES = (
+    'input', 'autopilot', 'snake', 'food', 'obstacles', 'powerups', 'score',
+    'particles', 'camera', 'collisions',
+    'draw_background', 'draw_obstacles', 'draw_food', 'draw_powerups', 'draw_snake',
+    'draw_particles', 'draw_hud', 'draw_overlay', 'draw_menu', 'profiler', 'flip',
+)
+
+GRAPH_FRAMES = 120          # عدد الإطارات المعروضة في الرسم البياني
+GRAPH_MAX_MS = 2000 / FPS   # أعلى الرسم = ضعف ميزانية الإطار
+
+class FrameProfiler:
+    """يسجل زمن كل مرحلة في كل إطار؛ lap() تنسب الزمن منذ آخر نقطة للمرحلة المعطاة"""
+    def __init__(self, stages=PROFILER_STAGES, capacity=PROFILER_HISTORY):
+        self.stages = tuple(stages)
+        self.stage_index = {name: i for i, name in enumerate(self.stages)}
+        self.capacity = capacity
+
+        # الأعمدة: المراحل ثم زمن الإطار ثم زمن الانتظار (كلها بالملي ثانية)
+        self.total_column = len(self.stages)
+        self.wait_column = len(self.stages) + 1
+        self.buffer = np.zeros((capacity, len(self.stages) + 2))
+        self.frame_numbers = np.zeros(capacity, dtype=np.int64)
+        self.index = 0
+        self.count = 0
+        self.frame_number = 0
+
+        self.row = self.buffer[0]
+        self.frame_start = None
+        self.last_lap = None
+
+        # طبقة العرض
+        self.visible = False
+        self.font = None
+
+    def begin_frame(self, wait_ms=0.0):
+        """بداية إطار جديد (بعد انتظار الساعة)"""
+        self.row = self.buffer[self.index]
+        self.row[:] = 0.0
+        self.row[self.wait_column] = wait_ms
+        self.frame_start = self.last_lap = time.perf_counter()
+
+    def lap(self, stage):
+        """نسب الزمن منذ آخر نقطة إلى المرحلة"""
+        if self.last_lap is None:
+            return
+        now = time.perf_counter()
+        self.row[self.stage_index[stage]] += (now - self.last_lap) * 1000.0
+        self.last_lap = now
+
+    def end_frame(self):
+        """إغلاق الإطار وتقديم المؤشر الدائري"""
+        if self.frame_start is None:
+            return
+        self.row[self.total_column] = (time.perf_counter() - self.frame_start) * 1000.0
+        self.frame_numbers[self.index] = self.frame_number
+        self.frame_number += 1
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frame_start = self.last_lap = None
+
+    def get_history(self):
+        """الإطارات المسجلة من الأقدم للأحدث (نسخة)"""
+        if self.count < self.capacity:
+            return self.buffer[:self.count].copy(), self.frame_numbers[:self.count].copy()
+        order = np.r_[self.index:self.capacity, 0:self.index]
+        return self.buffer[order], self.frame_numbers[order]
+
+    def get_summary(self):
+        """متوسط كل مرحلة، وزمن الإطار، وأسوأ مرحلة"""
+        history, _ = self.get_history()
+        if not len(history):
+            return None
+
+        stage_means = history[:, :len(self.stages)].mean(axis=0)
+        worst = int(stage_means.argmax())
+        totals = history[:, self.total_column]
+        return {
+            'frames': len(history),
+            'mean_ms': float(totals.mean()),
+            'p99_ms': float(np.percentile(totals, 99)),
+            'max_ms': float(totals.max()),
+            'worst_stage': self.stages[worst],
+            'worst_stage_ms': float(stage_means[worst]),
+            'stage_means': dict(zip(self.stages, stage_means.tolist())),
+        }
+
+    def toggle(self):
+        """إظهار/إخفاء الطبقة"""
+        self.visible = not self.visible
+
+    # === التصدير ===
+
+    def format_csv(self, history, frame_numbers):
+        """تحويل الحلقة إلى نص CSV"""
+        output = io.StringIO()
+        output.write(','.join(['frame', 'total_ms', 'wait_ms'] + [f'{stage}_ms' for stage in self.stages]))
+        output.write('\n')
+        stage_count = len(self.stages)
+        for frame, row in zip(frame_numbers.tolist(), history.tolist()):
+            values = [row[self.total_column], row[self.wait_column]] + row[:stage_count]
+            output.write(f"{frame}," + ','.join(f"{value:.4f}" for value in values))
+            output.write('\n')
+        return output.getvalue()
+
+    def dump_csv(self, path=None):
+        """حفظ الحلقة كملف CSV (الكتابة في خيط الخلفية)؛ يرجع المسار"""
+        if path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(PROFILE_DIR, f"profile_{timestamp}.csv")
+
+        # لقطة الآن، والتنسيق والكتابة لاحقاً حتى لا يتقطع الإطار
+        history, frame_numbers = self.get_history()
+        get_persistence_writer().write_file(path, lambda: self.format_csv(history, frame_numbers))
+        return path
+
+    # === طبقة العرض ===
+
+    def draw(self, screen):
+        """رسم الرسم البياني وأبطأ المراحل"""
+        if not self.visible:
+            return
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+
+        panel_width, panel_height = 330, 283
+        panel_x = 10
+        panel_y = screen.get_height() - panel_height - 40
+        panel = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+
+        history, _ = self.get_history()
+        recent = history[-GRAPH_FRAMES:, self.total_column]
+
+        # الرسم البياني لزمن الإطار
+        graph_height = 80
+        graph_top = 10
+        bar_width = (panel_width - 20) / GRAPH_FRAMES
+        budget_ms = 1000 / FPS
+        for i, total in enumerate(recent.tolist()):
+            height = min(graph_height, total / GRAPH_MAX_MS * graph_height)
+            color = (80, 220, 80) if total <= budget_ms else (240, 200, 60) if total <= budget_ms * 1.5 else (240, 70, 70)
+            pygame.draw.rect(panel, color,
+                             (10 + i * bar_width, graph_top + graph_height - height,
+                              max(1, bar_width - 1), height))
+
+        # خط ميزانية الإطار
+        budget_y = graph_top + graph_height - budget_ms / GRAPH_MAX_MS * graph_height
+        pygame.draw.line(panel, (200, 200, 200), (10, budget_y), (panel_width - 10, budget_y), 1)
+
+        summary = self.get_summary()
+        lines = []
+        if summary:
+            lines.append(f"frame avg {summary['mean_ms']:.2f} ms  p99 {summary['p99_ms']:.2f}  "
+                         f"max {summary['max_ms']:.2f}")
+            lines.append(f"worst stage: {summary['worst_stage']} ({summary['worst_stage_ms']:.2f} ms)")
+            top_stages = sorted(summary['stage_means'].items(), key=lambda item: -item[1])[:5]
+            for stage, mean_ms in top_stages:
+                if mean_ms > 0:
+                    lines.append(f"  {stage:<16} {mean_ms:6.3f} ms")
+        
+        # المجمعات: نسبة الإصابة وأعلى استخدام
+        pool_stats = get_pool_stats()
+        if pool_stats:
+            lines.append("pools " + "  ".join(
+                f"{name[:4]} {stats['hit_rate'] * 100:.0f}%/{stats['high_water']}"
+                for name, stats in pool_stats.items()))
+        
+        # زمن الإدخال حتى الحركة
+        latency = get_input_latency_tracker().get_summary()
+        if latency:
+            lines.append(f"input->move avg {latency['mean_ms']:.0f} ms  p95 {latency['p95_ms']:.0f}  "
+                         f"max {latency['max_ms']:.0f}")
+        lines.append("F3: hide   F4: save CSV")
+
+        y = graph_top + graph_height + 8
+        for i, line in enumerate(lines):
+            color = (255, 120, 120) if i == 1 else (220, 220, 220)
+            panel.blit(self.font.render(line, True, color), (10, y))
+            y += 18
+
+        screen.blit(panel, (panel_x, panel_y))
+
+_profiler = None
+
+def get_frame_profiler():
+    """الحصول على المحلل المشترك"""
+    global _profiler
+    if _profiler is None:
+        _profiler = FrameProfiler()
+    return _profiler
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+🎲 مولدات عشوائية مستقلة لكل نظام فرعي (بذرة واحدة لكل جولة)
+"""
+
+import random
+
+# أنظمة تؤثر على نتيجة اللعب
+GAMEPLAY_STREAMS = ('food', 'obstacles', 'powerups', 'grid')
+
+# أنظمة شكلية فقط (يمكن تخطيها في التشغيل بدون رسوم دون تغيير النتيجة)
+COSMETIC_STREAMS = ('particles', 'effects')
+
+class RandomStreams:
+    """حزمة مولدات random.Random مشتقة من بذرة الجولة، واحد لكل نظام"""
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        self.streams = {}
+        for name in GAMEPLAY_STREAMS + COSMETIC_STREAMS:
+            self.streams[name] = self.derive(name)
+
+    def derive(self, name):
+        """اشتقاق مولد مستقل من البذرة واسم النظام"""
+        # بذور النصوص تُمرر عبر SHA-512 داخل random.Random، فالنتيجة ثابتة بين التشغيلات
+        return random.Random(f"{self.seed}:{name}")
+
+    def reseed(self, seed=None):
+        """بذرة جديدة لجولة جديدة مع الإبقاء على نفس كائنات المولدات (المدراء يحتفظون بمراجعها)"""
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        for name, stream in self.streams.items():
+            stream.seed(f"{seed}:{name}")
+
+    def get(self, name):
+        """الحصول على مولد نظام (ينشئه عند الطلب لأسماء جديدة)"""
+        if name not in self.streams:
+            self.streams[name] = self.derive(name)
+        return self.streams[name]
+
+    @property
+    def food(self):
+        return self.streams['food']
+
+    @property
+    def obstacles(self):
+        return self.streams['obstacles']
+
+    @property
+    def powerups(self):
+        return self.streams['powerups']
+
+    @property
+    def grid(self):
+        return self.streams['grid']
+
+    @property
+    def particles(self):
+        return self.streams['particles']
+
+    @property
+    def effects(self):
+        return self.streams['effects']
+
+    def get_state(self, names=GAMEPLAY_STREAMS):
+        """لقطة قابلة للتحويل لـ JSON لحالة المولدات المطلوبة"""
+        state = {}
+        for name in names:
+            version, internal, gauss = self.get(name).getstate()
+            state[name] = [version, list(internal), gauss]
+        return state
+
+    def set_state(self, state):
+        """استعادة لقطة من get_state"""
+        for name, (version, internal, gauss) in state.items():
+            self.get(name).setstate((version, tuple(internal), gauss))
\ No newline at end of file
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🖼️ قياس أداء الرسم بدون نافذة (مشغل فيديو SDL الوهمي)
+
+الاستخدام:
+    python render_benchmark.py --frames 300 --output render.json
+    python render_benchmark.py --scene explosions
+"""
+
+import os
+
+# الرسم على أسطح خارج الشاشة فقط
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+import pygame
+from config import *
+from tournament import percentile
+
+DEFAULT_FRAMES = 240
+WARMUP_FRAMES = 20
+FRAME_DT = 1 / 60
+
+DRAW_FUNCTIONS = ('rect', 'circle', 'line', 'lines', 'polygon', 'ellipse', 'arc', 'aaline', 'aalines')
+TRANSFORM_FUNCTIONS = ('rotate', 'scale', 'smoothscale', 'rotozoom')
+
+class DrawCallCounter:
+    """عداد استدعاءات الرسم: يغلف pygame.draw/transform ويستبدل pygame.Surface بفئة تعد blit/fill"""
+    def __init__(self):
+        self.counts = {'draw': 0, 'blit': 0, 'fill': 0, 'transform': 0, 'surfaces': 0}
+        self.originals = []
+
+    def reset(self):
+        for kind in self.counts:
+            self.counts[kind] = 0
+
+    def wrap(self, module, name, kind):
+        original = getattr(module, name, None)
+        if original is None:
+            return
+        counts = self.counts
+
+        def counted(*args, **kwargs):
+            counts[kind] += 1
+            return original(*args, **kwargs)
+
+        self.originals.append((module, name, original))
+        setattr(module, name, counted)
+
+    def __enter__(self):
+        for name in DRAW_FUNCTIONS:
+            self.wrap(pygame.draw, name, 'draw')
+        for name in TRANSFORM_FUNCTIONS:
+            self.wrap(pygame.transform, name, 'transform')
+
+        counts = self.counts
+        base_surface = pygame.Surface
+
+        class CountingSurface(base_surface):
+            """سطح يعد عمليات النسخ والتعبئة عليه"""
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                counts['surfaces'] += 1
+
+            def blit(self, *args, **kwargs):
+                counts['blit'] += 1
+                return super().blit(*args, **kwargs)
+
+            def fill(self, *args, **kwargs):
+                counts['fill'] += 1
+                return super().fill(*args, **kwargs)
+
+        self.originals.append((pygame, 'Surface', base_surface))
+        pygame.Surface = CountingSurface
+        return self
+
+    def __exit__(self, *exc):
+        for module, name, original in reversed(self.originals):
+            setattr(module, name, original)
+        self.originals.clear()
+        return False
+
+# ===== المشاهد =====
+
+def make_snake(length, grid_width, grid_height):
+    """ثعبان متعرج يملأ الشبكة صفاً بعد صف"""
+    from snake import Snake
+    cells = []
+    for y in range(1, grid_height - 1):
+        row = range(1, grid_width - 1) if y % 2 else range(grid_width - 2, 0, -1)
+        cells.extend((x, y) for x in row)
+    cells = cells[:length + 1]
+
+    head_x, head_y = cells[0]
+    snake = Snake(head_x * GRID_SIZE + GRID_SIZE // 2, head_y * GRID_SIZE + GRID_SIZE // 2)
+    snake.growth_pending = 0
+    for x, y in cells[1:]:
+        snake.add_segment(x * GRID_SIZE + GRID_SIZE // 2, y * GRID_SIZE + GRID_SIZE // 2)
+    return snake
+
+class Scene:
+    """مشهد مبرمج: setup مرة واحدة ثم frame لكل إطار"""
+    name = 'scene'
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.width, self.height = screen.get_size()
+        self.rng = random.Random(self.name)
+
+    def make_graphics(self, zoom=1.0):
+        from graphics import Graphics
+        from grid import Camera
+        graphics = Graphics(self.screen)
+        camera = Camera(self.width, self.height)
+        camera.zoom = camera.target_zoom = zoom
+        graphics.set_camera(camera)
+        return graphics, camera
+
+    def frame(self, dt):
+        pass
+
+class MenuScene(Scene):
+    """القائمة الرئيسية مع الخلفية المتحركة"""
+    name = 'menu'
+
+    def __init__(self, screen):
+        super().__init__(screen)
+        from ui import Menu
+        self.menu = Menu(self.width, self.height)
+
+    def frame(self, dt):
+        self.menu.background_phase += dt
+        self.menu.draw(self.screen)
+
+class PlayfieldScene(Scene):
+    """ساحة اللعب كاملة: شبكة، عوائق، طعام، مكافآت، ثعبان، جسيمات"""
+    name = 'playfield'
+    snake_length = 40
+    powerup_count = 2
+    zoom = 1.0
+
+    def __init__(self, screen):
+        super().__init__(screen)
+        from food import FoodManager
+        from obstacles import ObstacleManager
+        from powerups import PowerUp, PowerUpManager
+        from particles import ParticleSystem
+
+        self.graphics, self.camera = self.make_graphics(self.zoom)
+        self.snake = make_snake(self.snake_length, GRID_WIDTH, GRID_HEIGHT)
+        self.food_manager = FoodManager(GRID_WIDTH, GRID_HEIGHT, random.Random(self.rng.random()))
+        self.obstacle_manager = ObstacleManager(GRID_WIDTH, GRID_HEIGHT, random.Random(self.rng.random()))
+        self.powerup_manager = PowerUpManager(GRID_WIDTH, GRID_HEIGHT, random.Random(self.rng.random()))
+        self.particle_system = ParticleSystem(random.Random(self.rng.random()))
+
+        for _ in range(2):
+            self.food_manager.spawn_food([])
+        for _ in range(3):
+            self.food_manager.spawn_special_food([])
+
+        types = ['double_points', 'invincible', 'teleport', 'ghost', 'bomb']
+        for i in range(self.powerup_count):
+            x = self.rng.randint(1, GRID_WIDTH - 2) * GRID_SIZE + GRID_SIZE // 2
+            y = self.rng.randint(1, GRID_HEIGHT - 2) * GRID_SIZE + GRID_SIZE // 2
+            powerup = PowerUp(x, y, types[i % len(types)], self.powerup_manager.rng)
+            powerup.lifetime = float('inf')
+            self.powerup_manager.powerups.append(powerup)
+
+        # الكاميرا تتبع الرأس
+        self.camera.x = self.camera.target_x = self.snake.head.x
+        self.camera.y = self.camera.target_y = self.snake.head.y
+
+    def update(self, dt):
+        self.snake.wobble_phase += dt * 5
+        for food in self.food_manager.foods + self.food_manager.special_foods:
+            food.rotation += dt * 50
+        for powerup in self.powerup_manager.powerups:
+            powerup.update(dt)
+        self.obstacle_manager.update(dt)
+        self.particle_system.update(dt)
+
+    def draw_playfield(self):
+        self.graphics.clear_screen()
+        self.graphics.draw_grid()
+        self.obstacle_manager.draw(self.screen, self.camera)
+        self.graphics.draw_food(self.food_manager)
+        self.powerup_manager.draw(self.screen, self.camera)
+        self.graphics.draw_snake(self.snake)
+        self.particle_system.draw(self.screen)
+        self.graphics.draw_score(1234, 5678, 7, self.width)
+
+    def frame(self, dt):
+        self.update(dt)
+        self.draw_playfield()
+
+class LongSnakeScene(PlayfieldScene):
+    """ثعبان يملأ معظم اللوحة"""
+    name = 'long_snake'
+    snake_length = (GRID_WIDTH - 2) * (GRID_HEIGHT - 2) - 10
+
+class ExplosionsScene(PlayfieldScene):
+    """انفجارات متتالية (مئات الجسيمات الحية)"""
+    name = 'explosions'
+
+    def __init__(self, screen):
+        super().__init__(screen)
+        self.explosion_timer = 0
+
+    def update(self, dt):
+        super().update(dt)
+        self.explosion_timer -= dt
+        if self.explosion_timer <= 0:
+            self.explosion_timer = 0.1
+            self.particle_system.create_explosion(self.rng.uniform(0, self.width),
+                                                  self.rng.uniform(0, self.height))
+
+class PowerUpsScene(PlayfieldScene):
+    """عشرات المكافآت على الشاشة"""
+    name = 'powerups'
+    powerup_count = 80
+
+class ZoomedScene(PlayfieldScene):
+    """كاميرا مقربة (أشكال أكبر، كثير منها خارج الشاشة)"""
+    name = 'zoomed_camera'
+    snake_length = 200
+    zoom = 2.0
+
+class GameOverScene(PlayfieldScene):
+    """ساحة اللعب مع طبقة نهاية اللعبة"""
+    name = 'game_over'
+
+    def frame(self, dt):
+        self.update(dt)
+        self.draw_playfield()
+        self.graphics.draw_game_over(1234, 5678, self.width, self.height,
+                                     {'rank': 42, 'total_runs': 1000, 'percentile': 95.8})
+
+SCENES = [MenuScene, PlayfieldScene, LongSnakeScene, ExplosionsScene,
+          PowerUpsScene, ZoomedScene, GameOverScene]
+
+# ===== القياس =====
+
+def run_scene(scene_type, screen, frames=DEFAULT_FRAMES, warmup=WARMUP_FRAMES):
+    """تشغيل مشهد وإرجاع زمن كل إطار وعدد استدعاءات الرسم"""
+    with DrawCallCounter() as counter:
+        # الرسم على سطح خارج الشاشة يعد عملياته، ثم نسخه للعرض مرة واحدة
+        target = pygame.Surface(screen.get_size())
+        scene = scene_type(target)
+        for _ in range(warmup):
+            scene.frame(FRAME_DT)
+
+        frame_times = []
+        call_totals = {kind: 0 for kind in counter.counts}
+        for _ in range(frames):
+            counter.reset()
+            start = time.perf_counter()
+            scene.frame(FRAME_DT)
+            screen.blit(target, (0, 0))
+            pygame.display.flip()
+            frame_times.append((time.perf_counter() - start) * 1000)
+            for kind, count in counter.counts.items():
+                call_totals[kind] += count
+
+    ordered = sorted(frame_times)
+    return {
+        'frames': frames,
+        'ms_per_frame': {
+            'mean': round(statistics.fmean(ordered), 4),
+            'p50': round(percentile(ordered, 0.50), 4),
+            'p90': round(percentile(ordered, 0.90), 4),
+            'p99': round(percentile(ordered, 0.99), 4),
+            'max': round(ordered[-1], 4),
+        },
+        'calls_per_frame': {kind: round(total / frames, 1) for kind, total in call_totals.items()},
+    }
+
+def run_render_benchmark(scene_filter=None, frames=DEFAULT_FRAMES, report=None):
+    """تشغيل كل المشاهد على شاشة وهمية"""
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    results = {}
+    try:
+        for scene_type in SCENES:
+            if scene_filter and scene_filter not in scene_type.name:
+                continue
+            results[scene_type.name] = run_scene(scene_type, screen, frames)
+            if report:
+                report(scene_type.name, results[scene_type.name])
+    finally:
+        pygame.quit()
+
+    return {
+        'created': datetime.now().isoformat(),
+        'resolution': [WINDOW_WIDTH, WINDOW_HEIGHT],
+        'video_driver': os.environ.get('SDL_VIDEODRIVER'),
+        'pygame': pygame.version.ver,
+        'scenes': results,
+    }
+
+def main(argv=None):
+    """واجهة سطر الأوامر"""
+    parser = argparse.ArgumentParser(description="Offscreen render benchmark for scripted scenes")
+    parser.add_argument('--scene', help="only run scenes whose name contains this text")
+    parser.add_argument('--frames', type=int, default=DEFAULT_FRAMES)
+    parser.add_argument('--output', help="write results JSON here")
+    args = parser.parse_args(argv)
+
+    print(f"{'scene':<15} {'mean':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}   calls/frame")
+
+    def report(name, result):
+        times = result['ms_per_frame']
+        calls = ' '.join(f"{kind}={count:g}" for kind, count in result['calls_per_frame'].items())
+        print(f"{name:<15} {times['mean']:>8.3f} {times['p50']:>8.3f} {times['p90']:>8.3f} "
+              f"{times['p99']:>8.3f} {times['max']:>8.3f}   {calls}")
+
+    results = run_render_benchmark(args.scene, args.frames, report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""
+🎞️ تسجيل وإعادة الجولات (بذرة + تغييرات الإدخال لكل نبضة)
+
+صيغة الملف:
+    ترويسة : MAGIC, الإصدار, العرض, الارتفاع, السرعة الابتدائية, البذرة
+    ساحة   : طول (varint) + نص JSON للساحة (0 = بدون ساحة)، من الإصدار 3
+    سجلات  : نوع (بايت) + فرق النبضة (varint) + بيانات
+        INPUT    : رمز الاتجاه (بايت)
+        KEYFRAME : طول (varint) + لقطة JSON مضغوطة
+        END      : سبب النهاية (بايت)
+"""
+
+import json
+import os
+import struct
+import zlib
+from config import *
+from arenas import format_arena, parse_arena
+from simulation import SnakeSimulation
+
+MAGIC = b'SNKR'
+REPLAY_VERSION = 3
+SUPPORTED_VERSIONS = (2, 3)  # الإصدار 2 بدون ساحة
+HEADER = struct.Struct('<4sHHHHq')  # magic, version, width, height, speed, seed
+
+RECORD_INPUT = 0
+RECORD_KEYFRAME = 1
+RECORD_END = 2
+
+DIRECTION_CODES = {(1, 0): 0, (-1, 0): 1, (0, 1): 2, (0, -1): 3}
+CODE_DIRECTIONS = {code: direction for direction, code in DIRECTION_CODES.items()}
+END_CAUSES = [None, 'wall', 'self', 'full', 'quit']
+
+REPLAY_DIR = os.path.join(SAVE_DIR, "replays")
+KEYFRAME_INTERVAL = 500  # نبضات بين الإطارات المفتاحية
+
+def encode_varint(value):
+    """ترميز عدد صحيح موجب بطول متغير"""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+def decode_varint(buffer, offset):
+    """فك ترميز varint؛ يرجع (القيمة، الموقع التالي)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = buffer[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+class ReplayRecorder:
+    """يكتب الإعادة تدريجياً أثناء اللعب"""
+    def __init__(self, path, simulation, keyframe_interval=KEYFRAME_INTERVAL):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.file = open(path, 'wb')
+        self.keyframe_interval = keyframe_interval
+        self.last_tick = 0
+        self.last_direction = None
+        self.last_keyframe = 0
+        
+        self.file.write(HEADER.pack(MAGIC, REPLAY_VERSION, simulation.grid_width,
+                                    simulation.grid_height, simulation.initial_speed,
+                                    simulation.seed))
+        arena = format_arena(simulation.arena).encode('utf-8') if simulation.arena is not None else b''
+        self.file.write(encode_varint(len(arena)) + arena)
+    
+    def write_record(self, record_type, tick, payload=b''):
+        """كتابة سجل بفرق النبضة عن السجل السابق"""
+        self.file.write(bytes((record_type,)) + encode_varint(tick - self.last_tick) + payload)
+        self.last_tick = tick
+    
+    def record_tick(self, simulation, direction):
+        """يُستدعى قبل كل خطوة بالاتجاه المطلوب"""
+        if self.file is None:
+            return
+        tick = simulation.tick
+        
+        if tick - self.last_keyframe >= self.keyframe_interval:
+            state = simulation.get_state()
+            state['input_direction'] = list(self.last_direction) if self.last_direction else None
+            data = zlib.compress(json.dumps(state).encode('utf-8'))
+            self.write_record(RECORD_KEYFRAME, tick, encode_varint(len(data)) + data)
+            self.last_keyframe = tick
+        
+        if direction and direction != self.last_direction:
+            self.write_record(RECORD_INPUT, tick, bytes((DIRECTION_CODES[direction],)))
+            self.last_direction = direction
+    
+    def close(self, simulation, cause=None):
+        """إنهاء التسجيل"""
+        if self.file is None:
+            return
+        cause = cause or simulation.death_cause
+        self.write_record(RECORD_END, simulation.tick,
+                          bytes((END_CAUSES.index(cause) if cause in END_CAUSES else 0,)))
+        self.file.close()
+        self.file = None
+
+class ReplayPlayer:
+    """يعيد محاكاة الجولة بدون رسوم، مع القفز لأي نبضة عبر الإطارات المفتاحية"""
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            buffer = f.read()
+        
+        magic, version, width, height, speed, seed = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Not a supported replay file: {path}")
+        
+        self.grid_width = width
+        self.grid_height = height
+        self.initial_speed = speed
+        self.seed = seed
+        self.arena = None
+        offset = HEADER.size
+        if version >= 3:
+            length, offset = decode_varint(buffer, offset)
+            if length:
+                self.arena = parse_arena(bytes(buffer[offset:offset + length]).decode('utf-8')).compile()
+            offset += length
+        self.inputs = {}      # النبضة -> الاتجاه
+        self.keyframes = []   # (النبضة، بايتات مضغوطة)
+        self.end_tick = None
+        self.end_cause = None
+        self.parse_records(buffer, offset)
+        
+        self.simulation = None
+        self.direction = None
+    
+    def parse_records(self, buffer, offset):
+        """قراءة كل السجلات (ملف ناقص بعد انهيار يُقرأ حتى آخر سجل سليم)"""
+        tick = 0
+        try:
+            while offset < len(buffer):
+                record_type = buffer[offset]
+                delta, offset = decode_varint(buffer, offset + 1)
+                tick += delta
+                
+                if record_type == RECORD_INPUT:
+                    self.inputs[tick] = CODE_DIRECTIONS[buffer[offset]]
+                    offset += 1
+                elif record_type == RECORD_KEYFRAME:
+                    length, offset = decode_varint(buffer, offset)
+                    self.keyframes.append((tick, buffer[offset:offset + length]))
+                    offset += length
+                elif record_type == RECORD_END:
+                    self.end_tick = tick
+                    self.end_cause = END_CAUSES[buffer[offset]]
+                    break
+                else:
+                    break
+        except IndexError:
+            pass
+    
+    def start(self):
+        """البدء من أول الجولة"""
+        self.simulation = SnakeSimulation(self.grid_width, self.grid_height,
+                                          self.seed, self.initial_speed, self.arena)
+        self.direction = None
+        return self.simulation
+    
+    def step(self):
+        """خطوة واحدة من الإعادة؛ يرجع حدث المحاكاة
+
+        عند نبضة النهاية المسجلة تنتهي الإعادة بالسبب المسجل (مثل 'quit')،
+        بدل متابعة المحاكاة نحو موت لم يحدث.
+        """
+        tick = self.simulation.tick
+        if self.end_tick is not None and tick >= self.end_tick:
+            if self.simulation.game_over:
+                return None
+            return self.simulation.end(self.end_cause)
+        if tick in self.inputs:
+            self.direction = self.inputs[tick]
+        return self.simulation.step(self.direction)
+    
+    def seek(self, tick):
+        """القفز إلى نبضة معينة من أقرب إطار مفتاحي سابق"""
+        keyframe = None
+        for keyframe_tick, data in self.keyframes:
+            if keyframe_tick > tick:
+                break
+            keyframe = data
+        
+        self.start()
+        if keyframe is not None:
+            state = json.loads(zlib.decompress(keyframe))
+            self.simulation.set_state(state)
+            direction = state.get('input_direction')
+            self.direction = tuple(direction) if direction else None
+        
+        while self.simulation.tick < tick and not self.simulation.game_over:
+            self.step()
+        return self.simulation
+    
+    def run_headless(self, until_tick=None):
+        """محاكاة كاملة بأقصى سرعة"""
+        if self.simulation is None:
+            self.start()
+        while not self.simulation.game_over and (until_tick is None or self.simulation.tick < until_tick):
+            self.step()
+        return self.simulation
+
+# === ملفات الإعادة ===
+
+def list_replays(directory=REPLAY_DIR):
+    """ملفات الإعادة من الأحدث للأقدم"""
+    try:
+        paths = [os.path.join(directory, name) for name in os.listdir(directory)
+                 if name.endswith('.snr')]
+    except OSError:
+        return []
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+def get_latest_replay(directory=REPLAY_DIR):
+    """أحدث ملف إعادة أو None"""
+    replays = list_replays(directory)
+    return replays[0] if replays else None
+
+def prune_replays(directory=REPLAY_DIR, keep=REPLAY_KEEP):
+    """حذف الأقدم حتى يبقى آخر keep ملفات فقط"""
+    removed = 0
+    for path in list_replays(directory)[keep:]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError as e:
+            print(f"Error removing old replay: {e}")
+    return removed
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+📦 صيغة الحفظ الثنائية ذات الإصدارات (بديل pickle)
+
+البنية:
+    ترويسة  : MAGIC, الإصدار, عدد المقاطع, طول البيانات الوصفية
+    وصفية   : JSON للقيم البسيطة (النقاط، المستوى، معلومات الحفظ...)
+    مقاطع   : مصفوفات رقمية مضغوطة (الجسم، الطعام، المكافآت، العوائق، المؤقتات)
+"""
+
+import json
+import struct
+import numpy as np
+
+MAGIC = b'SNKSAVE\0'
+# الإصدار 1 هو ملفات pickle القديمة (save_N.pkl، 'version': '1.0' في save_info)،
+# والصيغة الثنائية تكمل الترقيم من 2
+FORMAT_VERSION = 2
+
+HEADER = struct.Struct('<8sHHI')     # magic, version, sections, meta_len
+SECTION = struct.Struct('<16s4sIIQ')  # name, dtype, rows, cols (0 = أحادي البعد), nbytes
+ALIGNMENT = 8
+
+class SaveFormatError(ValueError):
+    """ملف حفظ غير صالح أو بإصدار غير مدعوم"""
+    pass
+
+def to_array(value):
+    """تحويل قيمة إلى مصفوفة رقمية إن أمكن، وإلا None"""
+    if isinstance(value, np.ndarray):
+        array = value
+    elif isinstance(value, (list, tuple)) and value:
+        try:
+            array = np.asarray(value)
+        except ValueError:
+            return None
+    else:
+        return None
+    
+    if array.ndim not in (1, 2) or array.dtype.kind not in 'biuf':
+        return None
+    if array.dtype.kind == 'f':
+        return np.ascontiguousarray(array, dtype='<f8')
+    return np.ascontiguousarray(array, dtype='<i4')
+
+def padding(length):
+    """عدد بايتات الحشو للمحاذاة"""
+    return (-length) % ALIGNMENT
+
+def pack_game_data(game_data):
+    """تحويل بيانات اللعبة إلى بايتات بالصيغة الثنائية"""
+    meta = {}
+    sections = []
+    
+    for key, value in game_data.items():
+        array = to_array(value)
+        if array is None:
+            meta[key] = value
+        else:
+            if len(key.encode('utf-8')) > 16:
+                raise SaveFormatError(f"Section name too long: {key}")
+            sections.append((key, array))
+    
+    meta_bytes = json.dumps(meta).encode('utf-8')
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), len(meta_bytes)),
+             meta_bytes, b'\0' * padding(HEADER.size + len(meta_bytes))]
+    
+    for key, array in sections:
+        rows = array.shape[0]
+        cols = array.shape[1] if array.ndim == 2 else 0
+        data = array.tobytes()
+        parts.append(SECTION.pack(key.encode('utf-8'), array.dtype.str.encode('ascii'),
+                                  rows, cols, len(data)))
+        parts.append(data)
+        parts.append(b'\0' * padding(len(data)))
+    
+    return b''.join(parts)
+
+def read_header(buffer):
+    """قراءة الترويسة والبيانات الوصفية فقط"""
+    if len(buffer) < HEADER.size:
+        raise SaveFormatError("Truncated save header")
+    magic, version, section_count, meta_len = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise SaveFormatError("Not a snake save file")
+    if version > FORMAT_VERSION:
+        raise SaveFormatError(f"Unsupported save version: {version}")
+    
+    meta_end = HEADER.size + meta_len
+    meta = json.loads(bytes(buffer[HEADER.size:meta_end]).decode('utf-8'))
+    return meta, section_count, meta_end + padding(meta_end)
+
+def unpack_game_data(buffer):
+    """قراءة بيانات اللعبة؛ المصفوفات تُعرض مباشرة فوق المخزن (frombuffer)"""
+    game_data, section_count, offset = read_header(buffer)
+    
+    for _ in range(section_count):
+        name, dtype, rows, cols, nbytes = SECTION.unpack_from(buffer, offset)
+        offset += SECTION.size
+        
+        count = rows * cols if cols else rows
+        array = np.frombuffer(buffer, dtype=np.dtype(dtype.rstrip(b'\0').decode('ascii')), count=count, offset=offset)
+        if cols:
+            array = array.reshape(rows, cols)
+        
+        game_data[name.rstrip(b'\0').decode('utf-8')] = array
+        offset += nbytes + padding(nbytes)
+    
+    return game_data
+
+def read_save_header(path):
+    """قراءة البيانات الوصفية لملف حفظ دون قراءة المصفوفات"""
+    with open(path, 'rb') as f:
+        buffer = f.read(HEADER.size)
+        if len(buffer) == HEADER.size:
+            magic, version, section_count, meta_len = HEADER.unpack(buffer)
+            buffer += f.read(meta_len)
+    return read_header(buffer)[0]
+
+def load_save_file(path):
+    """تحميل ملف حفظ كامل بقراءة واحدة"""
+    with open(path, 'rb') as f:
+        return unpack_game_data(f.read())
\ No newline at end of file
@@ -5,19 +5,51 @@
 import json
 import os
 import pickle
+import threading
 from datetime import datetime
 from config import *
+from high_scores import (get_high_score_service, merge_score_streams,
+                         read_score_export, score_sort_key, format_score_export)
+from leaderboard import get_leaderboard
+from persistence import REMOVED, atomic_write, get_persistence_writer
+from save_format import pack_game_data, unpack_game_data, load_save_file, read_save_header
+from backup_store import BackupStore
+from replay import REPLAY_DIR
 
 class SaveManager:
     """مدير الحفظ والتحميل"""
+    STATS_COMPACT_INTERVAL = 200  # عدد الألعاب بين كل عملية ضغط للسجل
+    
     def __init__(self):
         self.save_dir = SAVE_DIR
         self.high_scores_file = os.path.join(self.save_dir, "high_scores.json")
+        self.high_scores = get_high_score_service(self.high_scores_file)
         self.settings_file = os.path.join(self.save_dir, "settings.json")
         self.game_saves_dir = os.path.join(self.save_dir, "game_saves")
+        self.slot_index_file = os.path.join(self.game_saves_dir, "slots_index.json")
+        self.stats_file = os.path.join(self.save_dir, "game_stats.jsonl")
+        self.legacy_stats_file = os.path.join(self.save_dir, "game_stats.json")
+        
+        # سجل الإحصائيات: سطر JSON لكل لعبة + فهرس مواقع لكل لاعب
+        self.stats_lock = threading.Lock()
+        self.player_stats_index = None
+        self.stats_appends = 0
+        
+        # كل الكتابات تمر عبر كاتب الخلفية
+        self.writer = get_persistence_writer()
+        self.slot_index_lock = threading.Lock()
         
         # إنشاء المجلدات إذا لم تكن موجودة
         self.create_directories()
+        self.migrate_legacy_stats()
+        
+        # مخزن النسخ الاحتياطي التزايدي
+        self.backup_store = BackupStore(os.path.join(self.save_dir, "backups"))
+        self.backup_thread = None
+        
+        # قاعدة المتصدرين مفتوحة طوال الجلسة: تُنسخ وتُستعاد عبر لقطة SQLite
+        self.leaderboard_backup_name = os.path.relpath(LEADERBOARD_DB, self.save_dir).replace(os.sep, '/')
+        self.leaderboard_snapshot_file = os.path.join(self.backup_store.backup_dir, "leaderboard.snapshot.db")
     
     def create_directories(self):
         """إنشاء مجلدات الحفظ"""
@@ -29,10 +61,6 @@ class SaveManager:
     def save_high_score(self, player_name, score, level, foods_eaten, play_time):
         """حفظ أعلى نقاط"""
         try:
-            # تحميل النقاط الحالية
-            scores = self.load_high_scores()
-            
-            # إضافة النتيجة الجديدة
             new_score = {
                 'player': player_name,
                 'score': score,
@@ -42,18 +70,7 @@ class SaveManager:
                 'date': datetime.now().isoformat()
             }
             
-            scores.append(new_score)
-            
-            # ترتيب تنازلي حسب النقاط
-            scores.sort(key=lambda x: x['score'], reverse=True)
-            
-            # حفظ أول 10 نتائج فقط
-            scores = scores[:10]
-            
-            # الحفظ في الملف
-            with open(self.high_scores_file, 'w') as f:
-                json.dump(scores, f, indent=2)
-            
+            self.high_scores.add_score(new_score)
             return True
         except Exception as e:
             print(f"Error saving high score: {e}")
@@ -61,25 +78,15 @@ class SaveManager:
     
     def load_high_scores(self):
         """تحميل أعلى النقاط"""
-        try:
-            if os.path.exists(self.high_scores_file):
-                with open(self.high_scores_file, 'r') as f:
-                    return json.load(f)
-            return []
-        except:
-            return []
+        return self.high_scores.get_scores()
     
     def get_high_score(self):
         """الحصول على أعلى نقاط"""
-        scores = self.load_high_scores()
-        if scores:
-            return scores[0]['score']
-        return 0
+        return self.high_scores.get_high_score()
     
     def get_high_scores_table(self, limit=10):
         """الحصول على جدول أعلى النقاط"""
-        scores = self.load_high_scores()
-        return scores[:limit]
+        return self.high_scores.get_scores(limit)
     
     # === إدارة الإعدادات ===
     
@@ -103,8 +110,8 @@ class SaveManager:
             # دمج مع الإعدادات الافتراضية
             merged_settings = {**default_settings, **settings}
             
-            with open(self.settings_file, 'w') as f:
-                json.dump(merged_settings, f, indent=2)
+            self.writer.write_file(self.settings_file,
+                                   lambda: json.dumps(merged_settings, indent=2), merged_settings)
             
             return True
         except Exception as e:
@@ -112,8 +119,12 @@ class SaveManager:
             return False
     
     def load_settings(self):
-        """تحميل الإعدادات"""
+        """تحميل الإعدادات (الإعدادات التي لم تُكتب بعد تُقرأ من طابور الكاتب بدل انتظاره)"""
         try:
+            pending = self.writer.get_pending(self.settings_file)
+            if pending is not None:
+                # نسخة كما لو قُرئت من الملف، حتى لا يغير المستدعي ما سيُكتب
+                return json.loads(json.dumps(pending))
             if os.path.exists(self.settings_file):
                 with open(self.settings_file, 'r') as f:
                     return json.load(f)
@@ -149,218 +160,525 @@ class SaveManager:
     
     # === حفظ/تحميل اللعبة ===
     
+    def get_save_file(self, slot):
+        """مسار ملف الحفظ الثنائي"""
+        return os.path.join(self.game_saves_dir, f"save_{slot}.sav")
+    
+    def get_legacy_save_file(self, slot):
+        """مسار ملف الحفظ القديم (pickle)"""
+        return os.path.join(self.game_saves_dir, f"save_{slot}.pkl")
+    
     def save_game(self, game_data, slot=0):
         """حفظ حالة اللعبة"""
         try:
-            save_file = os.path.join(self.game_saves_dir, f"save_{slot}.pkl")
+            save_file = self.get_save_file(slot)
             
             # إضافة معلومات الحفظ
             game_data['save_info'] = {
                 'save_date': datetime.now().isoformat(),
                 'save_slot': slot,
-                'version': '1.0'
+                'version': '2.0'
             }
             
-            with open(save_file, 'wb') as f:
-                pickle.dump(game_data, f)
+            # التسلسل والكتابة في خيط الخلفية
+            self.writer.submit(save_file, lambda: self.write_game_save(game_data, save_file, slot),
+                               game_data)
             
             return True
         except Exception as e:
             print(f"Error saving game: {e}")
             return False
     
+    def write_game_save(self, game_data, save_file, slot):
+        """كتابة ملف الحفظ وتحديث الفهرس (في خيط الكتابة)"""
+        atomic_write(save_file, pack_game_data(game_data))
+        
+        legacy_file = self.get_legacy_save_file(slot)
+        if os.path.exists(legacy_file):
+            os.remove(legacy_file)
+        
+        # تحديث فهرس الفتحات حتى لا تحتاج قائمة التحميل لفك الحفظ كاملاً
+        with self.slot_index_lock:
+            index = self.load_slot_index()
+            index[str(slot)] = self.make_slot_entry(game_data, save_file)
+            self.write_slot_index(index)
+    
     def load_game(self, slot=0):
-        """تحميل حالة اللعبة"""
+        """تحميل حالة اللعبة (الحفظ المعلق في طابور الكاتب يُقرأ من الذاكرة)"""
         try:
-            save_file = os.path.join(self.game_saves_dir, f"save_{slot}.pkl")
+            save_file = self.get_save_file(slot)
+            pending = self.writer.get_pending(save_file)
+            if pending is REMOVED:
+                return None
+            if pending is not None:
+                # نفس المصفوفات التي سيقرؤها load_save_file من الملف
+                return unpack_game_data(pack_game_data(pending))
             
             if os.path.exists(save_file):
-                with open(save_file, 'rb') as f:
-                    return pickle.load(f)
+                return load_save_file(save_file)
+            
+            if os.path.exists(self.get_legacy_save_file(slot)):
+                return self.migrate_legacy_save(slot)
             return None
         except Exception as e:
             print(f"Error loading game: {e}")
             return None
     
+    def migrate_legacy_save(self, slot):
+        """تحويل حفظ pickle قديم إلى الصيغة الثنائية (مرة واحدة، الكتابة في خيط الخلفية)"""
+        legacy_file = self.get_legacy_save_file(slot)
+        with open(legacy_file, 'rb') as f:
+            game_data = pickle.load(f)
+        
+        try:
+            loaded = unpack_game_data(pack_game_data(game_data))
+        except Exception as e:
+            # الإبقاء على الملف القديم إذا تعذر التحويل
+            print(f"Error migrating save slot {slot}: {e}")
+            return game_data
+        
+        save_file = self.get_save_file(slot)
+        self.writer.submit(save_file, lambda: self.write_game_save(game_data, save_file, slot),
+                           game_data)
+        return loaded
+    
     def get_save_slots(self):
-        """الحصول على معلومات فتحات الحفظ"""
+        """الحصول على معلومات فتحات الحفظ (مع الحفظ والحذف المعلقين في طابور الكاتب)"""
+        with self.slot_index_lock:
+            slots = self.read_save_slots()
+        
+        for i, slot in enumerate(slots):
+            pending = self.writer.get_pending(self.get_save_file(i))
+            if pending is REMOVED:
+                slots[i] = {'slot': i, 'exists': False}
+            elif pending is not None:
+                slots[i] = {
+                    'slot': i,
+                    'exists': True,
+                    'score': pending.get('score', 0),
+                    'level': pending.get('level', 1),
+                    'save_date': pending.get('save_info', {}).get('save_date', '')
+                }
+        return slots
+    
+    def read_save_slots(self):
+        """قراءة الفتحات من الفهرس وإصلاحه عند الحاجة (يُستدعى مع القفل)"""
         slots = []
+        index = self.load_slot_index()
+        index_changed = False
+        
         for i in range(5):  # 5 فتحات حفظ
-            save_file = os.path.join(self.game_saves_dir, f"save_{i}.pkl")
-            if os.path.exists(save_file):
-                try:
-                    with open(save_file, 'rb') as f:
-                        game_data = pickle.load(f)
-                    
-                    slots.append({
-                        'slot': i,
-                        'exists': True,
-                        'score': game_data.get('score', 0),
-                        'level': game_data.get('level', 1),
-                        'save_date': game_data.get('save_info', {}).get('save_date', '')
-                    })
-                except:
-                    slots.append({
-                        'slot': i,
-                        'exists': False
-                    })
-            else:
+            save_file = self.get_save_file(i)
+            if not os.path.exists(save_file):
+                save_file = self.get_legacy_save_file(i)
+            entry = index.get(str(i))
+            
+            if not os.path.exists(save_file):
+                if entry is not None:
+                    del index[str(i)]
+                    index_changed = True
+                slots.append({
+                    'slot': i,
+                    'exists': False
+                })
+                continue
+            
+            # إصلاح الفهرس إذا كان ملف الحفظ أحدث منه
+            if entry is None or os.path.getmtime(save_file) > entry.get('mtime', 0):
+                entry = self.rebuild_slot_entry(save_file)
+                if entry is None:
+                    index.pop(str(i), None)
+                else:
+                    index[str(i)] = entry
+                index_changed = True
+            
+            if entry is None:
                 slots.append({
                     'slot': i,
                     'exists': False
                 })
+            else:
+                slots.append({
+                    'slot': i,
+                    'exists': True,
+                    'score': entry.get('score', 0),
+                    'level': entry.get('level', 1),
+                    'save_date': entry.get('save_date', '')
+                })
+        
+        if index_changed:
+            self.write_slot_index(index)
         
         return slots
     
+    def make_slot_entry(self, game_data, save_file):
+        """إنشاء مدخل فهرس لفتحة حفظ"""
+        return {
+            'score': game_data.get('score', 0),
+            'level': game_data.get('level', 1),
+            'save_date': game_data.get('save_info', {}).get('save_date', ''),
+            'mtime': os.path.getmtime(save_file)
+        }
+    
+    def rebuild_slot_entry(self, save_file):
+        """إعادة بناء مدخل الفهرس من ترويسة ملف الحفظ"""
+        try:
+            if save_file.endswith('.sav'):
+                game_data = read_save_header(save_file)
+            else:
+                with open(save_file, 'rb') as f:
+                    game_data = pickle.load(f)
+            return self.make_slot_entry(game_data, save_file)
+        except:
+            return None
+    
+    def load_slot_index(self):
+        """تحميل فهرس فتحات الحفظ"""
+        try:
+            if os.path.exists(self.slot_index_file):
+                with open(self.slot_index_file, 'r') as f:
+                    return json.load(f)
+            return {}
+        except:
+            return {}
+    
+    def write_slot_index(self, index):
+        """كتابة فهرس فتحات الحفظ"""
+        try:
+            atomic_write(self.slot_index_file, json.dumps(index))
+        except Exception as e:
+            print(f"Error saving slot index: {e}")
+    
     def delete_save(self, slot=0):
         """حذف حفظ"""
         try:
-            save_file = os.path.join(self.game_saves_dir, f"save_{slot}.pkl")
-            if os.path.exists(save_file):
-                os.remove(save_file)
+            save_file = self.get_save_file(slot)
+            pending = self.writer.get_pending(save_file)
+            if pending is REMOVED:
+                return False
+            if pending is not None or os.path.exists(save_file) \
+                    or os.path.exists(self.get_legacy_save_file(slot)):
+                self.writer.submit(save_file, lambda: self.remove_game_save(save_file, slot), REMOVED)
                 return True
             return False
         except:
             return False
     
+    def remove_game_save(self, save_file, slot):
+        """حذف ملف الحفظ ومدخله في الفهرس (في خيط الكتابة)"""
+        for file in (save_file, self.get_legacy_save_file(slot)):
+            if os.path.exists(file):
+                os.remove(file)
+        
+        with self.slot_index_lock:
+            index = self.load_slot_index()
+            if index.pop(str(slot), None) is not None:
+                self.write_slot_index(index)
+    
     # === إحصائيات اللعبة ===
     
     def save_game_stats(self, stats):
-        """حفظ إحصائيات اللعبة"""
+        """حفظ إحصائيات اللعبة (إلحاق سطر واحد بالسجل)"""
         try:
-            stats_file = os.path.join(self.save_dir, "game_stats.json")
-            
-            # تحميل الإحصائيات الحالية
-            all_stats = self.load_game_stats()
-            
-            # إضافة الإحصائيات الجديدة
             stats['date'] = datetime.now().isoformat()
-            all_stats.append(stats)
+            line = (json.dumps(stats) + '\n').encode('utf-8')
+            self.writer.submit(None, lambda: self.append_game_stats(line, stats.get('player_name')))
             
-            # حفظ أول 100 إحصائية فقط
-            all_stats = all_stats[-100:]
-            
-            with open(stats_file, 'w') as f:
-                json.dump(all_stats, f, indent=2)
+            # ضغط دوري في الخلفية
+            self.stats_appends += 1
+            if self.stats_appends >= self.STATS_COMPACT_INTERVAL:
+                self.stats_appends = 0
+                self.writer.submit('stats-compaction', self.compact_game_stats)
             
             return True
         except Exception as e:
             print(f"Error saving game stats: {e}")
             return False
     
+    def append_game_stats(self, line, player_name):
+        """إلحاق سطر بالسجل وتحديث الفهرس (في خيط الكتابة)"""
+        with self.stats_lock:
+            with open(self.stats_file, 'ab+') as f:
+                offset = self.start_stats_line(f)
+                f.write(line)
+            
+            if self.player_stats_index is not None:
+                self.player_stats_index.setdefault(player_name, []).append(offset)
+    
+    def start_stats_line(self, f):
+        """موقع السطر التالي في نهاية السجل؛ يكمل سطراً ناقصاً (كتابة مقطوعة) بفاصل أولاً"""
+        offset = f.seek(0, os.SEEK_END)
+        if offset:
+            f.seek(offset - 1)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+                offset += 1
+        return offset
+    
     def load_game_stats(self):
         """تحميل إحصائيات اللعبة"""
         try:
-            stats_file = os.path.join(self.save_dir, "game_stats.json")
-            if os.path.exists(stats_file):
-                with open(stats_file, 'r') as f:
-                    return json.load(f)
-            return []
+            self.writer.flush()
+            all_stats = []
+            with self.stats_lock:
+                if not os.path.exists(self.stats_file):
+                    return []
+                with open(self.stats_file, 'rb') as f:
+                    for line in f:
+                        record = self.parse_stats_line(line)
+                        if record is not None:
+                            all_stats.append(record)
+            return all_stats
         except:
             return []
     
     def get_player_stats(self, player_name):
         """الحصول على إحصائيات لاعب معين"""
-        all_stats = self.load_game_stats()
-        player_stats = [s for s in all_stats if s.get('player_name') == player_name]
-        return player_stats
+        try:
+            self.writer.flush()
+            player_stats = []
+            with self.stats_lock:
+                if self.player_stats_index is None:
+                    self.build_player_stats_index()
+                
+                offsets = self.player_stats_index.get(player_name, [])
+                if not offsets:
+                    return []
+                
+                with open(self.stats_file, 'rb') as f:
+                    for offset in offsets:
+                        f.seek(offset)
+                        record = self.parse_stats_line(f.readline())
+                        if record is not None:
+                            player_stats.append(record)
+            return player_stats
+        except:
+            return []
+    
+    def parse_stats_line(self, line):
+        """تحليل سطر من سجل الإحصائيات (الأسطر التالفة تُتجاهل)"""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+    
+    def build_player_stats_index(self):
+        """بناء فهرس مواقع الأسطر لكل لاعب (يُستدعى مع القفل)"""
+        index = {}
+        if os.path.exists(self.stats_file):
+            with open(self.stats_file, 'rb') as f:
+                offset = 0
+                for line in f:
+                    record = self.parse_stats_line(line)
+                    if record is not None:
+                        index.setdefault(record.get('player_name'), []).append(offset)
+                    offset += len(line)
+        self.player_stats_index = index
+    
+    def compact_game_stats(self):
+        """ضغط السجل: إزالة الأسطر التالفة أو الناقصة (كل التاريخ يبقى) دون حجز القفل طوال العملية"""
+        try:
+            with self.stats_lock:
+                if not os.path.exists(self.stats_file):
+                    return
+                snapshot_size = os.path.getsize(self.stats_file)
+            
+            temp_file = self.stats_file + ".tmp"
+            with open(self.stats_file, 'rb') as src, open(temp_file, 'wb') as dst:
+                remaining = snapshot_size
+                for line in src:
+                    if remaining <= 0:
+                        break
+                    remaining -= len(line)
+                    if line.endswith(b'\n') and self.parse_stats_line(line) is not None:
+                        dst.write(line)
+            
+            with self.stats_lock:
+                # نسخ ما أُلحق أثناء الضغط ثم الاستبدال الذري
+                with open(self.stats_file, 'rb') as src, open(temp_file, 'ab') as dst:
+                    src.seek(snapshot_size)
+                    dst.write(src.read())
+                os.replace(temp_file, self.stats_file)
+                self.player_stats_index = None
+        except Exception as e:
+            print(f"Error compacting game stats: {e}")
+    
+    def migrate_legacy_stats(self):
+        """تحويل ملف الإحصائيات القديم (قائمة JSON) إلى السجل الجديد"""
+        try:
+            if not os.path.exists(self.legacy_stats_file):
+                return
+            with open(self.legacy_stats_file, 'r') as f:
+                legacy_stats = json.load(f)
+            
+            with open(self.stats_file, 'ab+') as f:
+                self.start_stats_line(f)
+                for stats in legacy_stats:
+                    f.write((json.dumps(stats) + '\n').encode('utf-8'))
+            os.remove(self.legacy_stats_file)
+        except Exception as e:
+            print(f"Error migrating game stats: {e}")
     
     # === وظائف مساعدة ===
     
-    def export_high_scores(self, filename="high_scores_export.json"):
-        """تصدير أعلى النقاط"""
+    def export_high_scores(self, filename="high_scores_export.jsonl"):
+        """تصدير أعلى النقاط (مرتبة مسبقاً، سطر لكل نتيجة)"""
         try:
             scores = self.load_high_scores()
             export_file = os.path.join(self.save_dir, filename)
             
-            with open(export_file, 'w') as f:
-                json.dump(scores, f, indent=2)
+            atomic_write(export_file, format_score_export(scores))
             
             return export_file
         except:
             return None
     
     def import_high_scores(self, filename):
-        """استيراد أعلى النقاط"""
+        """استيراد أعلى النقاط من ملف تصدير أو عدة ملفات (دمج متدفق)"""
         try:
-            import_file = os.path.join(self.save_dir, filename)
-            if os.path.exists(import_file):
-                with open(import_file, 'r') as f:
-                    imported_scores = json.load(f)
-                
-                # دمج مع النقاط الحالية
-                current_scores = self.load_high_scores()
-                all_scores = current_scores + imported_scores
-                
-                # ترتيب وتحديد الأعلى
-                all_scores.sort(key=lambda x: x['score'], reverse=True)
-                all_scores = all_scores[:10]
-                
-                # الحفظ
-                with open(self.high_scores_file, 'w') as f:
-                    json.dump(all_scores, f, indent=2)
-                
-                return True
-            return False
+            filenames = [filename] if isinstance(filename, str) else list(filename)
+            import_files = [os.path.join(self.save_dir, name) for name in filenames]
+            import_files = [path for path in import_files if os.path.exists(path)]
+            if not import_files:
+                return False
+            
+            # دمج مع النقاط الحالية
+            current_scores = sorted(self.load_high_scores(), key=score_sort_key)
+            streams = [iter(current_scores)] + [read_score_export(path) for path in import_files]
+            self.high_scores.replace_scores(merge_score_streams(streams, self.high_scores.max_scores))
+            
+            return True
         except:
             return False
     
     def clear_all_data(self):
         """مسح كل البيانات"""
         try:
+            self.writer.flush()
+            
             # مسح النقاط
-            if os.path.exists(self.high_scores_file):
-                os.remove(self.high_scores_file)
+            self.high_scores.clear()
             
             # مسح الإعدادات
             if os.path.exists(self.settings_file):
                 os.remove(self.settings_file)
             
             # مسح الحفظات
-            for file in os.listdir(self.game_saves_dir):
-                os.remove(os.path.join(self.game_saves_dir, file))
+            with self.slot_index_lock:
+                for file in os.listdir(self.game_saves_dir):
+                    os.remove(os.path.join(self.game_saves_dir, file))
             
             # مسح الإحصائيات
-            stats_file = os.path.join(self.save_dir, "game_stats.json")
-            if os.path.exists(stats_file):
-                os.remove(stats_file)
+            with self.stats_lock:
+                if os.path.exists(self.stats_file):
+                    os.remove(self.stats_file)
+                self.player_stats_index = None
             
             return True
         except:
             return False
     
-    def backup_save_data(self, backup_name):
-        """نسخ احتياطي للبيانات"""
+    def get_backup_files(self):
+        """الملفات المشمولة في النسخ الاحتياطي"""
+        files = [
+            self.high_scores_file,
+            self.settings_file,
+            self.stats_file
+        ]
+        
+        # إضافة مجلدي الحفظات والإعادات
+        for directory in (self.game_saves_dir, REPLAY_DIR):
+            for root, dirs, names in os.walk(directory):
+                for name in names:
+                    files.append(os.path.join(root, name))
+        
+        return files
+    
+    def snapshot_leaderboard(self):
+        """لقطة من قاعدة المتصدرين للنسخ الاحتياطي ({} إذا كانت معطلة)"""
+        leaderboard = get_leaderboard()
+        if leaderboard is None:
+            return {}
+        leaderboard.backup_to(self.leaderboard_snapshot_file)
+        return {self.leaderboard_backup_name: self.leaderboard_snapshot_file}
+    
+    def restore_leaderboard(self):
+        """نسخ اللقطة المستعادة داخل الاتصال المفتوح بدل استبدال ملف القاعدة"""
+        if not os.path.exists(self.leaderboard_snapshot_file):
+            return
         try:
-            import shutil
-            import zipfile
-            
-            backup_dir = os.path.join(self.save_dir, "backups")
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            backup_file = os.path.join(backup_dir, f"{backup_name}.zip")
-            
-            # إنشاء ملف ZIP
-            with zipfile.ZipFile(backup_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # إضافة الملفات
-                files_to_backup = [
-                    self.high_scores_file,
-                    self.settings_file,
-                    os.path.join(self.save_dir, "game_stats.json")
-                ]
-                
-                for file in files_to_backup:
-                    if os.path.exists(file):
-                        zipf.write(file, os.path.basename(file))
-                
-                # إضافة مجلد الحفظات
-                for root, dirs, files in os.walk(self.game_saves_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, self.save_dir)
-                        zipf.write(file_path, arcname)
-            
-            return backup_file
+            leaderboard = get_leaderboard()
+            if leaderboard is not None:
+                leaderboard.restore_from(self.leaderboard_snapshot_file)
+        finally:
+            os.remove(self.leaderboard_snapshot_file)
+    
+    def backup_save_data(self, backup_name, callback=None):
+        """نسخ احتياطي تزايدي للبيانات في خيط خلفي، ويرجع مسار الـ manifest"""
+        try:
+            manifest_path = self.backup_store.get_manifest_path(backup_name)
+            
+            def run_backup():
+                try:
+                    self.writer.flush()
+                    result = self.backup_store.create_backup(backup_name, self.save_dir,
+                                                             self.get_backup_files(),
+                                                             self.snapshot_leaderboard())
+                except Exception as e:
+                    print(f"Error creating backup: {e}")
+                    result = None
+                finally:
+                    if os.path.exists(self.leaderboard_snapshot_file):
+                        os.remove(self.leaderboard_snapshot_file)
+                if callback:
+                    callback(result)
+            
+            self.backup_thread = threading.Thread(target=run_backup, name="backup", daemon=True)
+            self.backup_thread.start()
+            
+            return manifest_path
         except Exception as e:
             print(f"Error creating backup: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def wait_for_backup(self, timeout=None):
+        """انتظار انتهاء النسخ الاحتياطي الجاري"""
+        if self.backup_thread:
+            self.backup_thread.join(timeout)
+    
+    def restore_save_data(self, backup_name):
+        """استعادة مجلد الحفظ من نسخة احتياطية"""
+        try:
+            self.wait_for_backup()
+            self.writer.flush()
+            
+            # لقطة متبقية من نسخ سابق لا يجب أن تُستعاد بدل لقطة هذه النسخة
+            if os.path.exists(self.leaderboard_snapshot_file):
+                os.remove(self.leaderboard_snapshot_file)
+            
+            with self.stats_lock, self.slot_index_lock:
+                self.backup_store.restore_backup(backup_name, self.save_dir, self.get_backup_files(),
+                                                 {self.leaderboard_backup_name: self.leaderboard_snapshot_file})
+                self.player_stats_index = None
+            self.restore_leaderboard()
+            
+            # إعادة تحميل الجداول المحفوظة في الذاكرة
+            self.high_scores.reload()
+            return True
+        except Exception as e:
+            print(f"Error restoring backup: {e}")
+            return False
+
+_save_manager = None
+_save_manager_lock = threading.Lock()
+
+def get_save_manager():
+    """مدير الحفظ المشترك (يُنشأ عند أول استخدام)"""
+    global _save_manager
+    with _save_manager_lock:
+        if _save_manager is None:
+            _save_manager = SaveManager()
+        return _save_manager
\ No newline at end of file
@@ -2,10 +2,9 @@
 🏆 نظام النقاط، المستويات، والتقدم
 """
 
-import json
-import os
 from datetime import datetime
 from config import *
+from high_scores import get_high_score_service
 
 class ScoreManager:
     """مدير النقاط والمستويات"""
@@ -20,6 +19,8 @@ class ScoreManager:
         self.start_time = None
         self.play_time = 0
         self.multiplier = 1.0
+        self.leaderboard_rank = None
+        self.high_scores = get_high_score_service()
         self.load_high_score()
     
     def start_game(self):
@@ -32,6 +33,7 @@ class ScoreManager:
         self.start_time = datetime.now()
         self.play_time = 0
         self.multiplier = 1.0
+        self.leaderboard_rank = None
     
     def update(self, dt):
         """تحديث الوقت"""
@@ -116,52 +118,34 @@ class ScoreManager:
         return stats
     
     def save_high_score(self, player_name="Player"):
-        """حفظ أعلى نقاط"""
-        if self.score > 0:
-            scores = self.load_all_scores()
-            
-            new_score = {
-                'player': player_name,
-                'score': self.score,
-                'level': self.level,
-                'foods_eaten': self.foods_eaten,
-                'play_time': int(self.play_time),
-                'date': datetime.now().isoformat()
-            }
-            
-            scores.append(new_score)
-            
-            # ترتيب النقاط تنازلياً
-            scores.sort(key=lambda x: x['score'], reverse=True)
-            
-            # حفظ أول 10 نتائج فقط
-            scores = scores[:10]
-            
-            # حفظ في الملف
-            os.makedirs(SAVE_DIR, exist_ok=True)
-            with open(os.path.join(SAVE_DIR, "high_scores.json"), 'w') as f:
-                json.dump(scores, f, indent=2)
+        """حفظ أعلى نقاط (كل الجولات تُسجل في لوحة المتصدرين، والجدول للنتائج الموجبة فقط)"""
+        new_score = {
+            'player': player_name,
+            'score': self.score,
+            'level': self.level,
+            'foods_eaten': self.foods_eaten,
+            'play_time': int(self.play_time),
+            'date': datetime.now().isoformat()
+        }
+        
+        self.leaderboard_rank = None
+        self.high_scores.add_score(new_score, self.set_leaderboard_rank)
     
     def load_high_score(self):
         """تحميل أعلى نقاط"""
-        scores = self.load_all_scores()
-        if scores:
-            self.high_score = scores[0]['score']
-        else:
-            self.high_score = 0
+        self.high_score = self.high_scores.get_high_score()
     
     def load_all_scores(self):
         """تحميل كل النقاط"""
-        try:
-            with open(os.path.join(SAVE_DIR, "high_scores.json"), 'r') as f:
-                return json.load(f)
-        except:
-            return []
+        return self.high_scores.get_scores()
     
     def get_high_scores_table(self, limit=10):
         """الحصول على جدول أعلى النقاط"""
-        scores = self.load_all_scores()
-        return scores[:limit]
+        return self.high_scores.get_scores(limit)
+    
+    def set_leaderboard_rank(self, rank_info):
+        """ترتيب الجولة بين كل الجولات (يُستدعى من خيط الكتابة بعد تسجيلها)"""
+        self.leaderboard_rank = rank_info
     
     def calculate_rank(self):
         """حساب الرتبة بناءً على النقاط"""
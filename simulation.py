@@ -0,0 +1,140 @@
+"""
+🧮 قواعد لعبة الشبكة بدون رسوم (للعب، الإعادة، والبوتات)
+"""
+
+from random_streams import RandomStreams
+
+class SnakeSimulation:
+    """حالة اللعبة وقواعدها؛ كل العشوائية من مولدات مشتقة من البذرة"""
+    def __init__(self, grid_width, grid_height, seed=None, initial_speed=10, arena=None):
+        # الساحة (اختيارية) تحدد الأبعاد والعوائق ونقطة البداية وأماكن الطعام
+        self.arena = arena
+        if arena is not None:
+            grid_width, grid_height = arena.width, arena.height
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.initial_speed = initial_speed
+        self.reset(seed)
+    
+    def reset(self, seed=None):
+        """بدء جولة جديدة"""
+        self.streams = RandomStreams(seed)
+        self.seed = self.streams.seed
+        self.rng = self.streams.food
+        
+        # الثعبان
+        if self.arena is not None:
+            self.snake = [self.arena.spawn]
+            self.direction = self.arena.direction
+        else:
+            self.snake = [(self.grid_width // 2, self.grid_height // 2)]
+            self.direction = (1, 0)  # يمين
+        
+        # الطعام
+        self.food = self.generate_food()
+        
+        # الحالة
+        self.score = 0
+        self.speed = self.initial_speed
+        self.game_over = False
+        self.death_cause = None
+        self.tick = 0
+    
+    def generate_food(self):
+        """توليد طعام في مكان عشوائي (None إذا امتلأت اللوحة)"""
+        if self.arena is not None:
+            # الخلايا الصالحة محسوبة مسبقاً عند تحميل الساحة
+            return self.arena.random_food_cell(self.rng, self.snake)
+        
+        for _ in range(100):
+            food = (self.rng.randint(0, self.grid_width - 1),
+                    self.rng.randint(0, self.grid_height - 1))
+            if food not in self.snake:
+                return food
+        
+        # لوحة شبه ممتلئة: الاختيار من الخلايا الحرة مباشرة
+        occupied = set(self.snake)
+        free_cells = [(x, y) for x in range(self.grid_width) for y in range(self.grid_height)
+                      if (x, y) not in occupied]
+        return self.rng.choice(free_cells) if free_cells else None
+    
+    def step(self, direction=None):
+        """خطوة واحدة؛ يرجع 'ate' أو 'wall' أو 'self' أو 'full' أو None"""
+        if self.game_over:
+            return None
+        
+        # منع الدوران المباشر للخلف
+        if direction and direction != (-self.direction[0], -self.direction[1]):
+            self.direction = direction
+        self.tick += 1
+        
+        # حساب الموقع الجديد للرأس
+        head_x, head_y = self.snake[0]
+        new_head = (head_x + self.direction[0], head_y + self.direction[1])
+        
+        # التحقق من الاصطدام بالجدران
+        if (new_head[0] < 0 or new_head[0] >= self.grid_width or
+                new_head[1] < 0 or new_head[1] >= self.grid_height):
+            return self.end('wall')
+        if self.arena is not None and new_head in self.arena.blocked:
+            return self.end('wall')
+        
+        # التحقق من الاصطدام بالنفس
+        if new_head in self.snake:
+            return self.end('self')
+        
+        self.snake.insert(0, new_head)
+        
+        # التحقق من أكل الطعام
+        if new_head == self.food:
+            self.score += 10
+            self.food = self.generate_food()
+            
+            # زيادة السرعة كل 50 نقطة
+            if self.score % 50 == 0 and self.speed < 20:
+                self.speed += 1
+            
+            if self.food is None:
+                # امتلأت اللوحة بالكامل
+                return self.end('full')
+            return 'ate'
+        
+        # إزالة الذيل إذا لم يؤكل طعام
+        self.snake.pop()
+        return None
+    
+    def end(self, cause):
+        """إنهاء الجولة"""
+        self.game_over = True
+        self.death_cause = cause
+        return cause
+    
+    def get_state(self):
+        """لقطة كاملة للحالة (للإطارات المفتاحية)"""
+        version, internal, gauss = self.rng.getstate()
+        return {
+            'snake': [list(cell) for cell in self.snake],
+            'direction': list(self.direction),
+            'food': list(self.food) if self.food else None,
+            'score': self.score,
+            'speed': self.speed,
+            'game_over': self.game_over,
+            'death_cause': self.death_cause,
+            'tick': self.tick,
+            'seed': self.seed,
+            'rng': [version, list(internal), gauss],
+        }
+    
+    def set_state(self, state):
+        """استعادة لقطة"""
+        self.snake = [tuple(cell) for cell in state['snake']]
+        self.direction = tuple(state['direction'])
+        self.food = tuple(state['food']) if state['food'] else None
+        self.score = state['score']
+        self.speed = state['speed']
+        self.game_over = state['game_over']
+        self.death_cause = state['death_cause']
+        self.tick = state['tick']
+        self.seed = state['seed']
+        version, internal, gauss = state['rng']
+        self.rng.setstate((version, tuple(internal), gauss))
\ No newline at end of file
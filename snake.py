@@ -5,10 +5,16 @@
 import pygame
 import math
 from config import *
+from pools import get_pool
+from input_queue import TurnQueue, get_input_latency_tracker
 
 class SnakeSegment:
     """جزء من جسم الثعبان"""
     def __init__(self, x, y, is_head=False):
+        self.reset(x, y, is_head)
+    
+    def reset(self, x, y, is_head=False):
+        """تهيئة كاملة (تُستدعى أيضاً عند إعادة الاستخدام من المجمع)"""
         self.x = x
         self.y = y
         self.is_head = is_head
@@ -47,10 +53,17 @@ class Snake:
         # إنشاء الرأس والجسم
         self.head = SnakeSegment(start_x, start_y, is_head=True)
         self.body = []
+        self.segment_pool = get_pool('segments', SnakeSegment, SEGMENT_POOL_SIZE)
         self.growth_pending = 3  # طول ابتدائي
         self.direction = (1, 0)  # يمين
         self.next_direction = (1, 0)
         
+        # انعطاف واحد من الطابور لكل خطوة، مع توقيته لقياس زمن الاستجابة
+        self.turn_queue = TurnQueue()
+        self.turn_applied = False
+        self.turn_timestamp = None
+        self.latency = get_input_latency_tracker()
+        
         # الحالة
         self.alive = True
         self.score = 0
@@ -81,6 +94,11 @@ class Snake:
         # تحديث مؤقتات القدرات
         self.update_powerups(dt)
         
+        # أخذ الانعطاف التالي إن لم يُطبق انعطاف منذ آخر خطوة
+        if not self.turn_applied and self.turn_queue:
+            self.next_direction, self.turn_timestamp = self.turn_queue.pop()
+            self.turn_applied = True
+        
         # تحديث الرأس
         self.head.update(self.next_direction)
         self.direction = self.head.direction
@@ -90,6 +108,11 @@ class Snake:
         if self.move_timer >= 1.0:
             self.move_timer = 0
             self.move()
+            
+            if self.turn_timestamp is not None:
+                self.latency.record(self.turn_timestamp)
+                self.turn_timestamp = None
+            self.turn_applied = False
         
         # تحديث الجسم
         self.update_body()
@@ -153,7 +176,7 @@ class Snake:
     
     def add_segment(self, x, y):
         """إضافة جزء جديد للجسم"""
-        new_segment = SnakeSegment(x, y, is_head=False)
+        new_segment = self.segment_pool.acquire(x, y, is_head=False)
         self.body.append(new_segment)
         self.length += 1
     
@@ -161,11 +184,9 @@ class Snake:
         """جعل الثعبان ينمو"""
         self.growth_pending += amount
     
-    def change_direction(self, direction):
-        """تغيير اتجاه الثعبان"""
-        # منع الدوران المباشر للخلف
-        if (direction[0] * -1, direction[1] * -1) != self.direction:
-            self.next_direction = direction
+    def change_direction(self, direction, timestamp=None):
+        """إضافة انعطاف للطابور (الرجوع للخلف والتكرار يُرفضان هناك)"""
+        return self.turn_queue.push(direction, self.next_direction, timestamp)
     
     def check_self_collision(self):
         """التحقق من اصطدام الثعبان بنفسه"""
@@ -254,6 +275,28 @@ class Snake:
         # تأثيرات الموت
         self.head.color = (128, 128, 128)  # رمادي
     
-    def reset(self, start_x, start_y):
-        """إعادة تعيين الثعبان"""
-        self.__init__(start_x, start_y)
\ No newline at end of file
+    def reset(self, start_x, start_y, direction=(1, 0)):
+        """إعادة تعيين الثعبان مع إعادة استخدام الرأس والقوائم والقواميس"""
+        self.head.reset(start_x, start_y, is_head=True)
+        self.head.direction = self.head.next_direction = direction
+        self.segment_pool.release_all(self.body)
+        self.body.clear()
+        self.growth_pending = 3
+        self.direction = direction
+        self.next_direction = direction
+        self.turn_queue.clear()
+        self.turn_applied = False
+        self.turn_timestamp = None
+        
+        self.alive = True
+        self.score = 0
+        self.length = 1
+        self.speed = INITIAL_SPEED
+        self.move_timer = 0
+        
+        for powerup_type in self.powerups:
+            self.powerups[powerup_type] = False
+        self.powerup_timers.clear()
+        
+        self.wobble_phase = 0
+        self.glow_phase = 0
\ No newline at end of file
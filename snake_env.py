@@ -0,0 +1,126 @@
+"""
+🤖 بيئة تدريب بأسلوب Gym فوق قواعد لعبة الشبكة (ملاحظات بدون نسخ)
+"""
+
+import numpy as np
+from config import *
+from simulation import SnakeSimulation
+
+# قنوات الملاحظة (قواعد الشبكة لا تحتوي مكافآت، فلا قناة لها)
+CHANNELS = ('body', 'head', 'food', 'obstacles')
+BODY, HEAD, FOOD, OBSTACLES = range(len(CHANNELS))
+
+# الأفعال: أعلى، يمين، أسفل، يسار
+ACTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+class SnakeEnv:
+    """reset()/step() بنفس قواعد ونقاط SnakeSimulation التي يراها اللاعب
+
+    الملاحظة مصفوفة uint8 بشكل (frame_stack * القنوات، الارتفاع، العرض) وهي view
+    على مخزن محجوز مسبقاً: تتغير في الخطوة التالية، فانسخها إذا احتجت الاحتفاظ بها.
+    قناة العوائق تحمل جدران الساحة (arena) وتبقى صفراً على اللوحة المفتوحة.
+    """
+    def __init__(self, grid_width=WINDOW_WIDTH // GRID_SIZE, grid_height=WINDOW_HEIGHT // GRID_SIZE,
+                 frame_stack=1, max_steps=None, seed=None, arena=None):
+        self.sim = SnakeSimulation(grid_width, grid_height, seed=seed, arena=arena)
+        grid_width, grid_height = self.sim.grid_width, self.sim.grid_height
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.frame_stack = frame_stack
+        self.max_steps = max_steps
+
+        # الجدران ثابتة طوال الجولة: تُحسب مرة وتُنسخ في كل reset
+        self.walls = np.zeros((grid_height, grid_width), dtype=np.uint8)
+        if arena is not None:
+            self.walls[arena.tiles != 0] = 1
+
+        channels = len(CHANNELS)
+        self.observation_shape = (frame_stack * channels, grid_height, grid_width)
+        self.action_count = len(ACTIONS)
+
+        # كل إطار يُكتب مرتين (في slot وslot+k) حتى تكون آخر k إطارات متجاورة دائماً
+        self.frames = np.zeros((2 * frame_stack, channels, grid_height, grid_width), dtype=np.uint8)
+        self.views = [self.frames[slot + 1:slot + 1 + frame_stack].reshape(self.observation_shape)
+                      for slot in range(frame_stack)]
+        self.slot = 0
+        self.steps = 0
+
+    @property
+    def observation(self):
+        """الملاحظة الحالية (view بدون نسخ)"""
+        return self.views[self.slot]
+
+    def reset(self, seed=None):
+        """جولة جديدة؛ يرجع (الملاحظة، المعلومات)"""
+        self.sim.reset(seed)
+        self.steps = 0
+        self.slot = 0
+
+        frame = self.frames[0]
+        frame[:] = 0
+        frame[OBSTACLES] = self.walls
+        for x, y in self.sim.snake:
+            frame[BODY, y, x] = 1
+        head_x, head_y = self.sim.snake[0]
+        frame[HEAD, head_y, head_x] = 1
+        if self.sim.food is not None:
+            frame[FOOD, self.sim.food[1], self.sim.food[0]] = 1
+
+        # كل الإطارات المكدسة تبدأ بنفس الحالة
+        self.frames[1:] = frame
+        return self.observation, self.get_info(None)
+
+    def step(self, action):
+        """خطوة واحدة؛ action رقم في ACTIONS أو اتجاه (dx, dy)
+
+        يرجع (الملاحظة، المكافأة، انتهت، قُطعت، المعلومات)؛ المكافأة هي فرق النقاط.
+        """
+        sim = self.sim
+        direction = ACTIONS[action] if isinstance(action, (int, np.integer)) else tuple(action)
+
+        old_head = sim.snake[0]
+        old_tail = sim.snake[-1]
+        old_food = sim.food
+        old_score = sim.score
+
+        event = sim.step(direction)
+        self.steps += 1
+
+        # الإطار الجديد = الإطار السابق + التغييرات فقط
+        previous = self.frames[self.slot]
+        self.slot = (self.slot + 1) % self.frame_stack
+        frame = self.frames[self.slot]
+        if self.frame_stack > 1:
+            np.copyto(frame, previous)
+
+        if sim.snake[0] != old_head:
+            if event not in ('ate', 'full'):
+                frame[BODY, old_tail[1], old_tail[0]] = 0
+            head_x, head_y = sim.snake[0]
+            frame[BODY, head_y, head_x] = 1
+            frame[HEAD, old_head[1], old_head[0]] = 0
+            frame[HEAD, head_y, head_x] = 1
+
+        if sim.food != old_food:
+            if old_food is not None:
+                frame[FOOD, old_food[1], old_food[0]] = 0
+            if sim.food is not None:
+                frame[FOOD, sim.food[1], sim.food[0]] = 1
+
+        np.copyto(self.frames[self.slot + self.frame_stack], frame)
+
+        reward = sim.score - old_score
+        terminated = sim.game_over
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return self.observation, reward, terminated, truncated, self.get_info(event)
+
+    def get_info(self, event):
+        """معلومات إضافية للخطوة"""
+        return {
+            'event': event,
+            'score': self.sim.score,
+            'length': len(self.sim.snake),
+            'steps': self.steps,
+            'death_cause': self.sim.death_cause,
+            'seed': self.sim.seed,
+        }
\ No newline at end of file
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 اختبار التحمل للجلسات الطويلة: ألعاب آلية متتالية بدون نافذة مع تتبع الذاكرة
+
+الاستخدام:
+    python soak_test.py --games 50 --threshold-kb 16
+"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import gc
+import random
+import sys
+import tempfile
+import threading
+import tracemalloc
+import pygame
+from config import *
+from pools import get_pool_stats
+
+DEFAULT_GAMES = 40
+DEFAULT_WARMUP = 5
+DEFAULT_MAX_FRAMES = 1800          # 30 ثانية لعب لكل جولة كحد أقصى
+MENU_FRAMES = 30                   # مدة القائمة قبل الجولات التي تبدأ منها
+GAME_OVER_FRAMES = 120             # مدة شاشة النهاية
+DEFAULT_THRESHOLD_KB = 16.0        # أقصى نمو مقبول لكل لعبة بعد الإحماء
+FRAME_DT = 1 / 60
+
+def steer(state, rng):
+    """قيادة بسيطة: الابتعاد عن الحواف ثم التوجه لأقرب طعام"""
+    snake = state.snake
+    head_x, head_y = snake.head.x, snake.head.y
+    margin = GRID_SIZE * 2
+    world_width = GRID_WIDTH * GRID_SIZE
+    world_height = GRID_HEIGHT * GRID_SIZE
+
+    if head_x < margin:
+        direction = (1, 0)
+    elif head_x > world_width - margin:
+        direction = (-1, 0)
+    elif head_y < margin:
+        direction = (0, 1)
+    elif head_y > world_height - margin:
+        direction = (0, -1)
+    else:
+        foods = state.food_manager.get_all_food_positions()
+        if not foods or rng.random() < 0.05:
+            direction = rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+        else:
+            target_x, target_y = min(foods, key=lambda p: (p[0] - head_x) ** 2 + (p[1] - head_y) ** 2)
+            dx, dy = target_x - head_x, target_y - head_y
+            if abs(dx) > abs(dy):
+                direction = (1 if dx > 0 else -1, 0)
+            else:
+                direction = (0, 1 if dy > 0 else -1)
+    snake.change_direction(direction)
+
+def run_frame(game, events=(), draw=True):
+    """إطار واحد بنفس ترتيب SnakeGame.run: الأحداث ثم التحديث (مع الانتقال) ثم الرسم"""
+    game.state.handle_events(list(events))
+    game.update()
+    if draw:
+        game.draw()
+
+def play_game(game, seed, max_frames=DEFAULT_MAX_FRAMES, draw=True):
+    """جولة آلية عبر آلة الحالات في main.py؛ يرجع (النقاط، عدد الإطارات)"""
+    rng = random.Random(seed)
+
+    # الجولات بعد ESC تبدأ من القائمة كما يفعل اللاعب
+    if game.state_name == 'menu':
+        for _ in range(MENU_FRAMES):
+            run_frame(game, draw=draw)
+        game.state.next_state = 'playing'  # مثل الضغط على زر اللعب
+        run_frame(game, draw=draw)
+
+    state = game.state
+    frames = 0
+    while frames < max_frames and not state.game_over:
+        steer(state, rng)
+        run_frame(game, draw=draw)
+        frames += 1
+
+    if not state.game_over:
+        # إنهاء الجولة بنفس مسار الموت الحقيقي
+        state.snake.powerups['shield'] = False
+        state.handle_collision('wall')
+
+    # طبقة النهاية داخل حالة اللعب، ثم SPACE (إعادة بـ reset) أو ESC (القائمة) بالتناوب
+    score = state.score_manager.score
+    for _ in range(GAME_OVER_FRAMES):
+        run_frame(game, draw=draw)
+    key = pygame.K_ESCAPE if seed % 2 else pygame.K_SPACE
+    run_frame(game, [pygame.event.Event(pygame.KEYDOWN, key=key)], draw)
+    return score, frames
+
+def growth_per_game(samples):
+    """ميل الانحدار الخطي للذاكرة مقابل رقم اللعبة (بايت/لعبة)"""
+    count = len(samples)
+    if count < 2:
+        return 0.0
+    mean_x = (count - 1) / 2
+    mean_y = sum(samples) / count
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(samples))
+    denominator = sum((x - mean_x) ** 2 for x in range(count))
+    return numerator / denominator
+
+def take_snapshot():
+    """لقطة بعد جمع القمامة، بدون ملفات الاستيراد وtracemalloc نفسه"""
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ))
+
+def run_soak(games=DEFAULT_GAMES, warmup=DEFAULT_WARMUP, max_frames=DEFAULT_MAX_FRAMES,
+             threshold_kb=DEFAULT_THRESHOLD_KB, top=10, draw=True, trace_frames=1):
+    """تشغيل الجولات وإرجاع تقرير النمو"""
+    # نفس مسار الجلسة الحقيقية: آلة الحالات في main.py بحالات مشتركة يعاد ضبطها بين الجولات
+    from main import SnakeGame
+    random.seed(0)  # بذور الجولات من reset() تتكرر بين التشغيلات
+    session = SnakeGame()
+    session.dt = FRAME_DT
+
+    tracemalloc.start(trace_frames)
+    samples = []
+    threads = []
+    baseline = None
+    try:
+        for game in range(games):
+            score, frames = play_game(session, game, max_frames, draw)
+
+            snapshot = take_snapshot()
+            traced = sum(stat.size for stat in snapshot.statistics('filename'))
+            threads.append(threading.active_count())
+            print(f"🎮 game {game + 1}/{games}: score={score} frames={frames} "
+                  f"traced={traced / 1024:.1f} KiB threads={threads[-1]}")
+
+            if game + 1 == warmup:
+                baseline = snapshot
+            if game + 1 >= warmup:
+                samples.append(traced)
+            final = snapshot
+    finally:
+        tracemalloc.stop()
+        from persistence import get_persistence_writer
+        get_persistence_writer().flush()
+        pygame.quit()
+
+    growth = growth_per_game(samples)
+    top_growth = []
+    if baseline is not None:
+        for stat in final.compare_to(baseline, 'traceback' if trace_frames > 1 else 'lineno')[:top]:
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            top_growth.append({
+                'site': f"{frame.filename}:{frame.lineno}",
+                'size_diff': stat.size_diff,
+                'count_diff': stat.count_diff,
+                'traceback': stat.traceback.format() if trace_frames > 1 else None,
+            })
+
+    return {
+        'games': games,
+        'warmup': warmup,
+        'growth_bytes_per_game': growth,
+        'threshold_bytes_per_game': threshold_kb * 1024,
+        'passed': growth <= threshold_kb * 1024,
+        'thread_growth': threads[-1] - threads[min(warmup, len(threads)) - 1] if threads else 0,
+        'top_growth': top_growth,
+        'pools': get_pool_stats(),
+    }
+
+def main(argv=None):
+    """واجهة سطر الأوامر"""
+    parser = argparse.ArgumentParser(description="Headless soak test with tracemalloc leak detection")
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES)
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP,
+                        help="games played before the steady-state baseline")
+    parser.add_argument('--max-frames', type=int, default=DEFAULT_MAX_FRAMES)
+    parser.add_argument('--threshold-kb', type=float, default=DEFAULT_THRESHOLD_KB,
+                        help="maximum steady-state growth per game")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--trace-frames', type=int, default=1, help="stack depth kept per allocation")
+    parser.add_argument('--no-draw', action='store_true', help="skip the draw paths")
+    args = parser.parse_args(argv)
+    if args.games <= args.warmup:
+        parser.error("--games must be larger than --warmup")
+
+    # اللعب في مجلد مؤقت حتى لا تلمس الجولات الآلية ملفات الحفظ الحقيقية
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='snake-soak-') as work_dir:
+        os.chdir(work_dir)
+        try:
+            report = run_soak(args.games, args.warmup, args.max_frames, args.threshold_kb,
+                              args.top, not args.no_draw, args.trace_frames)
+        finally:
+            os.chdir(original_dir)
+
+    print("=" * 50)
+    print(f"📈 Top growing allocation sites since game {args.warmup}:")
+    for entry in report['top_growth']:
+        print(f"  {entry['size_diff'] / 1024:+9.1f} KiB {entry['count_diff']:+7d} blocks  {entry['site']}")
+        if entry['traceback']:
+            for line in entry['traceback']:
+                print(f"      {line}")
+
+    print("♻️ Object pools:")
+    for name, stats in report['pools'].items():
+        print(f"  {name:<13} hits {stats['hits']:>7} misses {stats['misses']:>6} "
+              f"hit rate {stats['hit_rate'] * 100:5.1f}%  high water {stats['high_water']:>4} "
+              f"discards {stats['discards']:>6} (max {stats['max_size']})")
+
+    growth_kb = report['growth_bytes_per_game'] / 1024
+    print(f"Steady-state growth: {growth_kb:.2f} KiB/game (limit {args.threshold_kb:.2f}), "
+          f"threads {report['thread_growth']:+d}")
+    if report['passed']:
+        print("✅ Soak test passed")
+        return 0
+    print("❌ Soak test failed: memory keeps growing between games")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+🧪 اختبارات قراءة ملفات الساحات
+"""
+
+import pytest
+from arenas import parse_arena
+
+GRID = """#####
+#...#
+#...#
+#####"""
+
+def test_text_header_spawn_and_direction():
+    arena = parse_arena("name: Box\nspawn: 1,2\ndirection: 0,-1\n\n" + GRID)
+    assert arena.name == 'Box'
+    assert arena.spawn == (1, 2)
+    assert arena.direction == (0, -1)
+
+def test_json_spawn_list():
+    arena = parse_arena('{"spawn": [3, 1], "direction": "left", "rows": %s}'
+                        % str(GRID.splitlines()).replace("'", '"'))
+    assert arena.spawn == (3, 1)
+    assert arena.direction == (-1, 0)
+
+@pytest.mark.parametrize('spawn', ['-1,1', '1,-1', '5,1', '1,4', '0,0', '1', 'a,b', '1,2,3'])
+def test_invalid_spawn_raises_value_error(spawn):
+    with pytest.raises(ValueError):
+        parse_arena(f"spawn: {spawn}\n\n" + GRID)
+
+@pytest.mark.parametrize('text', ['{"spawn": [1, 1]}', '{"rows": [1, 2]}', '[1, 2]',
+                                  '{"direction": [1, 1], "rows": ["S.."]}'])
+def test_invalid_json_raises_value_error(text):
+    with pytest.raises(ValueError):
+        parse_arena(text)
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+🧪 اختبارات حالة اللعب: الانتقال الآني يهبط على خلية حرة فقط
+"""
+
+import os
+import pygame
+from arenas import load_arena
+from config import *
+from game_states import PlayingState
+from obstacles import Obstacle
+from powerups import PowerUp
+
+ARENAS = os.path.abspath(ARENA_DIR)
+
+def make_state(seed=4):
+    pygame.init()
+    return PlayingState(WINDOW_WIDTH, WINDOW_HEIGHT, seed=seed)
+
+def test_teleport_avoids_obstacles_and_body(save_dir):
+    state = make_state()
+    manager = state.obstacle_manager
+    # جدار أفقي كامل إضافة للعوائق العشوائية
+    manager.obstacles.extend(Obstacle(x * GRID_SIZE + GRID_SIZE // 2, 10 * GRID_SIZE + GRID_SIZE // 2)
+                             for x in range(GRID_WIDTH))
+    body = {(int(x // GRID_SIZE), int(y // GRID_SIZE)) for x, y in state.snake.get_body_positions()}
+
+    for _ in range(300):
+        x, y = state.get_teleport_position()
+        assert manager.check_collision(x, y, GRID_SIZE * 0.5) is None
+        assert (x // GRID_SIZE, y // GRID_SIZE) not in body
+        for obstacle in manager.moving_obstacles:
+            for progress in (0.0, 0.25, 0.5, 0.75, 1.0):
+                obstacle_x = obstacle.start_pos[0] + (obstacle.end_pos[0] - obstacle.start_pos[0]) * progress
+                obstacle_y = obstacle.start_pos[1] + (obstacle.end_pos[1] - obstacle.start_pos[1]) * progress
+                assert (x - obstacle_x) ** 2 + (y - obstacle_y) ** 2 >= GRID_SIZE ** 2
+
+def test_teleport_uses_arena_cells(save_dir):
+    state = make_state()
+    state.arena = load_arena(os.path.join(ARENAS, 'pillars.txt'))
+    food_cells = set(state.arena.food_cell_list)
+    for _ in range(300):
+        x, y = state.get_teleport_position()
+        assert (x // GRID_SIZE, y // GRID_SIZE) in food_cells
+
+def test_teleport_pickup_moves_the_head(save_dir):
+    state = make_state()
+    head_x, head_y = state.snake.get_head_position()
+    state.powerup_manager.powerups.append(PowerUp(head_x, head_y, 'teleport'))
+    state.update(0.001)
+    x, y = state.snake.get_head_position()
+    assert (x, y) != (head_x, head_y)
+    assert state.obstacle_manager.check_collision(x, y, GRID_SIZE * 0.5) is None
+    assert not state.game_over
\ No newline at end of file
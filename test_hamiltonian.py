@@ -0,0 +1,60 @@
+"""
+🧪 اختبارات حل الدورة الهاميلتونية على قواعد SnakeSimulation
+"""
+
+import os
+from array import array
+import pytest
+import hamiltonian
+from hamiltonian import CYCLES_DIR, HamiltonianSolver, get_cycle, is_valid_cycle
+from simulation import SnakeSimulation
+from tournament import DEFAULT_MAX_TICKS, get_max_ticks, play_game
+
+SEEDS = range(20)
+
+def play(grid_width, grid_height, seed):
+    sim = SnakeSimulation(grid_width, grid_height, seed=seed)
+    bot = HamiltonianSolver(grid_width, grid_height)
+    while not sim.game_over:
+        sim.step(bot.next_direction(sim.snake, sim.food, direction=sim.direction))
+    return sim
+
+@pytest.mark.parametrize('size', [(4, 4), (6, 4), (5, 6), (8, 8)])
+def test_even_board_fills(save_dir, size):
+    width, height = size
+    for seed in SEEDS:
+        sim = play(width, height, seed)
+        assert sim.death_cause == 'full', seed
+        assert len(sim.snake) == width * height
+
+@pytest.mark.parametrize('size', [(5, 5), (7, 7), (9, 11)])
+def test_odd_board_reaches_last_cells(save_dir, size):
+    # بطول N-2 قد يظهر الطعام على خلية لا يمكن إكمال اللوحة بعدها (قيد التلوين)،
+    # فالمطلوب: لا موت قبل N-1، وامتلاء اللوحة كلما كان ممكناً
+    width, height = size
+    results = [play(width, height, seed) for seed in SEEDS]
+    for sim in results:
+        assert len(sim.snake) >= width * height - 1
+    assert any(sim.death_cause == 'full' for sim in results)
+
+def test_bad_cached_cycle_is_rebuilt(save_dir):
+    # ملف دورة 6x4 محفوظ باسم لوحة 4x6، وملف مقطوع لا يقبل القراءة كأعداد
+    os.makedirs(CYCLES_DIR)
+    with open(os.path.join(CYCLES_DIR, "cycle_4x6.bin"), 'wb') as f:
+        f.write(array('i', (y * 6 + x for x, y in hamiltonian.build_cycle(6, 4))).tobytes())
+    with open(os.path.join(CYCLES_DIR, "cycle_5x5.bin"), 'wb') as f:
+        f.write(b'\x01\x02\x03')
+    hamiltonian._cycle_cache.clear()
+
+    for width, height in ((4, 6), (5, 5)):
+        assert is_valid_cycle(get_cycle(width, height), width, height)
+        with open(os.path.join(CYCLES_DIR, f"cycle_{width}x{height}.bin"), 'rb') as f:
+            assert array('i', f.read()) == get_cycle(width, height)
+    hamiltonian._cycle_cache.clear()
+
+def test_tournament_ticks_scale_with_the_board(save_dir):
+    # على 30x25 يحتاج بوت الدورة نحو 90 ألف خطوة، أكثر بكثير من الحد الافتراضي
+    assert get_max_ticks('hamiltonian', 30, 25) == 750 ** 2
+    assert get_max_ticks('astar', 30, 25) == DEFAULT_MAX_TICKS
+    assert play_game('hamiltonian', 0, 10, 8)['cause'] == 'full'
+    assert play_game('hamiltonian', 0, 10, 8, max_ticks=50)['cause'] == 'timeout'
\ No newline at end of file
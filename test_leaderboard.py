@@ -0,0 +1,80 @@
+"""
+🧪 اختبارات لوحة المتصدرين: الترتيب بعد التسجيل، شجرة الترتيب، والاستيراد مرة واحدة بدون تكرار
+"""
+
+import json
+import os
+import random
+import sqlite3
+import leaderboard
+from persistence import get_persistence_writer
+from score import ScoreManager
+
+def finish_run(manager, score):
+    manager.start_game()
+    manager.score = score
+    manager.save_high_score('Ann')
+    get_persistence_writer().flush()
+    return manager.leaderboard_rank
+
+def test_rank_is_computed_after_the_run_is_recorded(save_dir):
+    manager = ScoreManager()
+    assert finish_run(manager, 50) == {'rank': 1, 'percentile': 0.0, 'total_runs': 1}
+    assert finish_run(manager, 80) == {'rank': 1, 'percentile': 50.0, 'total_runs': 2}
+
+    # النتيجة الصفرية تُسجل في لوحة المتصدرين دون أن تدخل جدول أعلى النقاط
+    assert finish_run(manager, 0)['rank'] == 3
+    assert [entry['score'] for entry in manager.get_high_scores_table()] == [80, 50]
+
+def test_import_skips_runs_present_in_both_files(save_dir):
+    os.makedirs('saves')
+    run = {'score': 120, 'level': 2, 'foods_eaten': 12, 'play_time': 40}
+    with open('saves/high_scores.json', 'w') as f:
+        json.dump([dict(run, player='Ann', date='2024-01-01T10:00:00.500000')], f)
+    with open('saves/game_stats.jsonl', 'w') as f:
+        f.write(json.dumps(dict(run, player_name='Ann', date='2024-01-01T10:00:00.400000')) + '\n')
+        f.write(json.dumps(dict(run, score=30, player_name='Ann', date='2024-01-02T10:00:00')) + '\n')
+
+    board = leaderboard.get_leaderboard()
+    assert board.get_total_runs() == 2
+    assert board.get_rank(100) == 2
+
+    # الفتح التالي لا يعيد الاستيراد حتى لو تغيرت الملفات
+    board.close()
+    leaderboard._leaderboard = None
+    os.remove('saves/game_stats.jsonl')
+    with open('saves/high_scores.json', 'w') as f:
+        json.dump([dict(run, score=999, player='Bob', date='2024-01-03T10:00:00')], f)
+    assert leaderboard.get_leaderboard().get_total_runs() == 2
+
+def test_histogram_matches_counting(save_dir):
+    rng = random.Random(4)
+    scores = [rng.choice([0, 10, 20, 150, 1000, 70000]) + rng.randrange(5) for _ in range(300)]
+    histogram = leaderboard.ScoreHistogram()
+    for score in scores:
+        histogram.add(score)
+    for score in (-1, 0, 3, 10, 149, 151, 5000, 70004, 10 ** 6):
+        assert histogram.count_above(score) == sum(1 for s in scores if s > score)
+        assert histogram.count_below(score) == sum(1 for s in scores if s < score)
+
+def test_score_counts_are_rebuilt_for_an_older_database(save_dir):
+    os.makedirs('saves')
+    connection = sqlite3.connect('saves/old.db')
+    connection.execute("CREATE TABLE runs (id INTEGER PRIMARY KEY, player TEXT NOT NULL, "
+                       "score INTEGER NOT NULL, level INTEGER, foods_eaten INTEGER, "
+                       "play_time INTEGER, date TEXT NOT NULL, UNIQUE (player, score, date))")
+    connection.executemany("INSERT INTO runs (player, score, date) VALUES (?, ?, ?)",
+                           [('Ann', 30, 'a'), ('Ann', 50, 'b'), ('Bob', 50, 'c')])
+    connection.commit()
+    connection.close()
+
+    board = leaderboard.Leaderboard('saves/old.db')
+    assert board.get_standing(40) == {'rank': 3, 'percentile': 100.0 / 3, 'total_runs': 3}
+    board.record_run({'player': 'Cid', 'score': 60, 'date': 'd'})
+    assert board.get_rank(50) == 2
+    board.close()
+
+    # الجدول محفوظ ومُحدث بالمشغل، فالفتح التالي يقرأه كما هو
+    board = leaderboard.Leaderboard('saves/old.db')
+    assert board.histogram.counts == {30: 1, 50: 2, 60: 1}
+    board.close()
\ No newline at end of file
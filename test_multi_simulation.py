@@ -0,0 +1,70 @@
+"""
+🧪 اختبارات قواعد الاصطدام في اللعبة المشتركة (حركة متزامنة على لوحة بداية الخطوة)
+"""
+
+from autopilot import Autopilot
+from multi_simulation import FREE, WALL, MultiSnake, MultiSnakeSimulation, plan_bot_direction
+
+def make_sim(*snakes, foods=((0, 0),)):
+    """لوحة 10x10 بثعابين محددة؛ كل ثعبان (الجسم من الرأس، الاتجاه)"""
+    sim = MultiSnakeSimulation(10, 10, num_snakes=len(snakes), seed=1)
+    sim.occupancy[:] = bytes(len(sim.occupancy))
+    sim.snakes = []
+    for snake_id, (body, direction) in enumerate(snakes, start=1):
+        sim.snakes.append(MultiSnake(snake_id, body, direction))
+        for x, y in body:
+            sim.occupancy[y * sim.grid_width + x] = snake_id
+    sim.foods = set(foods)
+    return sim
+
+def test_head_on_kills_both():
+    sim = make_sim(([(3, 5), (2, 5)], (1, 0)), ([(5, 5), (6, 5)], (-1, 0)))
+    assert sim.step() == {1: 'head', 2: 'head'}
+    assert sim.game_over and sim.winner is None
+    assert [snake.kills for snake in sim.snakes] == [0, 0]
+    assert not any(sim.occupancy)
+
+def test_head_swap_kills_both():
+    sim = make_sim(([(3, 5), (2, 5)], (1, 0)), ([(4, 5), (5, 5)], (-1, 0)))
+    assert sim.step() == {1: 'head', 2: 'head'}
+
+def test_body_hit_credits_the_owner():
+    sim = make_sim(([(3, 5), (3, 4)], (0, 1)), ([(5, 6), (4, 6), (3, 6), (2, 6)], (1, 0)))
+    assert sim.step() == {1: 'body'}
+    assert sim.get_snake(1).killed_by == 2
+    assert sim.get_snake(2).kills == 1
+    assert sim.winner == 2
+
+def test_self_and_wall():
+    sim = make_sim(([(3, 3), (4, 3), (4, 4), (3, 4), (2, 4)], (-1, 0)),
+                   ([(0, 8), (1, 8)], (-1, 0)),
+                   ([(7, 1), (8, 1)], (-1, 0)))
+    sim.occupancy[1 * sim.grid_width + 6] = WALL
+    assert sim.step({1: (0, 1)}) == {1: 'self', 2: 'wall', 3: 'wall'}
+    assert sim.get_snake(2).killed_by is None
+
+def test_moving_into_a_vacating_tail():
+    # ذيل ثعبان آخر يتحرر في نفس الخطوة، وكذلك ذيل الثعبان نفسه
+    sim = make_sim(([(3, 5), (2, 5)], (1, 0)), ([(5, 4), (5, 5), (4, 5)], (0, -1)),
+                   ([(8, 8), (8, 7), (7, 7), (7, 8)], (0, 1)))
+    assert sim.step({3: (-1, 0)}) == {}
+    assert list(sim.get_snake(1).body) == [(4, 5), (3, 5)]
+    assert list(sim.get_snake(3).body) == [(7, 8), (8, 8), (8, 7), (7, 7)]
+    assert sim.cell_owner((4, 5)) == 1
+
+    # إذا أكل صاحب الذيل فالذيل يبقى والاصطدام قاتل
+    sim = make_sim(([(3, 5), (2, 5)], (1, 0)), ([(5, 4), (5, 5), (4, 5)], (0, -1)),
+                   foods=[(5, 3), (0, 0)])
+    assert sim.step() == {1: 'body', 2: 'ate'}
+    assert sim.cell_owner((4, 5)) == 2 and sim.cell_owner((3, 5)) == FREE
+
+def test_bot_reads_other_bodies_from_occupancy():
+    # جسم الثعبان 2 عمودي بين الثعبان 1 والطعام؛ لا يظهر إلا في مصفوفة الإشغال
+    sim = make_sim(([(3, 5), (2, 5)], (1, 0)),
+                   ([(4, 3), (4, 4), (4, 5), (4, 6), (4, 7)], (0, -1)),
+                   foods=[(5, 5)])
+    bot = Autopilot(sim.grid_width, sim.grid_height)
+    direction = plan_bot_direction(sim, sim.get_snake(1), bot)
+    assert direction in ((0, 1), (0, -1))
+    assert bot.arena.shared_occupancy is sim.occupancy
+    assert sim.step({1: direction}) == {}
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+🧪 اختبارات بروتوكول الشبكة: التحقق من الإدخال وتطابق نسخة العميل مع الخادم
+"""
+
+import json
+import pytest
+from autopilot import Autopilot
+from multi_simulation import MultiSnakeSimulation, plan_bot_direction
+from net_protocol import ClientView, DeltaEncoder, encode_message, parse_direction
+
+def round_trip(message):
+    """نفس البايتات التي تمر عبر الاتصال"""
+    return json.loads(encode_message(message)[4:])
+
+@pytest.mark.parametrize('value, expected', [
+    ([1, 0], (1, 0)),
+    ([0, -1], (0, -1)),
+    ([1, 1], None),
+    ([[1], 0], None),
+    ([True, 0], None),
+    ([1.0, 0], None),
+    ({'x': 1}, None),
+    ('up', None),
+    ([1], None),
+])
+def test_parse_direction(value, expected):
+    assert parse_direction(value) == expected
+
+def test_client_view_follows_deltas(save_dir):
+    sim = MultiSnakeSimulation(30, 20, num_snakes=4, seed=7)
+    encoder = DeltaEncoder(sim)
+    view = ClientView(round_trip(sim.get_state()))
+    bots = {snake.snake_id: Autopilot(sim.grid_width, sim.grid_height) for snake in sim.snakes}
+
+    while not sim.game_over and sim.tick < 400:
+        directions = {snake.snake_id: plan_bot_direction(sim, snake, bots[snake.snake_id])
+                      for snake in sim.get_alive_snakes()}
+        events = sim.step(directions)
+        assert view.apply(round_trip(encoder.encode(events))) == 0
+
+        assert bytes(view.occupancy) == bytes(sim.occupancy)
+        assert view.heads == {snake.snake_id: snake.body[0] for snake in sim.get_alive_snakes()}
+        assert view.scores == sim.get_scores()
+        assert view.foods == sim.foods
+    assert sim.game_over
+    assert view.game_over and view.winner == sim.winner
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+🧪 اختبارات الإعادة: التسجيل ثم إعادة المحاكاة، والقفز، وحذف الملفات القديمة
+"""
+
+import os
+from arenas import parse_arena
+from autopilot import Autopilot
+from replay import ReplayPlayer, ReplayRecorder, get_latest_replay, prune_replays
+from simulation import SnakeSimulation
+
+ARENAS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'arenas')
+
+def record_game(path, seed, keyframe_interval=50, arena=None):
+    """جولة كاملة بالطيار الآلي مع لقطات الحالة في كل نبضة"""
+    sim = SnakeSimulation(12, 10, seed=seed, arena=arena)
+    bot = Autopilot(sim.grid_width, sim.grid_height)
+    recorder = ReplayRecorder(path, sim, keyframe_interval)
+    states = {}
+    while not sim.game_over and sim.tick < 600:
+        direction = bot.next_direction(sim.snake, sim.food, direction=sim.direction)
+        recorder.record_tick(sim, direction)
+        sim.step(direction)
+        states[sim.tick] = sim.get_state()
+    recorder.close(sim, None if sim.game_over else 'quit')
+    return sim, states
+
+def test_replay_round_trip(tmp_path):
+    path = str(tmp_path / 'run.snr')
+    sim, states = record_game(path, seed=42)
+
+    player = ReplayPlayer(path)
+    replayed = player.run_headless()
+    assert replayed.tick == sim.tick
+    assert replayed.snake == sim.snake
+    assert replayed.score == sim.score
+    assert player.end_cause == (sim.death_cause or 'quit')
+
+    # القفز من إطار مفتاحي يعطي نفس الحالة
+    for tick in (1, 49, 50, 51, sim.tick // 2):
+        assert player.seek(tick).get_state() == states[tick]
+
+def test_quit_recording_stops_at_the_recorded_tick(tmp_path):
+    path = str(tmp_path / 'quit.snr')
+    sim = SnakeSimulation(12, 10, seed=3)
+    recorder = ReplayRecorder(path, sim)
+    for _ in range(5):
+        recorder.record_tick(sim, (1, 0))
+        sim.step((1, 0))
+    recorder.close(sim, 'quit')
+
+    # بدون نبضة النهاية كان الثعبان سيكمل يميناً حتى الجدار
+    player = ReplayPlayer(path)
+    replayed = player.run_headless()
+    assert replayed.game_over
+    assert replayed.tick == 5
+    assert replayed.death_cause == 'quit'
+    assert replayed.snake == sim.snake
+    assert player.step() is None
+
+def test_arena_is_stored_in_the_replay(tmp_path):
+    with open(os.path.join(ARENAS_DIR, 'pillars.txt'), 'r') as f:
+        arena = parse_arena(f.read()).compile()
+    path = str(tmp_path / 'arena.snr')
+    sim, states = record_game(path, seed=8, arena=arena)
+
+    player = ReplayPlayer(path)
+    assert player.arena.blocked == arena.blocked
+    assert player.arena.spawn == arena.spawn
+    replayed = player.run_headless()
+    assert replayed.get_state() == states[sim.tick]
+
+def test_prune_keeps_newest(tmp_path):
+    for i in range(5):
+        path = tmp_path / f'replay_{i}.snr'
+        path.write_bytes(b'SNKR')
+        os.utime(path, (1000 + i, 1000 + i))
+
+    assert prune_replays(str(tmp_path), keep=2) == 3
+    assert sorted(os.listdir(tmp_path)) == ['replay_3.snr', 'replay_4.snr']
+    assert get_latest_replay(str(tmp_path)) == str(tmp_path / 'replay_4.snr')
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+🧪 اختبارات صيغة الحفظ الثنائية: حفظ جولة حقيقية وقراءتها كما هي
+"""
+
+import os
+import pickle
+import numpy as np
+import pygame
+from game_states import PlayingState
+from persistence import get_persistence_writer
+from save_manager import get_save_manager
+from save_format import load_save_file, pack_game_data, unpack_game_data
+
+def make_state(seed=7):
+    pygame.init()
+    state = PlayingState(800, 600, seed=seed)
+    state.snake.grow(3)
+    state.food_manager.spawn_special_food(state.snake.get_body_positions())
+    for _ in range(5):
+        state.update(0.05)
+    state.snake.powerup_timers['shield'] = 4.5
+    return state
+
+def assert_same_data(loaded, game_data):
+    assert set(loaded) == set(game_data)
+    for key, value in game_data.items():
+        # القوائم الرقمية (مثل الاتجاه) تُحفظ كمقاطع أيضاً
+        if isinstance(loaded[key], np.ndarray):
+            assert loaded[key].shape == np.shape(value), key
+            assert np.array_equal(loaded[key], value), key
+        else:
+            assert loaded[key] == value, key
+
+def test_round_trip_keeps_values_and_integer_cells(save_dir):
+    state = make_state()
+    state.powerup_manager.spawn_powerup(state.snake.get_body_positions())
+    game_data = state.get_save_data()
+    loaded = unpack_game_data(pack_game_data(game_data))
+    assert_same_data(loaded, game_data)
+
+    # الخلايا تُحفظ أعداداً صحيحة، والأزمنة عشرية
+    for key in ('snake_body', 'foods', 'special_foods', 'powerups', 'obstacles'):
+        assert loaded[key].dtype.kind == 'i', key
+    assert loaded['snake_body'].shape == (len(state.snake.get_body_positions()), 2)
+    assert loaded['timers'].dtype.kind == 'f'
+    assert loaded['timers'][loaded['timer_names'].index('shield')] == 4.5
+
+def test_pause_menu_save_writes_slot(save_dir):
+    state = make_state()
+    assert state.save_game(slot=2)
+    get_persistence_writer().flush()
+
+    loaded = load_save_file(get_save_manager().get_save_file(2))
+    assert np.array_equal(loaded['snake_body'], state.snake.get_body_positions())
+    assert loaded['save_info']['save_slot'] == 2
+    assert get_save_manager().get_save_slots()[2]['exists']
+
+
+def test_restore_continues_the_same_game(save_dir):
+    # انعطاف في منتصف الخطوة يجعل مواقع الجسم عشرية
+    state = make_state(seed=11)
+    state.powerup_manager.spawn_powerup(state.snake.get_body_positions())
+    state.snake.change_direction((0, 1))
+    for _ in range(4):
+        state.update(0.05)
+    assert not state.game_over
+    game_data = state.get_save_data()
+    assert game_data['snake_body'].dtype.kind == 'f'
+
+    restored = PlayingState(800, 600, seed=99)
+    restored.load_save_data(unpack_game_data(pack_game_data(game_data)))
+    assert_same_data(restored.get_save_data(), game_data)
+    assert restored.snake.length == len(game_data['snake_body'])
+
+    # نفس الحالة ونفس المولدات: الجولتان تستمران بنفس الطريقة
+    for _ in range(20):
+        state.update(0.05)
+        restored.update(0.05)
+    assert_same_data(restored.get_save_data(), state.get_save_data())
+
+def test_pause_menu_load_restores_slot(save_dir):
+    state = make_state(seed=11)
+    assert state.save_game(slot=1)
+    get_persistence_writer().flush()
+
+    restored = PlayingState(800, 600, seed=99)
+    assert not restored.load_game(slot=3)
+    assert restored.load_game(slot=1)
+    assert restored.snake.get_body_positions() == state.snake.get_body_positions()
+    assert restored.score_manager.play_time == state.score_manager.play_time
+def test_reads_pending_saves_without_flushing(save_dir):
+    manager = get_save_manager()
+    writer = get_persistence_writer()
+    state = make_state()
+    game_data = state.get_save_data()
+
+    # القراءة لا تنتظر خيط الكتابة: تُرجع ما في الطابور مباشرة
+    def no_flush(timeout=None):
+        raise AssertionError("flush on the main thread")
+    writer.flush = no_flush
+    try:
+        assert manager.save_settings({'volume': 0.3})
+        assert manager.save_game(game_data, slot=1)
+        assert manager.load_settings()['volume'] == 0.3
+        assert_same_data(manager.load_game(1), game_data)
+        assert manager.get_save_slots()[1]['score'] == game_data['score']
+
+        assert manager.delete_save(1)
+        assert manager.load_game(1) is None
+        assert not manager.get_save_slots()[1]['exists']
+        assert not manager.delete_save(1)
+    finally:
+        del writer.flush
+
+def test_legacy_save_migrates_in_background(save_dir):
+    manager = get_save_manager()
+    game_data = make_state().get_save_data()
+    os.makedirs(manager.game_saves_dir, exist_ok=True)
+    with open(manager.get_legacy_save_file(0), 'wb') as f:
+        pickle.dump(game_data, f)
+
+    assert_same_data(manager.load_game(0), game_data)
+    get_persistence_writer().flush()
+    assert not os.path.exists(manager.get_legacy_save_file(0))
+    assert_same_data(load_save_file(manager.get_save_file(0)), game_data)
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+🧪 اختبارات مدير الحفظ: النسخ الاحتياطي والاستعادة، وسجل الإحصائيات
+"""
+
+import json
+import os
+import pygame
+from game_states import PlayingState
+from leaderboard import get_leaderboard
+from persistence import get_persistence_writer
+from replay import REPLAY_DIR
+from save_manager import SaveManager, get_save_manager
+
+def read_players(path):
+    with open(path, 'r') as f:
+        return [entry['player'] for entry in json.load(f)]
+
+def test_restore_reloads_high_scores(save_dir):
+    manager = SaveManager()
+    manager.save_high_score('Ann', 100, 1, 5, 30)
+    get_persistence_writer().flush()
+    manager.backup_save_data('snapshot')
+    manager.wait_for_backup()
+
+    manager.save_high_score('Bob', 200, 2, 9, 60)
+    get_persistence_writer().flush()
+    assert read_players(manager.high_scores_file) == ['Bob', 'Ann']
+
+    assert manager.restore_save_data('snapshot')
+    assert [entry['player'] for entry in manager.get_high_scores_table()] == ['Ann']
+
+    # الحفظ التالي يبني على الجدول المستعاد بدل النسخة القديمة في الذاكرة
+    manager.save_high_score('Cid', 50, 1, 2, 10)
+    get_persistence_writer().flush()
+    assert read_players(manager.high_scores_file) == ['Ann', 'Cid']
+
+def test_backup_includes_leaderboard_and_replays(save_dir):
+    manager = SaveManager()
+    manager.save_high_score('Ann', 100, 1, 5, 30)
+    os.makedirs(REPLAY_DIR)
+    kept = os.path.join(REPLAY_DIR, 'kept.snr')
+    with open(kept, 'wb') as f:
+        f.write(b'first')
+    get_persistence_writer().flush()
+    manager.backup_save_data('snapshot')
+    manager.wait_for_backup()
+
+    files = manager.backup_store.load_manifest('snapshot')['files']
+    assert {'leaderboard.db', 'replays/kept.snr'} <= set(files)
+    assert not os.path.exists(manager.leaderboard_snapshot_file)
+
+    manager.save_high_score('Bob', 200, 2, 9, 60)
+    newer = os.path.join(REPLAY_DIR, 'newer.snr')
+    with open(newer, 'wb') as f:
+        f.write(b'second')
+    os.remove(kept)
+    get_persistence_writer().flush()
+    assert get_leaderboard().get_total_runs() == 2
+
+    # القاعدة تبقى مفتوحة وتُستعاد داخل نفس الاتصال
+    leaderboard = get_leaderboard()
+    assert manager.restore_save_data('snapshot')
+    assert get_leaderboard() is leaderboard
+    assert leaderboard.get_total_runs() == 1
+    assert [row['player'] for row in leaderboard.get_top_scores()] == ['Ann']
+    assert leaderboard.get_rank(150) == 1
+    with open(kept, 'rb') as f:
+        assert f.read() == b'first'
+    assert not os.path.exists(newer)
+
+def test_append_after_torn_line_starts_a_new_line(save_dir):
+    manager = SaveManager()
+    with open(manager.stats_file, 'wb') as f:
+        f.write(b'{"player_name": "Ann", "score": 10}\n{"player_name": "Ann", "sco')
+
+    manager.save_game_stats({'player_name': 'Bob', 'score': 20})
+    assert [entry['score'] for entry in manager.load_game_stats()] == [10, 20]
+    assert [entry['score'] for entry in manager.get_player_stats('Bob')] == [20]
+
+def test_compaction_drops_only_corrupt_lines(save_dir):
+    manager = SaveManager()
+    for score in range(3):
+        manager.save_game_stats({'player_name': 'Ann', 'score': score})
+    get_persistence_writer().flush()
+    with open(manager.stats_file, 'ab') as f:
+        f.write(b'not json\n{"player_name": "Ann", "sco')
+
+    manager.compact_game_stats()
+    manager.save_game_stats({'player_name': 'Ann', 'score': 3})
+    assert [entry['score'] for entry in manager.get_player_stats('Ann')] == [0, 1, 2, 3]
+    with open(manager.stats_file, 'rb') as f:
+        assert len(f.read().splitlines()) == 4
+
+def test_game_over_logs_the_run(save_dir):
+    pygame.init()
+    state = PlayingState(800, 600, seed=1)
+    state.score_manager.score = 40
+    state.handle_collision('wall')
+    assert state.game_over
+
+    stats = get_save_manager().load_game_stats()
+    assert [(entry['player_name'], entry['score']) for entry in stats] == [('Player', 40)]
\ No newline at end of file
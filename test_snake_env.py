@@ -0,0 +1,40 @@
+"""
+🧪 اختبارات بيئة التدريب: قنوات الملاحظة تطابق حالة المحاكاة
+"""
+
+import numpy as np
+from arenas import parse_arena
+from snake_env import BODY, CHANNELS, FOOD, HEAD, OBSTACLES, SnakeEnv
+
+ARENA = """##########
+#........#
+#..##....#
+#........#
+#........#
+##########"""
+
+def check_frame(env, frame):
+    sim = env.sim
+    assert frame[BODY].sum() == len(sim.snake)
+    assert frame[HEAD, sim.snake[0][1], sim.snake[0][0]] == 1
+    assert frame[FOOD, sim.food[1], sim.food[0]] == 1
+    for x, y in sim.arena.blocked_cells:
+        assert frame[OBSTACLES, y, x] == 1
+    assert frame[OBSTACLES].sum() == len(sim.arena.blocked_cells)
+
+def test_obstacles_channel_holds_arena_walls():
+    env = SnakeEnv(frame_stack=2, seed=3, arena=parse_arena("spawn: 2,4\n\n" + ARENA).compile())
+    assert env.observation_shape == (2 * len(CHANNELS), 6, 10)
+    observation, _ = env.reset(seed=3)
+    check_frame(env, observation[len(CHANNELS):])
+    for action in (1, 1, 0):
+        observation, _, terminated, _, _ = env.step(action)
+        assert not terminated
+        check_frame(env, observation[len(CHANNELS):])
+        assert np.array_equal(observation[OBSTACLES], observation[len(CHANNELS) + OBSTACLES])
+
+def test_open_board_has_no_obstacles():
+    env = SnakeEnv(12, 10, seed=1)
+    observation, _ = env.reset()
+    assert observation.shape == (len(CHANNELS), 10, 12)
+    assert not observation[OBSTACLES].any()
\ No newline at end of file
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏁 بطولة البوتات - تشغيل آلاف البذور على كل الأنوية بدون رسوم
+
+الاستخدام:
+    python tournament.py --bots astar hamiltonian --seeds 1000 --out results
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import *
+from simulation import SnakeSimulation
+from autopilot import Autopilot
+from hamiltonian import HamiltonianSolver, get_cycle
+from arenas import load_arena
+
+BOT_TYPES = {
+    'astar': Autopilot,
+    'hamiltonian': HamiltonianSolver,
+}
+
+# عدد البذور في كل مهمة (يقلل كلفة التواصل بين العمليات)
+DEFAULT_CHUNK_SIZE = 25
+DEFAULT_MAX_TICKS = 20000
+
+RUN_FIELDS = ['bot', 'seed', 'score', 'length', 'ticks', 'cause', 'seconds']
+
+def get_max_ticks(bot_name, grid_width, grid_height):
+    """حد الخطوات الافتراضي لكل بوت حسب مساحة اللوحة"""
+    # بوت الدورة يصل لكل طعام خلال لفة واحدة على الأكثر، فملء اللوحة يحتاج حتى (عدد الخلايا)² خطوة
+    if bot_name == 'hamiltonian':
+        return max(DEFAULT_MAX_TICKS, (grid_width * grid_height) ** 2)
+    return DEFAULT_MAX_TICKS
+
+def play_game(bot_name, seed, grid_width, grid_height, max_ticks=None, arena_path=None):
+    """جولة واحدة كاملة لبوت على بذرة (max_ticks=None: الحد الافتراضي للبوت)"""
+    # الساحة تُحسب مرة واحدة لكل عامل (ذاكرة + ملف محسوب على القرص)
+    arena = load_arena(arena_path) if arena_path else None
+    if arena is not None:
+        grid_width, grid_height = arena.width, arena.height
+    if max_ticks is None:
+        max_ticks = get_max_ticks(bot_name, grid_width, grid_height)
+    
+    # بوت جديد لكل جولة: بوت الدورة يعدل دورته أثناء اللعب
+    bot = BOT_TYPES[bot_name](grid_width, grid_height)
+    if arena is not None:
+        bot.set_arena(arena)
+    sim = SnakeSimulation(grid_width, grid_height, seed=seed, arena=arena)
+
+    start = time.perf_counter()
+    while not sim.game_over and sim.tick < max_ticks:
+        sim.step(bot.next_direction(sim.snake, sim.food, direction=sim.direction))
+
+    return {
+        'bot': bot_name,
+        'seed': seed,
+        'score': sim.score,
+        'length': len(sim.snake),
+        'ticks': sim.tick,
+        'cause': sim.death_cause or 'timeout',
+        'seconds': round(time.perf_counter() - start, 4),
+    }
+
+def run_chunk(bot_name, seeds, grid_width, grid_height, max_ticks, arena_path=None):
+    """مهمة عامل: مجموعة بذور لبوت واحد"""
+    return [play_game(bot_name, seed, grid_width, grid_height, max_ticks, arena_path) for seed in seeds]
+
+def make_jobs(bot_names, seeds, chunk_size):
+    """تقسيم (بوت، بذرة) إلى مهام متساوية الحجم"""
+    jobs = []
+    for bot_name in bot_names:
+        for i in range(0, len(seeds), chunk_size):
+            jobs.append((bot_name, seeds[i:i + chunk_size]))
+    return jobs
+
+def percentile(sorted_values, fraction):
+    """النسبة المئوية بالاستيفاء الخطي (القيم مرتبة)"""
+    if not sorted_values:
+        return 0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+def summarize(values):
+    """متوسط ووسيط وp99 لقائمة أرقام"""
+    ordered = sorted(values)
+    return {
+        'mean': round(statistics.fmean(ordered), 3) if ordered else 0,
+        'median': statistics.median(ordered) if ordered else 0,
+        'p99': round(percentile(ordered, 0.99), 3),
+        'min': ordered[0] if ordered else 0,
+        'max': ordered[-1] if ordered else 0,
+    }
+
+def aggregate(results):
+    """إحصائيات لكل بوت من نتائج الجولات"""
+    by_bot = {}
+    for result in results:
+        by_bot.setdefault(result['bot'], []).append(result)
+
+    summary = {}
+    for bot_name, runs in by_bot.items():
+        deaths = {}
+        for run in runs:
+            deaths[run['cause']] = deaths.get(run['cause'], 0) + 1
+        summary[bot_name] = {
+            'games': len(runs),
+            'score': summarize([run['score'] for run in runs]),
+            'ticks': summarize([run['ticks'] for run in runs]),
+            'deaths': dict(sorted(deaths.items())),
+        }
+    return summary
+
+def write_summary(summary, out_dir, settings):
+    """كتابة الملخص كـ JSON وCSV"""
+    with open(os.path.join(out_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump({'settings': settings, 'bots': summary}, f, indent=2)
+
+    causes = sorted({cause for stats in summary.values() for cause in stats['deaths']})
+    with open(os.path.join(out_dir, 'summary.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['bot', 'games',
+                         'score_mean', 'score_median', 'score_p99',
+                         'ticks_mean', 'ticks_median', 'ticks_p99']
+                        + [f'deaths_{cause}' for cause in causes])
+        for bot_name, stats in sorted(summary.items()):
+            writer.writerow([bot_name, stats['games'],
+                             stats['score']['mean'], stats['score']['median'], stats['score']['p99'],
+                             stats['ticks']['mean'], stats['ticks']['median'], stats['ticks']['p99']]
+                            + [stats['deaths'].get(cause, 0) for cause in causes])
+
+def run_tournament(bot_names, seeds, grid_width, grid_height, max_ticks=None,
+                   workers=None, chunk_size=DEFAULT_CHUNK_SIZE, out_dir=None, on_result=None,
+                   arena_path=None):
+    """تشغيل البطولة؛ النتائج تُكتب وتُمرر لـ on_result فور انتهاء كل مهمة"""
+    # بناء الدورة والساحة مرة واحدة قبل التوزيع (العمال يقرؤونها من ذاكرة القرص المؤقتة)
+    if arena_path:
+        arena = load_arena(arena_path)
+        grid_width, grid_height = arena.width, arena.height
+    if 'hamiltonian' in bot_names:
+        get_cycle(grid_width, grid_height)
+
+    runs_file = None
+    runs_writer = None
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        runs_file = open(os.path.join(out_dir, 'runs.csv'), 'w', newline='', encoding='utf-8')
+        runs_writer = csv.DictWriter(runs_file, fieldnames=RUN_FIELDS)
+        runs_writer.writeheader()
+
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_chunk, bot_name, chunk, grid_width, grid_height, max_ticks,
+                                       arena_path)
+                       for bot_name, chunk in make_jobs(bot_names, seeds, chunk_size)]
+
+            for future in as_completed(futures):
+                chunk_results = future.result()
+                results.extend(chunk_results)
+                if runs_writer:
+                    runs_writer.writerows(chunk_results)
+                    runs_file.flush()
+                if on_result:
+                    for result in chunk_results:
+                        on_result(result, len(results))
+    finally:
+        if runs_file:
+            runs_file.close()
+
+    summary = aggregate(results)
+    if out_dir:
+        write_summary(summary, out_dir, {
+            'bots': list(bot_names),
+            'seeds': len(seeds),
+            'first_seed': seeds[0] if seeds else None,
+            'grid_width': grid_width,
+            'grid_height': grid_height,
+            'max_ticks': max_ticks or {bot_name: get_max_ticks(bot_name, grid_width, grid_height)
+                                       for bot_name in bot_names},
+            'arena': arena_path,
+        })
+    return summary
+
+def main(argv=None):
+    """واجهة سطر الأوامر"""
+    parser = argparse.ArgumentParser(description="Run bot tournaments over many seeds in parallel")
+    parser.add_argument('--bots', nargs='+', choices=sorted(BOT_TYPES), default=sorted(BOT_TYPES))
+    parser.add_argument('--seeds', type=int, default=1000, help="number of seeds per bot")
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--width', type=int, default=WINDOW_WIDTH // GRID_SIZE)
+    parser.add_argument('--height', type=int, default=WINDOW_HEIGHT // GRID_SIZE)
+    parser.add_argument('--max-ticks', type=int, default=None,
+                        help=f"default: {DEFAULT_MAX_TICKS}, or (width*height)^2 for hamiltonian")
+    parser.add_argument('--workers', type=int, default=None, help="default: one per CPU core")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--out', default=os.path.join('saves', 'tournaments'))
+    parser.add_argument('--arena', default=None, help="arena file (walls, spawn and food cells)")
+    args = parser.parse_args(argv)
+    if args.arena and 'hamiltonian' in args.bots:
+        parser.error("the hamiltonian bot needs an open board; use --bots astar with --arena")
+
+    seeds = list(range(args.first_seed, args.first_seed + args.seeds))
+    total = len(seeds) * len(args.bots)
+    start = time.perf_counter()
+
+    def report(result, done):
+        print(f"[{done}/{total}] {result['bot']:<12} seed={result['seed']:<8} "
+              f"score={result['score']:<6} ticks={result['ticks']:<7} {result['cause']}")
+
+    summary = run_tournament(args.bots, seeds, args.width, args.height, args.max_ticks,
+                             args.workers, args.chunk_size, args.out, report, args.arena)
+
+    elapsed = time.perf_counter() - start
+    print("=" * 50)
+    for bot_name, stats in sorted(summary.items()):
+        print(f"🤖 {bot_name}: games={stats['games']} "
+              f"score mean={stats['score']['mean']} median={stats['score']['median']} "
+              f"p99={stats['score']['p99']} | ticks mean={stats['ticks']['mean']} | "
+              f"deaths={stats['deaths']}")
+    print(f"⏱️ {total} games in {elapsed:.1f}s -> {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
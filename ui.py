@@ -124,12 +124,14 @@ class Menu:
     def create_buttons(self):
         """إنشاء أزرار القائمة"""
         button_width = 300
-        button_height = 60
-        start_y = 250
-        spacing = 80
+        button_height = 56
+        start_y = 215
+        spacing = 66
         
         buttons_data = [
             ("🎮 Start Game", self.start_game),
+            ("🐍 Classic Mode", self.start_classic),
+            ("👥 Multiplayer", self.start_multiplayer),
             ("⚙️ Settings", self.open_settings),
             ("🏆 High Scores", self.show_high_scores),
             ("❓ How to Play", self.show_instructions),
@@ -241,6 +243,12 @@ class Menu:
     def start_game(self):
         return "playing"
     
+    def start_classic(self):
+        return "classic"
+    
+    def start_multiplayer(self):
+        return "multiplayer"
+    
     def open_settings(self):
         return "settings"
     
@@ -253,4 +261,78 @@ class Menu:
         return "instructions"
     
     def exit_game(self):
-        return "exit"
\ No newline at end of file
+        return "exit"
+
+
+class PauseMenu:
+    """قائمة الإيقاف المؤقت"""
+    def __init__(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.buttons = []
+        
+        try:
+            self.title_font = pygame.font.Font(None, TITLE_FONT_SIZE)
+        except:
+            self.title_font = pygame.font.SysFont('arial', TITLE_FONT_SIZE, bold=True)
+        
+        # طبقة التعتيم تُبنى مرة واحدة وتُرسم في كل إطار
+        self.overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 160))
+        
+        self.create_buttons()
+    
+    def create_buttons(self):
+        """إنشاء أزرار الإيقاف"""
+        button_width = 260
+        button_height = 55
+        start_y = self.screen_height // 2 - 60
+        spacing = 70
+        
+        buttons_data = [
+            ("▶ Resume", self.resume),
+            ("💾 Save", self.save),
+            ("📂 Load", self.load),
+            ("🔄 Restart", self.restart),
+            ("🏠 Main Menu", self.main_menu),
+        ]
+        
+        for i, (text, callback) in enumerate(buttons_data):
+            x = self.screen_width // 2 - button_width // 2
+            y = start_y + i * spacing
+            self.buttons.append(Button(x, y, button_width, button_height, text, callback))
+    
+    def update(self, mouse_pos, mouse_clicked):
+        """تحديث الأزرار؛ يرجع اختيار المستخدم إن وجد"""
+        for button in self.buttons:
+            result = button.update(mouse_pos, mouse_clicked)
+            if result:
+                return result
+        return None
+    
+    def draw(self, screen, graphics=None):
+        """رسم طبقة الإيقاف فوق اللعبة"""
+        screen.blit(self.overlay, (0, 0))
+        
+        title_text = self.title_font.render("Paused", True, UI_ACCENT_COLOR)
+        screen.blit(title_text, 
+                   (self.screen_width//2 - title_text.get_width()//2, 
+                    self.screen_height//2 - 160))
+        
+        for button in self.buttons:
+            button.draw(screen)
+    
+    def resume(self):
+        return "resume"
+    
+    def save(self):
+        return "save"
+    
+    def load(self):
+        return "load"
+    
+    def restart(self):
+        return "restart"
+    
+    def main_menu(self):
+        return "main_menu"
\ No newline at end of file